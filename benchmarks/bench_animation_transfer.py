@@ -0,0 +1,131 @@
+"""
+Animation transfer benchmarks on synthetic dense (mocap-like) actions.
+
+Run from the repository root with Blender:
+    blender --background --factory-startup --python benchmarks/bench_animation_transfer.py -- --bones 100 --frames 3000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leo_tools import animation_transfer  # noqa: E402
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bones", type=int, default=100)
+    parser.add_argument("--frames", type=int, default=3000)
+    return parser.parse_args(argv)
+
+
+def new_fcurve_factory(action, id_data):
+    """Return a callable(data_path, index) creating F-Curves on the legacy
+    Action API or on the slot's channelbag for layered actions."""
+    if hasattr(action, "fcurves"):
+        return lambda data_path, index: action.fcurves.new(data_path, index=index)
+
+    from bpy_extras import anim_utils
+    id_data.animation_data.action = action
+    slot = id_data.animation_data.action_slot
+    if slot is None:
+        slot = action.slots.new(id_type='OBJECT', name=id_data.name)
+        id_data.animation_data.action_slot = slot
+    channelbag = anim_utils.action_ensure_channelbag_for_slot(action, slot)
+    return lambda data_path, index: channelbag.fcurves.new(data_path, index=index)
+
+
+def build_synthetic_action(bone_count, frame_count):
+    """Dense baked keys (one per frame) on loc/quat/scale of every bone."""
+    armature_data = bpy.data.armatures.new("BENCH_ARM")
+    armature = bpy.data.objects.new("BENCH_ARM", armature_data)
+    bpy.context.scene.collection.objects.link(armature)
+    armature.animation_data_create()
+
+    action = bpy.data.actions.new("BENCH_ACTION")
+    armature.animation_data.action = action
+    new_fcurve = new_fcurve_factory(action, armature)
+
+    frames = np.arange(frame_count, dtype=np.float32)
+    rng = np.random.default_rng(0)
+    fcurves = []
+    for bone_index in range(bone_count):
+        base_path = f'pose.bones["bone_{bone_index:03d}"]'
+        for prop, size in (("location", 3), ("rotation_quaternion", 4), ("scale", 3)):
+            for index in range(size):
+                fcurve = new_fcurve(f"{base_path}.{prop}", index)
+                values = np.cumsum(rng.normal(0.0, 0.01, frame_count)).astype(np.float32)
+                co = np.empty(frame_count * 2, dtype=np.float32)
+                co[0::2] = frames
+                co[1::2] = values
+                fcurve.keyframe_points.add(frame_count)
+                fcurve.keyframe_points.foreach_set("co", co)
+                fcurve.update()
+                fcurves.append(fcurve)
+    return armature, fcurves
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s")
+    return result, elapsed
+
+
+def bench_serialization(fcurves):
+    key_count = sum(len(fc.keyframe_points) for fc in fcurves)
+    print(f"Serializing {len(fcurves)} F-Curves / {key_count} keys")
+    legacy, legacy_time = timed(
+        "serialize_fcurve (per keyframe)",
+        lambda: [animation_transfer.serialize_fcurve(fc) for fc in fcurves])
+    bulk, bulk_time = timed(
+        "serialize_fcurve_bulk (foreach_get)",
+        lambda: [animation_transfer.serialize_fcurve_bulk(fc) for fc in fcurves])
+    print(f"{'speedup':<40} {legacy_time / max(bulk_time, 1e-9):8.1f}x")
+    return legacy, bulk
+
+
+def check_simplification():
+    """Regression checks: stepped and plateau curves lose their redundant
+    keys and report no error."""
+    obj = bpy.data.objects.new("CHECK_SIMPLIFY", None)
+    obj.animation_data_create()
+    action = bpy.data.actions.new("CHECK_SIMPLIFY")
+    new_fcurve = new_fcurve_factory(action, obj)
+    cases = (
+        ("stepped", 'CONSTANT', [0, 0, 0, 0, 0, 1], 2),
+        ("plateau", 'LINEAR', [0, 0, 0, 5, 5, 5, 5], 4),
+    )
+    for index, (label, interpolation, values, expected) in enumerate(cases):
+        fcurve = new_fcurve("location", index)
+        fcurve.keyframe_points.add(len(values))
+        co = np.empty(len(values) * 2, dtype=np.float32)
+        co[0::2] = np.arange(len(values))
+        co[1::2] = values
+        fcurve.keyframe_points.foreach_set("co", co)
+        for key in fcurve.keyframe_points:
+            key.interpolation = interpolation
+        fcurve.update()
+        count, arrays = animation_transfer.read_keyframe_arrays(fcurve)
+        new_count, _arrays, max_error = animation_transfer.simplify_keyframe_arrays(count, arrays, 0.001, 'CONSTANT')
+        assert new_count == expected and max_error == 0.0, (label, new_count, max_error)
+        print(f"{'simplify check: ' + label:<40} {count} -> {new_count} keys")
+
+
+def main():
+    args = parse_args()
+    check_simplification()
+    _armature, fcurves = build_synthetic_action(args.bones, args.frames)
+    bench_serialization(fcurves)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Keyframe bracketing benchmark: linear key scans vs the cached keyframe index
+on a synthetic 100k-key action.
+
+Run from the repository root with Blender:
+    blender --background --factory-startup --python benchmarks/bench_keyframe_index.py -- --fcurves 50 --keys 2000
+"""
+
+import os
+import sys
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from leo_tools import keyframe_index  # noqa: E402
+from bench_animation_transfer import build_synthetic_action, timed  # noqa: E402
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fcurves", type=int, default=50)
+    parser.add_argument("--keys", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    return parser.parse_args(argv)
+
+
+def linear_bracket(fcurves, current_frame):
+    """The previous per-keyframe scan, kept as the baseline."""
+    previous_frame = None
+    next_frame = None
+    for fcurve in fcurves:
+        for key in fcurve.keyframe_points:
+            if key.co[0] < current_frame:
+                if previous_frame is None or key.co[0] > previous_frame:
+                    previous_frame = key.co[0]
+            elif key.co[0] > current_frame:
+                if next_frame is None or key.co[0] < next_frame:
+                    next_frame = key.co[0]
+    return previous_frame, next_frame
+
+
+def main():
+    args = parse_args()
+    # build_synthetic_action creates 10 F-Curves per bone
+    bone_count = max(1, args.fcurves // 10)
+    _armature, fcurves = build_synthetic_action(bone_count, args.keys)
+    key_count = sum(len(fc.keyframe_points) for fc in fcurves)
+    frames = np.random.default_rng(0).uniform(1, args.keys - 2, args.queries) + 0.5
+    print(f"Bracketing {args.queries} frames over {len(fcurves)} F-Curves / {key_count} keys")
+
+    linear, linear_time = timed(
+        "linear scan", lambda: [linear_bracket(fcurves, frame) for frame in frames])
+    keyframe_index.invalidate()
+    _cold, cold_time = timed(
+        "keyframe index (cold cache)", lambda: [keyframe_index.bracket_keys(fcurves, frame) for frame in frames])
+    indexed, warm_time = timed(
+        "keyframe index (warm cache)", lambda: [keyframe_index.bracket_keys(fcurves, frame) for frame in frames])
+    _union, _union_time = timed("union of key frames", keyframe_index.union_key_frames, fcurves)
+
+    assert [(float(p), float(n)) for p, n in linear] == indexed
+    print(f"{'speedup (cold)':<40} {linear_time / max(cold_time, 1e-9):8.1f}x")
+    print(f"{'speedup (warm)':<40} {linear_time / max(warm_time, 1e-9):8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
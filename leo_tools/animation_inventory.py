@@ -0,0 +1,260 @@
+"""
+Animation Inventory
+Index of every animated ID in the file (objects, object data, shape keys,
+materials and their node trees, node groups, worlds, scenes): the actions
+and slots they use, NLA strips, drivers and key counts. Built once and
+cached until the depsgraph reports a change that can affect it.
+"""
+
+import bpy
+from bpy.app.handlers import persistent
+
+from leo_tools import fcurve_index
+
+
+# bpy.data collections scanned for animation_data, with the entry kind
+ID_COLLECTIONS = (
+    ("objects", 'OBJECT'),
+    ("meshes", 'DATA'),
+    ("curves", 'DATA'),
+    ("armatures", 'DATA'),
+    ("lights", 'DATA'),
+    ("cameras", 'DATA'),
+    ("lattices", 'DATA'),
+    ("grease_pencils", 'DATA'),
+    ("shape_keys", 'SHAPE_KEYS'),
+    ("materials", 'MATERIAL'),
+    ("node_groups", 'NODE_TREE'),
+    ("worlds", 'WORLD'),
+    ("scenes", 'SCENE'),
+)
+
+_inventory = None
+
+
+def _slot_name(animation_data):
+    slot = getattr(animation_data, "action_slot", None)
+    if slot is None:
+        return ""
+    return getattr(slot, "name_display", None) or getattr(slot, "identifier", "")
+
+
+def _animation_state(id_data):
+    """What the inventory records about an ID's animation (actions, slot,
+    driver count), or None if it has none worth an entry."""
+    animation_data = getattr(id_data, "animation_data", None)
+    if animation_data is None:
+        return None
+    actions = [animation_data.action]
+    actions += [strip.action for track in animation_data.nla_tracks for strip in track.strips]
+    actions = tuple(action.as_pointer() for action in actions if action is not None)
+    driver_count = len(animation_data.drivers)
+    if not actions and not driver_count:
+        return None
+    return actions, _slot_name(animation_data), driver_count
+
+
+def _data_signature():
+    """ID counts of the scanned collections: adding or removing IDs changes it."""
+    return tuple(len(getattr(bpy.data, name, ())) for name, _kind in ID_COLLECTIONS) + (len(bpy.data.actions),)
+
+
+class AnimatedID:
+    """One ID with animation data and what it uses."""
+
+    __slots__ = ("id_data", "kind", "owner", "action", "slot", "nla_actions", "driver_count", "key_count")
+
+    def __init__(self, id_data, kind, owner=None):
+        animation_data = id_data.animation_data
+        self.id_data = id_data
+        self.kind = kind
+        # Embedded node trees belong to their material/world
+        self.owner = owner
+        self.action = animation_data.action
+        self.slot = _slot_name(animation_data)
+        self.nla_actions = [
+            strip.action
+            for track in animation_data.nla_tracks
+            for strip in track.strips
+            if strip.action is not None
+        ]
+        self.driver_count = len(animation_data.drivers)
+        self.key_count = 0
+
+    @property
+    def actions(self):
+        """Active action first, then the NLA strip actions."""
+        return ([self.action] if self.action is not None else []) + self.nla_actions
+
+    @property
+    def has_keys(self):
+        return self.action is not None or bool(self.nla_actions)
+
+
+class AnimationInventory:
+    """Animated IDs of the file, with lookups by object and by action
+    (keyed by pointer, so linked IDs sharing a local name stay apart)."""
+
+    def __init__(self):
+        self.entries = []
+        self.by_object = {}
+        self.by_action = {}
+        self.states = {}
+        self.signature = _data_signature()
+        self._scan()
+
+    def _add(self, id_data, kind, owner=None):
+        state = _animation_state(id_data)
+        if state is None:
+            return None
+        entry = AnimatedID(id_data, kind, owner)
+        self.states[id_data.as_pointer()] = state
+        self.entries.append(entry)
+        for action in entry.actions:
+            self.by_action.setdefault(action.as_pointer(), []).append(entry)
+        return entry
+
+    def _scan(self):
+        key_counts = {}
+        for collection_name, kind in ID_COLLECTIONS:
+            for id_data in getattr(bpy.data, collection_name, ()):
+                entry = self._add(id_data, kind)
+                if entry is not None and entry.action is not None:
+                    key = (entry.action.as_pointer(), entry.slot)
+                    if key not in key_counts:
+                        key_counts[key] = sum(
+                            len(fcurve.keyframe_points)
+                            for fcurve in fcurve_index.get_action_fcurves(entry.action, id_data))
+                    entry.key_count = key_counts[key]
+                # Node trees embedded in materials/worlds are not in bpy.data.node_groups
+                node_tree = getattr(id_data, "node_tree", None) if kind in {'MATERIAL', 'WORLD'} else None
+                if node_tree is not None:
+                    self._add(node_tree, 'NODE_TREE', owner=id_data)
+        self._map_objects()
+
+    def _map_objects(self):
+        """Attribute data, shape key and material animation to the objects using them."""
+        data_users = {}
+        material_users = {}
+        for obj in bpy.data.objects:
+            if obj.data is not None:
+                data_users.setdefault(obj.data.as_pointer(), []).append(obj)
+            for slot in obj.material_slots:
+                if slot.material is not None:
+                    material_users.setdefault(slot.material.as_pointer(), []).append(obj)
+
+        for entry in self.entries:
+            id_data = entry.owner or entry.id_data
+            if entry.kind == 'OBJECT':
+                objects = [id_data]
+            elif entry.kind == 'DATA':
+                objects = data_users.get(id_data.as_pointer(), [])
+            elif entry.kind == 'SHAPE_KEYS':
+                objects = data_users.get(id_data.user.as_pointer(), []) if id_data.user else []
+            elif isinstance(id_data, bpy.types.Material):
+                objects = material_users.get(id_data.as_pointer(), [])
+            else:
+                objects = []
+            for obj in objects:
+                self.by_object.setdefault(obj.as_pointer(), []).append(entry)
+
+    def is_current_for(self, id_data):
+        """The recorded animation of id_data still matches the file."""
+        return self.states.get(id_data.as_pointer()) == _animation_state(id_data)
+
+    def object_entries(self, obj, include_data=True):
+        """Entries animating obj: its own, plus (include_data) those of its
+        data, shape keys and materials."""
+        entries = self.by_object.get(obj.as_pointer(), [])
+        if include_data:
+            return entries
+        return [entry for entry in entries if entry.kind == 'OBJECT']
+
+    def animated_objects(self, objects, include_data=True, include_drivers=False):
+        """The given objects that have keyframed (or, optionally, driven) animation."""
+        return [
+            obj for obj in objects
+            if any(entry.has_keys or (include_drivers and entry.driver_count)
+                   for entry in self.object_entries(obj, include_data))
+        ]
+
+    def report_lines(self):
+        lines = []
+        for entry in self.entries:
+            owner = f" ({entry.owner.name})" if entry.owner is not None else ""
+            action = entry.action.name if entry.action is not None else "-"
+            slot = f" [{entry.slot}]" if entry.slot else ""
+            lines.append(
+                f"{entry.kind:<10} {entry.id_data.name}{owner}: action {action}{slot}, "
+                f"{entry.key_count} keys, {len(entry.nla_actions)} NLA strips, {entry.driver_count} drivers"
+            )
+        return lines
+
+
+def unused_actions(include_fake_users=False):
+    """Local actions nothing uses, from Blender's own user count, so users
+    the inventory does not scan (Action constraints, particle settings,
+    speakers...) still keep an action. With include_fake_users, actions
+    whose only user is their fake user count as unused too."""
+    return [
+        action for action in bpy.data.actions
+        if not action.library
+        and (action.users == 0
+             or (include_fake_users and action.use_fake_user and action.users == 1))
+    ]
+
+
+def get_inventory():
+    """The cached inventory, rebuilt after invalidate() or once IDs were
+    added or removed."""
+    global _inventory
+    if _inventory is None or _inventory.signature != _data_signature():
+        _inventory = AnimationInventory()
+    return _inventory
+
+
+def invalidate():
+    global _inventory
+    _inventory = None
+
+
+@persistent
+def _depsgraph_update_post(scene, depsgraph):
+    # Selection, frame changes and moving objects around leave the
+    # inventory as it is: only edited actions, changed object data or
+    # material slots, and IDs whose animation no longer matches drop it
+    if _inventory is None:
+        return
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Action) \
+                or (isinstance(id_data, bpy.types.Object) and update.is_updated_geometry) \
+                or not _inventory.is_current_for(id_data):
+            invalidate()
+            return
+
+
+@persistent
+def _invalidate_all(*args):
+    invalidate()
+
+
+_handlers = (
+    (bpy.app.handlers.depsgraph_update_post, _depsgraph_update_post),
+    (bpy.app.handlers.undo_post, _invalidate_all),
+    (bpy.app.handlers.redo_post, _invalidate_all),
+    (bpy.app.handlers.load_post, _invalidate_all),
+)
+
+
+def register():
+    for handlers, handler in _handlers:
+        if handler not in handlers:
+            handlers.append(handler)
+
+
+def unregister():
+    for handlers, handler in _handlers:
+        if handler in handlers:
+            handlers.remove(handler)
+    invalidate()
@@ -1,10 +1,19 @@
+import os
 import re
+import csv
+import gzip
 import json
+import fnmatch
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 import bpy
+import numpy as np
 from bpy.types import Operator, Panel
-from bpy.props import StringProperty, IntProperty, BoolProperty
+from bpy.props import StringProperty, IntProperty, BoolProperty, EnumProperty, FloatProperty
 from bpy_extras.io_utils import ExportHelper, ImportHelper
 
+from leo_tools import fcurve_index
+
 # pose.bones["BoneName"]["prop_name"] - bone custom property fcurve data path
 CUSTOM_PROP_RE = re.compile(r'^pose\.bones\["(.+)"\]\["(.+)"\]$')
 # ["prop_name"] - object custom property fcurve data path
@@ -15,37 +24,18 @@ TRANSFORM_CHANNELS = {
     "rotation_quaternion": 4,
     "scale": 3,
 }
-# Keyframe attributes copied as-is (handle_left/right vectors are handled separately)
-KEYFRAME_POINT_ATTRS = (
-    "handle_left_type", "handle_right_type", "interpolation", "easing",
-    "back", "amplitude", "period", "type",
+# Column layout of the compact (format_version 2) F-Curve representation.
+# Vector columns are flattened [x0, y0, x1, y1, ...]; float/enum columns
+# hold one value per key, or a single scalar when every key shares it.
+KEYFRAME_VECTOR_ATTRS = ("co", "handle_left", "handle_right")
+KEYFRAME_FLOAT_ATTRS = ("back", "amplitude", "period")
+KEYFRAME_ENUM_ATTRS = (
+    "interpolation", "handle_left_type", "handle_right_type", "easing", "type",
 )
+FORMAT_VERSION = 2
+BATCH_MANIFEST_NAME = "manifest.json"
 
-
-def get_action_fcurves(action, armature=None):
-    """Get fcurves from an action, supporting both legacy actions
-    and the new layered/slotted action system (Blender 4.4+)."""
-    if hasattr(action, "fcurves"):
-        return list(action.fcurves)
-
-    fcurves = []
-
-    if hasattr(action, "layers"):
-        target_slot = None
-        if (armature is not None
-                and armature.animation_data is not None
-                and getattr(armature.animation_data, "action_slot", None) is not None):
-            target_slot = armature.animation_data.action_slot
-
-        for layer in action.layers:
-            for strip in layer.strips:
-                if hasattr(strip, "channelbags"):
-                    for channelbag in strip.channelbags:
-                        if target_slot is not None and channelbag.slot_handle != target_slot.handle:
-                            continue
-                        fcurves.extend(channelbag.fcurves)
-
-    return fcurves
+_keyframe_enum_tables = {}
 
 
 def get_custom_properties(id_data):
@@ -135,87 +125,1163 @@ def serialize_keyframe(keyframe):
 
 
 def serialize_fcurve(fcurve):
+    """Legacy per-keyframe representation (format_version 1). Kept so old
+    tooling and the benchmarks can still produce it; export reads F-Curves
+    in bulk instead (snapshot_fcurve / serialize_fcurve_arrays)."""
     return {
         "extrapolation": fcurve.extrapolation,
         "keyframes": [serialize_keyframe(kp) for kp in fcurve.keyframe_points],
     }
 
 
+def keyframe_enum_table(attr):
+    """Return (value -> identifier, identifier -> value) dicts for a Keyframe
+    enum property, read from RNA so foreach_get/foreach_set integers never
+    depend on hardcoded Blender internals."""
+    table = _keyframe_enum_tables.get(attr)
+    if table is None:
+        items = bpy.types.Keyframe.bl_rna.properties[attr].enum_items
+        table = (
+            {item.value: item.identifier for item in items},
+            {item.identifier: item.value for item in items},
+        )
+        _keyframe_enum_tables[attr] = table
+    return table
+
+
+def read_keyframe_arrays(fcurve):
+    """Read every keyframe attribute of an F-Curve into flat NumPy arrays,
+    one keyframe_points.foreach_get() call per attribute."""
+    keyframe_points = fcurve.keyframe_points
+    count = len(keyframe_points)
+    arrays = {}
+    for attr in KEYFRAME_VECTOR_ATTRS:
+        arrays[attr] = np.empty(count * 2, dtype=np.float32)
+        keyframe_points.foreach_get(attr, arrays[attr])
+    for attr in KEYFRAME_FLOAT_ATTRS:
+        arrays[attr] = np.empty(count, dtype=np.float32)
+        keyframe_points.foreach_get(attr, arrays[attr])
+    for attr in KEYFRAME_ENUM_ATTRS:
+        arrays[attr] = np.empty(count, dtype=np.int32)
+        keyframe_points.foreach_get(attr, arrays[attr])
+    return count, arrays
+
+
+def _compact_column(values):
+    """A per-key column as a list, or one scalar if every key shares it."""
+    if len(values) and (values == values[0]).all():
+        return values[0].item()
+    return values.tolist()
+
+
+def _compact_enum_column(attr, values):
+    names = keyframe_enum_table(attr)[0]
+    column = _compact_column(values)
+    if isinstance(column, list):
+        return [names[value] for value in column]
+    return names[column]
+
+
+def serialize_fcurve_arrays(extrapolation, count, arrays):
+    """Build the compact F-Curve representation from read_keyframe_arrays()
+    output (no RNA access, the arrays are all that is needed)."""
+    data = {"extrapolation": extrapolation, "count": count}
+    for attr in KEYFRAME_VECTOR_ATTRS:
+        data[attr] = arrays[attr].tolist()
+    for attr in KEYFRAME_FLOAT_ATTRS:
+        data[attr] = _compact_column(arrays[attr])
+    for attr in KEYFRAME_ENUM_ATTRS:
+        data[attr] = _compact_enum_column(attr, arrays[attr])
+    return data
+
+
+def serialize_fcurve_bulk(fcurve):
+    """Column-oriented equivalent of serialize_fcurve(): same fidelity, but
+    read with foreach_get instead of one RNA access per keyframe attribute."""
+    count, arrays = read_keyframe_arrays(fcurve)
+    return serialize_fcurve_arrays(fcurve.extrapolation, count, arrays)
+
+
+def snapshot_fcurve(fcurve):
+    """(extrapolation, key count, keyframe arrays) - everything an export
+    needs from one F-Curve, with no RNA reference left in it."""
+    count, arrays = read_keyframe_arrays(fcurve)
+    return fcurve.extrapolation, count, arrays
+
+
 def serialize_channels(channels):
-    """Convert a _new_channels()-shaped dict of live F-Curves to JSON data."""
+    """Convert a _new_channels()-shaped dict of F-Curve snapshots to JSON data."""
     result = {
-        prop: [serialize_fcurve(fc) if fc is not None else None for fc in channels[prop]]
+        prop: [serialize_fcurve_arrays(*snap) if snap is not None else None for snap in channels[prop]]
         for prop in ("location", "rotation_euler", "rotation_quaternion", "scale")
     }
-    result["custom"] = {name: serialize_fcurve(fc) for name, fc in channels["custom"].items()}
+    result["custom"] = {name: serialize_fcurve_arrays(*snap) for name, snap in channels["custom"].items()}
     return result
 
 
-def insert_channel_keyframes(target, channels_data, base_path, frame_offset, style_tasks):
-    """Insert keyframes for a bone's or the armature object's channels.
-    Queues (data_path, index, fcurve_data) so bezier styling can be applied
-    in a single batched pass once every F-Curve has been created."""
+def _channel_slots(channels, base_path):
+    """Yield (container, key, label) for every F-Curve snapshot of a
+    _new_channels()-shaped dict; label is the F-Curve's data path/index."""
+    for prop in ("location", "rotation_euler", "rotation_quaternion", "scale"):
+        for index, snap in enumerate(channels[prop]):
+            if snap is not None:
+                data_path = f"{base_path}.{prop}" if base_path else prop
+                yield channels[prop], index, f"{data_path}[{index}]"
+    for name in channels["custom"]:
+        yield channels["custom"], name, f'{base_path}["{name}"]'
+
+
+def _snapshot_channel_slots(snapshot):
+    if snapshot["object_animation"]:
+        yield from _channel_slots(snapshot["object_animation"]["channels"], "")
+    for bone_name, bone in snapshot["bones"].items():
+        yield from _channel_slots(bone["channels"], f'pose.bones["{bone_name}"]')
+
+
+def snapshot_armature_animation(armature, frame_window=None, bone_filter=None):
+    """Read everything an export needs from Blender: keyframe columns via
+    foreach_get, rotation modes and custom properties. Must run on the main
+    thread; the returned snapshot holds no RNA data, so building and
+    writing the file from it (export_animation_snapshot) is thread-safe.
+
+    frame_window (start, end) keeps only the keys inside it; bone_filter
+    (see make_bone_filter) restricts which bones are read at all."""
+    action = armature.animation_data.action
+
+    bones = {}
+    object_channels = _new_channels()
+    min_frame = float('inf')
+    max_frame = float('-inf')
+
+    for fcurve in fcurve_index.get_action_fcurves(action, armature):
+        scope, bone_name, prop = _classify_fcurve(fcurve.data_path)
+        if scope is None:
+            continue
+        if bone_name is not None and bone_filter is not None and not bone_filter(bone_name):
+            continue
+
+        snap = snapshot_fcurve(fcurve)
+        if frame_window is not None:
+            # Channels left empty by the window are still written, so an
+            # import splices (clears) that window on the target curve too
+            snap = (snap[0],) + window_keyframe_arrays(snap[1], snap[2], frame_window)
+        # Keyframes are kept sorted by frame, so the ends give the range
+        count, co = snap[1], snap[2]["co"]
+        if count:
+            min_frame = min(min_frame, float(co[0]))
+            max_frame = max(max_frame, float(co[-2]))
+
+        if scope == "object_transform":
+            if 0 <= fcurve.array_index < TRANSFORM_CHANNELS[prop]:
+                object_channels[prop][fcurve.array_index] = snap
+        elif scope == "object_custom":
+            object_channels["custom"][prop] = snap
+        elif scope == "bone_transform":
+            entry = bones.setdefault(bone_name, _new_channels())
+            if 0 <= fcurve.array_index < TRANSFORM_CHANNELS[prop]:
+                entry[prop][fcurve.array_index] = snap
+        elif scope == "bone_custom":
+            entry = bones.setdefault(bone_name, _new_channels())
+            entry["custom"][prop] = snap
+
+    # Handle case with no keyframes
+    if min_frame == float('inf'):
+        min_frame, max_frame = 0, 0
+    else:
+        min_frame, max_frame = int(round(min_frame)), int(round(max_frame))
+
+    snapshot = {
+        "armature": armature.name,
+        "action": action.name,
+        "frame_range": [min_frame, max_frame],
+        "frame_window": list(frame_window) if frame_window is not None else None,
+        "object_custom_properties": get_custom_properties(armature),
+        "object_animation": None,
+        "bones": {},
+    }
+
+    # Armature object's own transform animation
+    if _channels_animated(object_channels):
+        snapshot["object_animation"] = {
+            "rotation_mode": armature.rotation_mode,
+            "channels": object_channels,
+        }
+
+    for bone_name, channels in bones.items():
+        if bone_name not in armature.pose.bones or not _channels_animated(channels):
+            continue
+
+        pose_bone = armature.pose.bones[bone_name]
+        snapshot["bones"][bone_name] = {
+            "rotation_mode": pose_bone.rotation_mode,
+            "custom_properties": get_custom_properties(pose_bone),
+            "channels": channels,
+        }
+
+    return snapshot
+
+
+def build_animation_data(snapshot):
+    """Turn a snapshot_armature_animation() result into file data."""
+    data = {
+        "format_version": FORMAT_VERSION,
+        "armature": snapshot["armature"],
+        "action": snapshot["action"],
+        "frame_range": snapshot["frame_range"],
+    }
+    # Partial exports record their window before the bones, so a streaming
+    # import knows which range to splice before the first bone arrives
+    if snapshot["frame_window"] is not None:
+        data["frame_window"] = snapshot["frame_window"]
+    data.update({
+        "object_custom_properties": snapshot["object_custom_properties"],
+        "bones": {
+            bone_name: {
+                "rotation_mode": bone["rotation_mode"],
+                "custom_properties": bone["custom_properties"],
+                "channels": serialize_channels(bone["channels"]),
+            }
+            for bone_name, bone in snapshot["bones"].items()
+        },
+    })
+    object_animation = snapshot["object_animation"]
+    if object_animation:
+        data["object_animation"] = {
+            "rotation_mode": object_animation["rotation_mode"],
+            "channels": serialize_channels(object_animation["channels"]),
+        }
+    return data
+
+
+# Blender's F-Curve auto handles (calchandleNurb, no auto smoothing) sit at
+# this fraction of the neighbouring key interval, on the mean secant slope.
+AUTO_HANDLE_FACTOR = 2.0 / 5.1228
+BEZIER_SOLVE_STEPS = 24
+
+
+def _keyframe_enum_value(attr, identifier):
+    return keyframe_enum_table(attr)[1][identifier]
+
+
+def _key_handles(frames, values, left, right, left_type, right_type, extrapolation):
+    """Handles Blender will compute for a sorted key set: AUTO/AUTO_CLAMPED
+    and VECTOR sides are recalculated from the neighbouring keys, every
+    other side keeps its stored position."""
+    auto = (_keyframe_enum_value("handle_left_type", 'AUTO'),
+            _keyframe_enum_value("handle_left_type", 'AUTO_CLAMPED'))
+    clamped_value = auto[1]
+    vector = _keyframe_enum_value("handle_left_type", 'VECTOR')
+
+    dx = np.diff(frames)
+    dy = np.diff(values)
+    secant = dy / np.where(dx == 0, 1.0, dx)
+    # A missing neighbour at either end is mirrored from the other side
+    dx_a = np.concatenate((dx[:1], dx))
+    dx_b = np.concatenate((dx, dx[-1:]))
+    dy_a = np.concatenate((dy[:1], dy))
+    dy_b = np.concatenate((dy, dy[-1:]))
+    s_a = np.concatenate((secant[:1], secant))
+    s_b = np.concatenate((secant, secant[-1:]))
+
+    slope = (s_a + s_b) / 2.0
+    clamped = (left_type == clamped_value) | (right_type == clamped_value)
+    # Auto-clamped keys are flat on extremes and never overshoot a neighbour
+    limit = np.minimum(np.abs(s_a), np.abs(s_b)) / AUTO_HANDLE_FACTOR
+    clamped_slope = np.where(s_a * s_b <= 0, 0.0, np.sign(slope) * np.minimum(np.abs(slope), limit))
+    slope = np.where(clamped, clamped_slope, slope)
+    is_auto = np.isin(left_type, auto) & np.isin(right_type, auto)
+    if extrapolation == 'CONSTANT':
+        slope[[0, -1]] = np.where(is_auto[[0, -1]], 0.0, slope[[0, -1]])
+
+    auto_left = np.stack((frames - dx_a * AUTO_HANDLE_FACTOR, values - slope * dx_a * AUTO_HANDLE_FACTOR), axis=1)
+    auto_right = np.stack((frames + dx_b * AUTO_HANDLE_FACTOR, values + slope * dx_b * AUTO_HANDLE_FACTOR), axis=1)
+    vector_left = np.stack((frames - dx_a / 3.0, values - dy_a / 3.0), axis=1)
+    vector_right = np.stack((frames + dx_b / 3.0, values + dy_b / 3.0), axis=1)
+
+    left = np.where(np.isin(left_type, auto)[:, None], auto_left,
+                    np.where((left_type == vector)[:, None], vector_left, left))
+    right = np.where(np.isin(right_type, auto)[:, None], auto_right,
+                     np.where((right_type == vector)[:, None], vector_right, right))
+    return left, right
+
+
+def _bezier(p0, p1, p2, p3, t):
+    u = 1.0 - t
+    return u * u * u * p0 + 3.0 * u * u * t * p1 + 3.0 * u * t * t * p2 + t * t * t * p3
+
+
+def _evaluate_keys(frames, values, left, right, interpolation, query):
+    """Vectorized F-Curve evaluation at sorted-or-not query frames inside
+    the key range, for CONSTANT/LINEAR/BEZIER segments."""
+    seg = np.clip(np.searchsorted(frames, query, side='right') - 1, 0, len(frames) - 2)
+    x0, x1 = frames[seg], frames[seg + 1]
+    y0, y1 = values[seg], values[seg + 1]
+    width = np.where(x1 - x0 == 0, 1.0, x1 - x0)
+
+    # Same correction as BKE_fcurve_correct_bezpart: handles may not overlap
+    h1x, h1y = right[seg, 0], right[seg, 1]
+    h2x, h2y = left[seg + 1, 0], left[seg + 1, 1]
+    len1 = np.maximum(h1x - x0, 0.0)
+    len2 = np.maximum(x1 - h2x, 0.0)
+    total = len1 + len2
+    fac = np.where(total > width, width / np.where(total == 0, 1.0, total), 1.0)
+    h1x, h1y = x0 + len1 * fac, y0 + (h1y - y0) * fac
+    h2x, h2y = x1 - len2 * fac, y1 - (y1 - h2y) * fac
+
+    # x(t) is monotonic once corrected: bisect for the curve parameter
+    lo = np.zeros_like(query)
+    hi = np.ones_like(query)
+    for _ in range(BEZIER_SOLVE_STEPS):
+        mid = (lo + hi) * 0.5
+        above = _bezier(x0, h1x, h2x, x1, mid) > query
+        hi = np.where(above, mid, hi)
+        lo = np.where(above, lo, mid)
+    bezier = _bezier(y0, h1y, h2y, y1, (lo + hi) * 0.5)
+
+    linear = y0 + (y1 - y0) * (query - x0) / width
+    seg_interpolation = interpolation[seg]
+    result = np.where(seg_interpolation == _keyframe_enum_value("interpolation", 'CONSTANT'), y0,
+                      np.where(seg_interpolation == _keyframe_enum_value("interpolation", 'LINEAR'), linear, bezier))
+    # The last key is evaluated through the segment ending on it, where a
+    # CONSTANT step would still hold the previous value
+    return np.where(query >= x1, y1, result)
+
+
+def simplify_keyframe_arrays(count, arrays, tolerance, extrapolation):
+    """Lossy key reduction: drop keys the neighbouring bezier segments
+    reconstruct within tolerance. Works on read_keyframe_arrays()-style
+    columns; each pass tentatively removes every other removable key, checks
+    the error against the original curve (at every original key and segment
+    midpoint) and restores the keys whose neighbourhood exceeds tolerance.
+    Once the passes stall, every fourth key is tried instead, far enough
+    apart for each removal to be judged on its own.
+
+    Only plain keyframes on CONSTANT/LINEAR/BEZIER segments with auto handles
+    are removable; authored (free/aligned) handles, breakdowns, extremes and
+    easing segments are kept. Returns (count, arrays, max_error)."""
+    if count < 3 or tolerance <= 0:
+        return count, arrays, 0.0
+
+    co = arrays["co"].astype(np.float64).reshape(-1, 2)
+    frames, values = co[:, 0], co[:, 1]
+    left = arrays["handle_left"].astype(np.float64).reshape(-1, 2)
+    right = arrays["handle_right"].astype(np.float64).reshape(-1, 2)
+    interpolation = arrays["interpolation"]
+    left_type = arrays["handle_left_type"]
+    right_type = arrays["handle_right_type"]
+
+    supported = np.isin(interpolation, [_keyframe_enum_value("interpolation", name)
+                                        for name in ('CONSTANT', 'LINEAR', 'BEZIER')])
+    auto = [_keyframe_enum_value("handle_left_type", name) for name in ('AUTO', 'AUTO_CLAMPED')]
+    removable = (
+        supported
+        & (arrays["type"] == _keyframe_enum_value("type", 'KEYFRAME'))
+        & ((interpolation != _keyframe_enum_value("interpolation", 'BEZIER'))
+           | (np.isin(left_type, auto) & np.isin(right_type, auto)))
+    )
+    removable[[0, -1]] = False
+
+    # Reference samples: every original key plus the midpoint of each
+    # segment, on the curve as Blender rebuilds it from the full key set
+    left, right = _key_handles(frames, values, left, right, left_type, right_type, extrapolation)
+    midpoints = ((frames[:-1] + frames[1:]) * 0.5)[supported[:-1]]
+    sample_x = np.concatenate((frames, midpoints))
+    sample_y = np.concatenate((values, _evaluate_keys(frames, values, left, right, interpolation, midpoints)))
+
+    def evaluate(keep):
+        kept = np.flatnonzero(keep)
+        kept_left, kept_right = _key_handles(
+            frames[kept], values[kept], left[kept], right[kept],
+            left_type[kept], right_type[kept], extrapolation)
+        error = np.abs(_evaluate_keys(
+            frames[kept], values[kept], kept_left, kept_right, interpolation[kept], sample_x) - sample_y)
+        seg = np.clip(np.searchsorted(frames[kept], sample_x, side='right') - 1, 0, len(kept) - 2)
+        seg_error = np.zeros(len(kept) - 1)
+        np.maximum.at(seg_error, seg, error)
+        return kept, kept_left, kept_right, seg_error
+
+    keep = np.ones(count, dtype=bool)
+    # Every other key first; once that stalls (a key needed by one removal
+    # rejects its batch neighbours too), every fourth key: removals that
+    # far apart touch disjoint segments and handles, so each is judged on
+    # its own, as if tried one at a time
+    stride = 2
+    phase = 0
+    idle_passes = 0
+    while True:
+        kept = np.flatnonzero(keep)
+        inner = kept[1:-1]
+        # The merged segment keeps the previous key's interpolation
+        candidates = removable[inner] & (interpolation[kept[:-2]] == interpolation[inner])
+        # No two removed keys are neighbours within one pass
+        candidates &= (np.arange(len(inner)) % stride) == phase
+        phase = (phase + 1) % stride
+        chosen = inner[candidates]
+
+        while len(chosen):
+            trial = keep.copy()
+            trial[chosen] = False
+            trial_kept, _, _, seg_error = evaluate(trial)
+            bad = seg_error > tolerance
+            if not bad.any():
+                break
+            # Removing a key also moves its neighbours' auto handles, so
+            # judge it on its merged segment and the segments on either side
+            pos = np.searchsorted(frames[trial_kept], frames[chosen]) - 1
+            last = len(bad) - 1
+            window_bad = bad[pos] | bad[np.clip(pos - 1, 0, last)] | bad[np.clip(pos + 1, 0, last)]
+            if not window_bad.any():
+                chosen = chosen[:0]
+                break
+            chosen = chosen[~window_bad]
+
+        if len(chosen):
+            keep[chosen] = False
+            idle_passes = 0
+            continue
+        idle_passes += 1
+        if idle_passes < stride:
+            continue
+        if stride == 4:
+            break
+        stride, phase, idle_passes = 4, 0, 0
+
+    kept, kept_left, kept_right, seg_error = evaluate(keep)
+    result = {attr: arrays[attr][kept] for attr in KEYFRAME_FLOAT_ATTRS + KEYFRAME_ENUM_ATTRS}
+    result["co"] = co[kept].astype(np.float32).ravel()
+    result["handle_left"] = kept_left.astype(np.float32).ravel()
+    result["handle_right"] = kept_right.astype(np.float32).ravel()
+    return len(kept), result, float(seg_error.max(initial=0.0))
+
+
+def simplify_snapshot(snapshot, tolerance):
+    """Run simplify_keyframe_arrays() over every F-Curve of a snapshot, in
+    place. Returns per-channel stats keyed by data path/index."""
+    stats = {}
+    for container, key, label in _snapshot_channel_slots(snapshot):
+        extrapolation, count, arrays = container[key]
+        new_count, new_arrays, max_error = simplify_keyframe_arrays(count, arrays, tolerance, extrapolation)
+        container[key] = (extrapolation, new_count, new_arrays)
+        stats[label] = {
+            "keys_before": count,
+            "keys_after": new_count,
+            "reduction": 1.0 - new_count / count if count else 0.0,
+            "max_error": max_error,
+        }
+    return stats
+
+
+COMPRESSION_ITEMS = [
+    ('NONE', "None", "Plain JSON"),
+    ('GZIP', "Gzip", "Lossless gzip framing (.json.gz)"),
+    ('ZSTD', "Zstandard", "Lossless zstd framing (.json.zst), needs a zstd module in Blender's Python"),
+]
+COMPRESSION_EXTENSIONS = {'NONE': ".json", 'GZIP': ".json.gz", 'ZSTD': ".json.zst"}
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def _zstd_module():
+    """compression.zstd (Python 3.14+) or the zstandard package, if any."""
+    try:
+        from compression import zstd
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+def open_animation_file(filepath):
+    """Open a transfer file for text reading, decompressing gzip/zstd framing
+    transparently (detected from the magic bytes, not the extension)."""
+    with open(filepath, 'rb') as f:
+        magic = f.read(4)
+    if magic[:2] == GZIP_MAGIC:
+        return gzip.open(filepath, 'rt')
+    if magic == ZSTD_MAGIC:
+        zstd = _zstd_module()
+        if zstd is None:
+            raise OSError("File is zstd-compressed but no zstd module is available")
+        return zstd.open(filepath, 'rt')
+    return open(filepath, 'r')
+
+
+def animation_filepath(filepath, compression):
+    """Give filepath the extension matching the chosen compression."""
+    extensions = sorted(COMPRESSION_EXTENSIONS.values(), key=len, reverse=True)
+    stripped = True
+    while stripped:
+        stripped = False
+        for extension in extensions:
+            if filepath.endswith(extension):
+                filepath = filepath[:-len(extension)]
+                stripped = True
+                break
+    return filepath + COMPRESSION_EXTENSIONS[compression]
+
+
+def write_animation_file(data, filepath, compression='NONE'):
+    # json.dumps() without indent runs on the C encoder; json.dump()/indent
+    # fall back to the pure-Python one, which dominated export time once
+    # the F-Curve reads were bulk.
+    text = json.dumps(data, separators=(',', ':'))
+    if compression == 'GZIP':
+        with gzip.open(filepath, 'wt', compresslevel=6) as f:
+            f.write(text)
+    elif compression == 'ZSTD':
+        zstd = _zstd_module()
+        if zstd is None:
+            raise OSError("No zstd module is available in this Python")
+        with zstd.open(filepath, 'wt') as f:
+            f.write(text)
+    else:
+        with open(filepath, 'w') as f:
+            f.write(text)
+
+
+def export_animation_snapshot(snapshot, filepath, compression='NONE', simplify_tolerance=0.0):
+    """Simplify (optional), serialize and write one snapshot; safe to run on
+    a worker thread. Returns a manifest entry describing the written file."""
+    keys_before = sum(container[key][1] for container, key, _ in _snapshot_channel_slots(snapshot))
+    stats = simplify_snapshot(snapshot, simplify_tolerance) if simplify_tolerance > 0 else {}
+
+    data = build_animation_data(snapshot)
+    if stats:
+        data["simplification"] = stats
+    write_animation_file(data, filepath, compression)
+
+    keys_after = sum(container[key][1] for container, key, _ in _snapshot_channel_slots(snapshot))
+    return {
+        "armature": snapshot["armature"],
+        "action": snapshot["action"],
+        "file": os.path.basename(filepath),
+        "frame_range": snapshot["frame_range"],
+        "bones": len(snapshot["bones"]),
+        "object_animation": snapshot["object_animation"] is not None,
+        "keys_before": keys_before,
+        "keys": keys_after,
+        "reduction": 1.0 - keys_after / keys_before if keys_before else 0.0,
+        "max_error": max((channel["max_error"] for channel in stats.values()), default=0.0),
+        "channels": stats,
+    }
+
+
+def _column_array(column, count, dtype):
+    """Inverse of _compact_column(): a per-key NumPy array."""
+    if isinstance(column, list):
+        return np.asarray(column, dtype=dtype)
+    return np.full(count, column, dtype=dtype)
+
+
+def fcurve_data_arrays(fcurve_data, frame_offset=0):
+    """Turn file F-Curve data (either format) into the same arrays
+    read_keyframe_arrays() produces, ready for foreach_set."""
+    if "keyframes" in fcurve_data:
+        # Legacy per-keyframe format: regroup into columns first
+        keyframes = fcurve_data["keyframes"]
+        count = len(keyframes)
+        columns = {
+            attr: [value for kp_data in keyframes for value in kp_data[attr]]
+            for attr in KEYFRAME_VECTOR_ATTRS
+        }
+        for attr in KEYFRAME_FLOAT_ATTRS + KEYFRAME_ENUM_ATTRS:
+            columns[attr] = [kp_data[attr] for kp_data in keyframes]
+    else:
+        count = fcurve_data["count"]
+        columns = fcurve_data
+
+    arrays = {}
+    for attr in KEYFRAME_VECTOR_ATTRS:
+        arrays[attr] = np.asarray(columns[attr], dtype=np.float32).reshape(count * 2)
+        # Handles move with their key, otherwise offset curves get skewed
+        arrays[attr][0::2] += frame_offset
+    for attr in KEYFRAME_FLOAT_ATTRS:
+        arrays[attr] = _column_array(columns[attr], count, np.float32)
+    for attr in KEYFRAME_ENUM_ATTRS:
+        values = keyframe_enum_table(attr)[1]
+        column = columns[attr]
+        if isinstance(column, list):
+            column = [values[name] for name in column]
+        else:
+            column = values[column]
+        arrays[attr] = _column_array(column, count, np.int32)
+    return count, arrays
+
+
+def ensure_action(id_data):
+    """Return the ID's action, creating and assigning one if needed."""
+    if not id_data.animation_data:
+        id_data.animation_data_create()
+    action = id_data.animation_data.action
+    if action is None:
+        action = bpy.data.actions.new(name=f"{id_data.name}Action")
+        id_data.animation_data.action = action
+    return action
+
+
+def ensure_fcurve(action, id_data, data_path, index=0, group_name=""):
+    """Find or create an F-Curve directly in the action, without going
+    through keyframe_insert: on the ID's slot channelbag for layered actions
+    (Blender 4.4+), or in action.fcurves for legacy ones."""
+    layered = hasattr(action, "fcurve_ensure_for_datablock")
+    if layered and id_data.animation_data.action_slot is None:
+        # The first F-Curve assigns the ID's slot
+        return action.fcurve_ensure_for_datablock(
+            id_data, data_path, index=index, group_name=group_name)
+
+    fcurves = fcurve_index.get_fcurve_index(action, id_data)
+    fcurve = fcurves.find(data_path, index)
+    if fcurve is None:
+        if layered:
+            fcurve = action.fcurve_ensure_for_datablock(
+                id_data, data_path, index=index, group_name=group_name)
+        else:
+            fcurve = action.fcurves.new(data_path, index=index, action_group=group_name)
+        fcurves.add(fcurve)
+    return fcurve
+
+
+def find_fcurve(action, id_data, data_path, index=0):
+    """Existing F-Curve of the ID for data_path/index, or None."""
+    if hasattr(action, "fcurve_ensure_for_datablock") and id_data.animation_data.action_slot is None:
+        return None
+    return fcurve_index.get_fcurve_index(action, id_data).find(data_path, index)
+
+
+def _resize_keyframe_points(keyframe_points, count):
+    current = len(keyframe_points)
+    if count > current:
+        keyframe_points.add(count - current)
+    else:
+        for _ in range(current - count):
+            keyframe_points.remove(keyframe_points[-1], fast=True)
+
+
+def select_keyframe_arrays(arrays, mask):
+    """Keep only the keys where mask is True. Returns (count, arrays)."""
+    pairs = np.repeat(mask, 2)
+    selected = {attr: arrays[attr][pairs] for attr in KEYFRAME_VECTOR_ATTRS}
+    for attr in KEYFRAME_FLOAT_ATTRS + KEYFRAME_ENUM_ATTRS:
+        selected[attr] = arrays[attr][mask]
+    return int(mask.sum()), selected
+
+
+def window_keyframe_arrays(count, arrays, frame_window):
+    """Keys inside the inclusive (start, end) frame window."""
+    if frame_window is None:
+        return count, arrays
+    frames = arrays["co"][0::2]
+    return select_keyframe_arrays(arrays, (frames >= frame_window[0]) & (frames <= frame_window[1]))
+
+
+def _merge_existing_keys(fcurve, count, arrays, frame_window=None):
+    """Prepend the F-Curve's current keys, minus the ones being replaced:
+    every key inside frame_window when splicing a range, otherwise only keys
+    on a frame being imported (what keyframe_insert used to do)."""
+    existing_count, existing = read_keyframe_arrays(fcurve)
+    if existing_count == 0:
+        return count, arrays
+
+    existing_frames = existing["co"][0::2]
+    if frame_window is not None:
+        keep = (existing_frames < frame_window[0]) | (existing_frames > frame_window[1])
+    else:
+        keep = ~np.isin(np.round(existing_frames, 3), np.round(arrays["co"][0::2], 3))
+    kept_count, kept = select_keyframe_arrays(existing, keep)
+    merged = {
+        attr: np.concatenate((kept[attr], arrays[attr]))
+        for attr in KEYFRAME_VECTOR_ATTRS + KEYFRAME_FLOAT_ATTRS + KEYFRAME_ENUM_ATTRS
+    }
+    return kept_count + count, merged
+
+
+def write_keyframe_arrays(fcurve, count, arrays):
+    """Size the F-Curve to count keys and fill every keyframe attribute with
+    one foreach_set each, then sort/recalculate handles once via update()."""
+    keyframe_points = fcurve.keyframe_points
+    _resize_keyframe_points(keyframe_points, count)
+    for attr in KEYFRAME_VECTOR_ATTRS + KEYFRAME_FLOAT_ATTRS + KEYFRAME_ENUM_ATTRS:
+        keyframe_points.foreach_set(attr, arrays[attr])
+    fcurve.update()
+
+
+def new_keyframe_arrays(frames, values, interpolation='BEZIER', handle_type='AUTO_CLAMPED', key_type='KEYFRAME'):
+    """Arrays for fresh keys at frames/values, with keyframe_insert's
+    defaults; handles start on the key and are recalculated by update()."""
+    count = len(frames)
+    co = np.empty(count * 2, dtype=np.float32)
+    co[0::2] = frames
+    co[1::2] = values
+    arrays = {"co": co, "handle_left": co.copy(), "handle_right": co.copy()}
+    for attr, default in (("back", 1.70158), ("amplitude", 0.8), ("period", 4.1)):
+        arrays[attr] = np.full(count, default, dtype=np.float32)
+    for attr, identifier in (("interpolation", interpolation), ("handle_left_type", handle_type),
+                             ("handle_right_type", handle_type), ("easing", 'AUTO'), ("type", key_type)):
+        arrays[attr] = np.full(count, _keyframe_enum_value(attr, identifier), dtype=np.int32)
+    return count, arrays
+
+
+def replace_keyframe_window(fcurve, count, arrays, frame_window):
+    """Write the given keys over every existing key inside frame_window,
+    keeping the keys outside it."""
+    count, arrays = _merge_existing_keys(fcurve, count, arrays, frame_window)
+    write_keyframe_arrays(fcurve, count, arrays)
+
+
+def import_fcurve_data(action, id_data, data_path, index, group_name, fcurve_data, frame_offset,
+                       frame_window=None):
+    """Bulk-load one serialized F-Curve into the action. Existing keys on
+    other frames are kept, matching the old keyframe_insert behaviour; with
+    a frame_window only keys inside it are imported, and they replace every
+    existing key in that window."""
+    count, arrays = fcurve_data_arrays(fcurve_data, frame_offset)
+    count, arrays = window_keyframe_arrays(count, arrays, frame_window)
+    if count:
+        fcurve = ensure_fcurve(action, id_data, data_path, index, group_name)
+    else:
+        # Nothing to add: only clear the window if the curve already exists
+        fcurve = find_fcurve(action, id_data, data_path, index)
+        if fcurve is None:
+            return None
+    count, arrays = _merge_existing_keys(fcurve, count, arrays, frame_window)
+    fcurve.extrapolation = fcurve_data.get("extrapolation", fcurve.extrapolation)
+    write_keyframe_arrays(fcurve, count, arrays)
+    return fcurve
+
+
+def insert_channel_keyframes(action, id_data, target, channels_data, base_path, group_name, frame_offset,
+                             frame_window=None):
+    """Create the F-Curves of a bone's or the armature object's channels
+    straight in the action and fill them in bulk: co, both bezier handles,
+    handle types, interpolation, easing and extrapolation in one pass."""
     for prop in ("location", "rotation_euler", "rotation_quaternion", "scale"):
         for index, fcurve_data in enumerate(channels_data.get(prop) or []):
             if fcurve_data is None:
                 continue
-            for kp_data in fcurve_data["keyframes"]:
-                frame = kp_data["co"][0] + frame_offset
-                getattr(target, prop)[index] = kp_data["co"][1]
-                target.keyframe_insert(data_path=prop, index=index, frame=frame)
             data_path = f"{base_path}.{prop}" if base_path else prop
-            style_tasks.append((data_path, index, fcurve_data))
+            import_fcurve_data(action, id_data, data_path, index, group_name, fcurve_data, frame_offset,
+                               frame_window)
 
     for prop_name, fcurve_data in (channels_data.get("custom") or {}).items():
-        for kp_data in fcurve_data["keyframes"]:
-            frame = kp_data["co"][0] + frame_offset
-            set_custom_property(target, prop_name, kp_data["co"][1])
-            target.keyframe_insert(data_path=f'["{prop_name}"]', frame=frame)
+        # The F-Curve only resolves if the custom property exists
+        if prop_name not in target.keys():
+            count, arrays = fcurve_data_arrays(fcurve_data)
+            if count:
+                set_custom_property(target, prop_name, float(arrays["co"][1]))
         data_path = f'{base_path}["{prop_name}"]' if base_path else f'["{prop_name}"]'
-        style_tasks.append((data_path, 0, fcurve_data))
+        import_fcurve_data(action, id_data, data_path, 0, group_name, fcurve_data, frame_offset, frame_window)
+
+
+class _JSONStream:
+    """Minimal incremental JSON reader: walks the structural characters
+    itself and decodes one value at a time with raw_decode(), refilling
+    the buffer in chunks so only the value being decoded is in memory."""
+    CHUNK_SIZE = 1 << 20
+    DELIMITERS = ' \t\r\n,:]}'
+
+    def __init__(self, f):
+        self.file = f
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size=None):
+        chunk = self.file.read(size or self.CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
 
+    def peek(self):
+        """Next non-whitespace character, without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Malformed animation file: expected {chars!r}, got {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value. Every failed attempt
+        restarts from the value's start, so the read size doubles on each
+        retry to keep a value spanning many chunks linear to decode."""
+        self.peek()
+        size = self.CHUNK_SIZE
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            # A number cut by the chunk boundary ("0." / "1e") still decodes,
+            # so only accept a value once its following delimiter is loaded
+            if (end == len(self.buffer) or self.buffer[end] not in self.DELIMITERS) \
+                    and not self.eof and self._fill(size):
+                size *= 2
+                continue
+            self.pos = end
+            return value
+
+
+def iter_animation_file(filepath):
+    """Stream an animation transfer file. Yields ("header", key, value) for
+    the small top-level entries and ("bone", bone_name, bone_data) for each
+    bone as soon as it is parsed, so peak memory is bounded by the largest
+    bone rather than by the file size."""
+    with open_animation_file(filepath) as f:
+        stream = _JSONStream(f)
+        stream.expect('{')
+        if stream.peek() == '}':
+            return
+        while True:
+            key = stream.value()
+            stream.expect(':')
+            if key == "bones":
+                stream.expect('{')
+                if stream.peek() == '}':
+                    stream.expect('}')
+                else:
+                    while True:
+                        bone_name = stream.value()
+                        stream.expect(':')
+                        yield "bone", bone_name, stream.value()
+                        if stream.expect(',}') == '}':
+                            break
+            else:
+                yield "header", key, stream.value()
+            if stream.expect(',}') == '}':
+                break
+
+
+# RETARGETING
+# Side conventions, tried in order: hand.L / hand_left, handLeft,
+# L_hand / left.hand, LeftHand (mixamo)
+SIDE_PATTERNS = (
+    re.compile(r'^(?P<base>.+?)[._\- ](?P<side>[LRlr]|Left|Right|left|right|LEFT|RIGHT)$'),
+    re.compile(r'^(?P<base>.+?)(?P<side>Left|Right|LEFT|RIGHT)$'),
+    re.compile(r'^(?P<side>[LRlr]|Left|Right|left|right|LEFT|RIGHT)[._\- ](?P<base>.+)$'),
+    re.compile(r'^(?P<side>Left|Right|LEFT|RIGHT)(?P<base>[A-Z0-9].*)$'),
+)
 
-def apply_fcurve_styles(action, armature, style_tasks, frame_offset):
-    """Restore extrapolation/handles/handle types/interpolation/easing on
-    every F-Curve that insert_channel_keyframes() just created."""
-    fcurve_lookup = {(fc.data_path, fc.array_index): fc for fc in get_action_fcurves(action, armature)}
 
-    for data_path, index, fcurve_data in style_tasks:
-        fcurve = fcurve_lookup.get((data_path, index))
-        if fcurve is None:
-            continue
+def split_bone_side(name):
+    """Split a bone name into (base, side) with side 'L', 'R' or None.
 
-        fcurve.extrapolation = fcurve_data.get("extrapolation", fcurve.extrapolation)
+    Sides need a separator or a case change (hand.L, handLeft) so names
+    like 'Ear' or 'Upright' are not read as sided."""
+    for pattern in SIDE_PATTERNS:
+        match = pattern.match(name)
+        if match:
+            return match.group("base"), match.group("side")[0].upper()
+    return name, None
+
+
+def _normalized_bone_key(name):
+    """Convention-independent key: side plus lower-cased alphanumerics of
+    the base name, so 'mixamorig:LeftArm', 'Arm.L' and 'arm_l' all match."""
+    base, side = split_bone_side(name.rsplit(':', 1)[-1])
+    return re.sub(r'[^0-9a-z]', '', base.lower()), side
+
+
+class RetargetMap:
+    """Source -> target bone name rules loaded from JSON or CSV.
+
+    JSON: {"bones": {"src": "dst", ...}, "rules": [["regex", "replacement"], ...]}
+    (a plain {"src": "dst"} object is read as "bones").
+    CSV: rows of source,target; a source starting with "re:" is a regex rule.
+
+    Regexes must match the whole name; replacements use re's \\1 syntax.
+    Explicit names and rules are tried on the full name and then on the
+    name without its side, the side being restored on the target lookup."""
+
+    def __init__(self, bones=None, rules=None):
+        self.bones = dict(bones or {})
+        self.rules = [(re.compile(pattern), replacement) for pattern, replacement in (rules or [])]
+
+    @classmethod
+    def load(cls, filepath):
+        if filepath.lower().endswith(".csv"):
+            bones, rules = {}, []
+            with open(filepath, newline='') as f:
+                for row in csv.reader(f):
+                    if len(row) < 2 or not row[0].strip() or row[0].startswith('#'):
+                        continue
+                    source, target = row[0].strip(), row[1].strip()
+                    if source.lower() == "source" and target.lower() == "target":
+                        continue
+                    if source.startswith("re:"):
+                        rules.append((source[3:], target))
+                    else:
+                        bones[source] = target
+            return cls(bones, rules)
+
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+        if "bones" in data or "rules" in data:
+            return cls(data.get("bones"), data.get("rules"))
+        return cls(data)
+
+    def candidates(self, name):
+        """Target names to try for a source bone, best first."""
+        if name in self.bones:
+            yield self.bones[name]
+        for pattern, replacement in self.rules:
+            match = pattern.fullmatch(name)
+            if match:
+                yield match.expand(replacement)
+                break
+        base, side = split_bone_side(name)
+        if side is not None:
+            if base in self.bones:
+                yield self.bones[base]
+            for pattern, replacement in self.rules:
+                match = pattern.fullmatch(base)
+                if match:
+                    yield match.expand(replacement)
+                    break
+        yield name
+
+
+class BoneRetargeter:
+    """Resolves source bone names to the target armature's pose bones.
+
+    The target's names are indexed once (exact and normalized); each source
+    name is then resolved once and memoized, and misses are collected for a
+    single summary instead of a warning per bone. Normalized names are only
+    matched with a retarget map or when fuzzy matching is asked for, and a
+    target bone is never driven by two source bones: later ones are skipped
+    and reported."""
+
+    def __init__(self, armature, retarget_map=None, fuzzy=False):
+        self.pose_bones = armature.pose.bones
+        self.retarget_map = retarget_map
+        self.fuzzy = fuzzy or retarget_map is not None
+        self.target_names = {pose_bone.name for pose_bone in self.pose_bones}
+        self.normalized = {}
+        if self.fuzzy:
+            # Bone order, so the first bone wins a normalized name
+            for pose_bone in self.pose_bones:
+                self.normalized.setdefault(_normalized_bone_key(pose_bone.name), pose_bone.name)
+        self.resolved = {}
+        self.sources = {}
+        self.unmapped = []
+        self.conflicts = []
+
+    def _resolve_name(self, source_name):
+        candidates = self.retarget_map.candidates(source_name) if self.retarget_map else (source_name,)
+        source_side = _normalized_bone_key(source_name)[1]
+        for candidate in candidates:
+            if candidate in self.target_names:
+                return candidate
+            if not self.fuzzy:
+                continue
+            key, side = _normalized_bone_key(candidate)
+            # A side-less candidate (rule applied to the base name) takes
+            # the source bone's side
+            target_name = self.normalized.get((key, side if side is not None else source_side))
+            if target_name is not None:
+                return target_name
+        return None
+
+    def resolve(self, source_name):
+        """Target pose bone for a source bone name, or None."""
+        if source_name not in self.resolved:
+            target_name = self._resolve_name(source_name)
+            if target_name is None:
+                self.unmapped.append(source_name)
+            elif self.sources.setdefault(target_name, source_name) != source_name:
+                self.conflicts.append((source_name, self.sources[target_name], target_name))
+                target_name = None
+            self.resolved[source_name] = target_name
+        target_name = self.resolved[source_name]
+        return self.pose_bones[target_name] if target_name is not None else None
+
+    def summary(self, limit=10):
+        """One line naming the unmapped and conflicting source bones, or ""
+        if every source bone has its own target."""
+        parts = []
+        if self.unmapped:
+            names = ", ".join(self.unmapped[:limit])
+            if len(self.unmapped) > limit:
+                names += f", ... (+{len(self.unmapped) - limit} more)"
+            parts.append(f"{len(self.unmapped)} source bones not found on target: {names}")
+        if self.conflicts:
+            names = ", ".join(
+                f"{source} (as {first} -> {target})" for source, first, target in self.conflicts[:limit]
+            )
+            if len(self.conflicts) > limit:
+                names += f", ... (+{len(self.conflicts) - limit} more)"
+            parts.append(f"{len(self.conflicts)} source bones skipped, target already used: {names}")
+        return "; ".join(parts)
+
+
+def make_bone_filter(armature, name_pattern="", collection_name=""):
+    """Return a predicate(bone_name) for comma-separated bone-name globs
+    and/or one of the armature's bone collections, or None if neither is set."""
+    patterns = [pattern.strip() for pattern in name_pattern.split(',') if pattern.strip()]
+    if not patterns and not collection_name:
+        return None
+
+    collection_bones = None
+    if collection_name:
+        collections = getattr(armature.data, "collections_all", None)
+        if collections is None:
+            collections = getattr(armature.data, "collections", None)
+        collection = collections.get(collection_name) if collections is not None else None
+        collection_bones = {bone.name for bone in collection.bones} if collection else set()
+
+    def accept(bone_name):
+        if patterns and not any(fnmatch.fnmatchcase(bone_name, pattern) for pattern in patterns):
+            return False
+        return collection_bones is None or bone_name in collection_bones
+
+    return accept
+
+
+class AnimationFilterOptions:
+    """Frame window and bone subset shared by the export and import operators."""
+    use_frame_window: BoolProperty(
+        name="Frame Window",
+        description="Only transfer keys inside a frame range",
+        default=False
+    )
+
+    frame_window_start: IntProperty(name="Start", default=1)
+
+    frame_window_end: IntProperty(name="End", default=250)
+
+    bone_pattern: StringProperty(
+        name="Bones",
+        description="Only transfer bones matching these comma-separated globs (e.g. hand.L, finger*.L)",
+        default=""
+    )
 
-        by_frame = {
-            round(kp_data["co"][0] + frame_offset): kp_data
-            for kp_data in fcurve_data["keyframes"]
+    bone_collection: StringProperty(
+        name="Bone Collection",
+        description="Only transfer bones in this bone collection",
+        default=""
+    )
+
+    def draw_filter_options(self, layout):
+        layout.prop(self, "use_frame_window")
+        row = layout.row(align=True)
+        row.enabled = self.use_frame_window
+        row.prop(self, "frame_window_start")
+        row.prop(self, "frame_window_end")
+        layout.prop(self, "bone_pattern")
+        layout.prop(self, "bone_collection")
+
+    def frame_window(self):
+        if not self.use_frame_window:
+            return None
+        return (min(self.frame_window_start, self.frame_window_end),
+                max(self.frame_window_start, self.frame_window_end))
+
+    def bone_filter(self, armature):
+        return make_bone_filter(armature, self.bone_pattern, self.bone_collection)
+
+
+class AnimationExportOptions:
+    """Compression/simplification settings shared by the export operators."""
+    compression: EnumProperty(
+        name="Compression",
+        description="Lossless framing applied to the written JSON",
+        items=COMPRESSION_ITEMS,
+        default='NONE'
+    )
+
+    simplify: BoolProperty(
+        name="Simplify Curves",
+        description="Drop keys the neighbouring bezier segments reconstruct within the tolerance (lossy)",
+        default=False
+    )
+
+    simplify_tolerance: FloatProperty(
+        name="Tolerance",
+        description="Maximum value error allowed when dropping keys",
+        default=0.001,
+        min=0.0,
+        precision=5
+    )
+
+    def draw_export_options(self, layout):
+        layout.prop(self, "compression")
+        layout.prop(self, "simplify")
+        row = layout.row()
+        row.enabled = self.simplify
+        row.prop(self, "simplify_tolerance")
+
+    def export_options(self):
+        return {
+            "compression": self.compression,
+            "simplify_tolerance": self.simplify_tolerance if self.simplify else 0.0,
         }
-        for kp in fcurve.keyframe_points:
-            kp_data = by_frame.get(round(kp.co[0]))
-            if kp_data is None:
-                continue
-            for attr in KEYFRAME_POINT_ATTRS:
-                if attr in kp_data:
-                    setattr(kp, attr, kp_data[attr])
-            # Handle positions only stick for FREE/ALIGNED types (others are auto-computed)
-            if "handle_left" in kp_data:
-                kp.handle_left = kp_data["handle_left"]
-            if "handle_right" in kp_data:
-                kp.handle_right = kp_data["handle_right"]
 
-        fcurve.update()
+
+def unique_filename(name, used_names):
+    """name, or name_2, name_3... if the batch already wrote that name.
+    clean_name() maps different ID names to the same string, and names are
+    compared case-insensitively for case-insensitive file systems."""
+    candidate = name
+    index = 2
+    while candidate.lower() in used_names:
+        candidate = f"{name}_{index}"
+        index += 1
+    used_names.add(candidate.lower())
+    return candidate
+
+
+def format_simplification_report(entry):
+    if not entry["channels"]:
+        return ""
+    return f", {entry['reduction']:.0%} keys removed (max error {entry['max_error']:.4g})"
+
+
+def print_simplification_summary(entry, tolerance, error_fraction=0.9, limit=10):
+    """One console line for the whole simplification, plus the channels
+    whose error came within error_fraction of the tolerance (worst first)."""
+    channels = entry["channels"]
+    if not channels:
+        return
+    print(f"Simplified {len(channels)} channels: {entry['keys_before']} -> {entry['keys']} keys "
+          f"({entry['reduction']:.0%} removed, max error {entry['max_error']:.6g})")
+    worst = sorted(
+        (item for item in channels.items() if item[1]["max_error"] >= tolerance * error_fraction),
+        key=lambda item: item[1]["max_error"], reverse=True
+    )
+    for label, channel in worst[:limit]:
+        print(f"  {label}: {channel['keys_before']} -> {channel['keys_after']} keys, "
+              f"max error {channel['max_error']:.6g}")
+    if len(worst) > limit:
+        print(f"  ... (+{len(worst) - limit} more channels near the tolerance)")
 
 
 # EXPORT OPERATOR
-class ANIM_OT_export_rotation_data(Operator, ExportHelper):
+class ANIM_OT_export_rotation_data(Operator, ExportHelper, AnimationExportOptions, AnimationFilterOptions):
     """Export rotation animation data from armature"""
     bl_idname = "anim.export_rotation_data"
     bl_label = "Export Rotation Data"
     bl_options = {'REGISTER', 'UNDO'}
     
     filename_ext = ".json"
-    filter_glob: StringProperty(default="*.json", options={'HIDDEN'})
+    filter_glob: StringProperty(default="*.json;*.json.gz;*.json.zst", options={'HIDDEN'})
     
     def invoke(self, context, event):
         return super().invoke(context, event)
@@ -232,22 +1298,31 @@ class ANIM_OT_export_rotation_data(Operator, ExportHelper):
             return {'CANCELLED'}
         
         # Export animation data
-        bone_count, object_animated = self.export_armature_animation(
-            armature, 
-            self.filepath
-        )
+        filepath = animation_filepath(self.filepath, self.compression)
+        try:
+            entry = self.export_armature_animation(armature, filepath)
+        except OSError as e:
+            self.report({'ERROR'}, f"Failed to write file: {str(e)}")
+            return {'CANCELLED'}
 
+        bone_count, object_animated = entry["bones"], entry["object_animation"]
         if bone_count > 0 or object_animated:
             parts = []
             if bone_count > 0:
                 parts.append(f"{bone_count} bones")
             if object_animated:
                 parts.append("object transform")
-            self.report({'INFO'}, f"Exported {' and '.join(parts)} to {self.filepath}")
+            print_simplification_summary(entry, self.simplify_tolerance)
+            self.report({'INFO'}, f"Exported {' and '.join(parts)} to {filepath}"
+                                  f"{format_simplification_report(entry)}")
             return {'FINISHED'}
         else:
             self.report({'WARNING'}, "No animated bones found")
             return {'CANCELLED'}
+
+    def draw(self, context):
+        self.draw_filter_options(self.layout)
+        self.draw_export_options(self.layout)
     
     def export_armature_animation(self, armature, filepath):
         """Export all bones with keyframes from an armature, plus the
@@ -255,87 +1330,179 @@ class ANIM_OT_export_rotation_data(Operator, ExportHelper):
 
         Full F-Curve fidelity is preserved (keyframe co, both bezier handles,
         handle types, interpolation, easing, extrapolation) - nothing is
-        resampled, and no scene.frame_set/depsgraph evaluation is needed."""
-        action = armature.animation_data.action
-
-        bones = {}
-        object_channels = _new_channels()
-        min_frame = float('inf')
-        max_frame = float('-inf')
+        resampled, and no scene.frame_set/depsgraph evaluation is needed,
+        unless curve simplification is enabled. Returns the manifest entry."""
+        snapshot = snapshot_armature_animation(armature, self.frame_window(), self.bone_filter(armature))
+        return export_animation_snapshot(snapshot, filepath, **self.export_options())
+
+
+class ANIM_OT_batch_export_animation(Operator, AnimationExportOptions, AnimationFilterOptions):
+    """Export the animation of many armatures at once, one file per armature/action"""
+    bl_idname = "anim.batch_export_animation"
+    bl_label = "Batch Export Animation"
+    bl_options = {'REGISTER'}
+
+    directory: StringProperty(subtype='DIR_PATH')
+
+    source: EnumProperty(
+        name="Armatures",
+        items=[
+            ('SELECTED', "Selected", "Every selected armature"),
+            ('COLLECTION', "Active Collection", "Every armature in the active collection and its children"),
+            ('FILES', "File List", "Every armature of the .blend files listed in a text file"),
+        ],
+        default='SELECTED'
+    )
 
-        for fcurve in get_action_fcurves(action, armature):
-            scope, bone_name, prop = _classify_fcurve(fcurve.data_path)
-            if scope is None:
-                continue
+    file_list: StringProperty(
+        name="File List",
+        description="Text file with one .blend path per line (relative to the list, # starts a comment)",
+        default="",
+        subtype='FILE_PATH'
+    )
 
-            for keyframe in fcurve.keyframe_points:
-                frame = keyframe.co[0]
-                if frame < min_frame:
-                    min_frame = frame
-                if frame > max_frame:
-                    max_frame = frame
-
-            if scope == "object_transform":
-                if 0 <= fcurve.array_index < TRANSFORM_CHANNELS[prop]:
-                    object_channels[prop][fcurve.array_index] = fcurve
-            elif scope == "object_custom":
-                object_channels["custom"][prop] = fcurve
-            elif scope == "bone_transform":
-                entry = bones.setdefault(bone_name, _new_channels())
-                if 0 <= fcurve.array_index < TRANSFORM_CHANNELS[prop]:
-                    entry[prop][fcurve.array_index] = fcurve
-            elif scope == "bone_custom":
-                entry = bones.setdefault(bone_name, _new_channels())
-                entry["custom"][prop] = fcurve
-
-        # Handle case with no keyframes
-        if min_frame == float('inf'):
-            min_frame, max_frame = 0, 0
-        else:
-            min_frame, max_frame = int(round(min_frame)), int(round(max_frame))
-
-        data = {
-            "armature": armature.name,
-            "action": action.name,
-            "frame_range": [min_frame, max_frame],
-            "object_custom_properties": get_custom_properties(armature),
-            "bones": {}
-        }
+    max_workers: IntProperty(
+        name="Threads",
+        description="Worker threads serializing and writing files (0 = one per CPU)",
+        default=0,
+        min=0
+    )
 
-        # Armature object's own transform animation
-        if _channels_animated(object_channels):
-            data["object_animation"] = {
-                "rotation_mode": armature.rotation_mode,
-                "channels": serialize_channels(object_channels),
-            }
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
 
-        for bone_name, channels in bones.items():
-            if bone_name not in armature.pose.bones or not _channels_animated(channels):
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "source")
+        if self.source == 'FILES':
+            layout.prop(self, "file_list")
+        layout.prop(self, "max_workers")
+        self.draw_filter_options(layout)
+        self.draw_export_options(layout)
+
+    def get_armatures(self, context, objects=None):
+        if objects is None and self.source == 'COLLECTION':
+            objects = context.view_layer.active_layer_collection.collection.all_objects
+        elif objects is None:
+            objects = context.selected_objects
+        return [
+            obj for obj in objects
+            if obj.type == 'ARMATURE' and obj.animation_data and obj.animation_data.action
+        ]
+
+    def link_listed_files(self):
+        """Link the objects of every listed .blend file. Returns (linked
+        objects, libraries added by this run, unreadable files)."""
+        list_path = bpy.path.abspath(self.file_list)
+        with open(list_path, 'r') as f:
+            lines = [line.strip() for line in f]
+        blend_paths = [
+            os.path.normpath(os.path.join(os.path.dirname(list_path), line))
+            for line in lines if line and not line.startswith('#')
+        ]
+
+        existing = {library.as_pointer() for library in bpy.data.libraries}
+        objects, failed = [], []
+        for blend_path in blend_paths:
+            try:
+                with bpy.data.libraries.load(blend_path, link=True) as (data_from, data_to):
+                    data_to.objects = list(data_from.objects)
+            except OSError:
+                failed.append(blend_path)
                 continue
+            objects.extend(obj for obj in data_to.objects if obj is not None)
+        added = [library for library in bpy.data.libraries if library.as_pointer() not in existing]
+        return objects, added, failed
+
+    def snapshot_jobs(self, armatures, directory):
+        """RNA is only safe to read from the main thread: take every
+        snapshot here, the pool only gets pure-Python/NumPy work."""
+        jobs = []
+        used_names = set()
+        for armature in armatures:
+            snapshot = snapshot_armature_animation(armature, self.frame_window(), self.bone_filter(armature))
+            filename = unique_filename(
+                f"{bpy.path.clean_name(snapshot['armature'])}__{bpy.path.clean_name(snapshot['action'])}",
+                used_names
+            )
+            jobs.append((snapshot, animation_filepath(os.path.join(directory, filename), self.compression)))
+        return jobs
 
-            pose_bone = armature.pose.bones[bone_name]
-            data["bones"][bone_name] = {
-                "rotation_mode": pose_bone.rotation_mode,
-                "custom_properties": get_custom_properties(pose_bone),
-                "channels": serialize_channels(channels),
-            }
+    def execute(self, context):
+        libraries = []
+        if self.source == 'FILES':
+            try:
+                objects, libraries, unreadable = self.link_listed_files()
+            except OSError as e:
+                self.report({'ERROR'}, f"Failed to read file list: {str(e)}")
+                return {'CANCELLED'}
+            if unreadable:
+                self.report({'WARNING'}, f"Could not read {len(unreadable)} file(s): {', '.join(unreadable)}")
+            armatures = self.get_armatures(context, objects)
+        else:
+            armatures = self.get_armatures(context)
 
-        # Write to file
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        try:
+            if not armatures:
+                self.report({'ERROR'}, "No animated armature found")
+                return {'CANCELLED'}
+            directory = bpy.path.abspath(self.directory)
+            os.makedirs(directory, exist_ok=True)
+            jobs = self.snapshot_jobs(armatures, directory)
+        finally:
+            # Snapshots hold no RNA data: the linked files can go right away,
+            # with the cached F-Curves of their actions
+            for library in libraries:
+                bpy.data.libraries.remove(library)
+            if libraries:
+                fcurve_index.invalidate()
+
+        workers = self.max_workers or os.cpu_count() or 1
+        entries = []
+        failed = 0
+        with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            options = self.export_options()
+            futures = [pool.submit(export_animation_snapshot, snapshot, path, **options) for snapshot, path in jobs]
+            for (snapshot, path), future in zip(jobs, futures):
+                try:
+                    entries.append(future.result())
+                except Exception as e:
+                    # One bad snapshot (I/O, serialization, compression) must
+                    # not cost the rest of the batch its manifest entries
+                    failed += 1
+                    entries.append({
+                        "armature": snapshot["armature"],
+                        "action": snapshot["action"],
+                        "file": os.path.basename(path),
+                        "error": str(e),
+                    })
+
+        manifest = {"format_version": FORMAT_VERSION, "files": entries}
+        try:
+            with open(os.path.join(directory, BATCH_MANIFEST_NAME), 'w') as f:
+                json.dump(manifest, f, indent=2)
+        except OSError as e:
+            self.report({'ERROR'}, f"Exported {len(jobs) - failed} armature(s), {failed} failed, "
+                                   f"but failed to write the manifest: {str(e)}")
+            return {'FINISHED'}
 
-        return len(data["bones"]), "object_animation" in data
+        if failed:
+            self.report({'WARNING'}, f"Exported {len(jobs) - failed} armature(s), {failed} failed (see manifest)")
+        else:
+            self.report({'INFO'}, f"Exported {len(jobs)} armature(s) to {directory}")
+        return {'FINISHED'}
 
 
 # IMPORT OPERATOR
-class ANIM_OT_import_rotation_data(Operator, ImportHelper):
+class ANIM_OT_import_rotation_data(Operator, ImportHelper, AnimationFilterOptions):
     """Import rotation animation data to armature"""
     bl_idname = "anim.import_rotation_data"
     bl_label = "Import Rotation Data"
     bl_options = {'REGISTER', 'UNDO'}
     
     filename_ext = ".json"
-    filter_glob: StringProperty(default="*.json", options={'HIDDEN'})
+    filter_glob: StringProperty(default="*.json;*.json.gz;*.json.zst", options={'HIDDEN'})
     
     frame_offset: IntProperty(
         name="Frame Offset",
@@ -348,6 +1515,28 @@ class ANIM_OT_import_rotation_data(Operator, ImportHelper):
         description="Clear existing animation before importing",
         default=False
     )
+
+    retarget_map: StringProperty(
+        name="Retarget Map",
+        description="JSON or CSV bone name map for rigs with different bone names (optional)",
+        default="",
+        subtype='FILE_PATH'
+    )
+
+    fuzzy_bone_names: BoolProperty(
+        name="Match Similar Bone Names",
+        description="Without a retarget map, also match bones whose names only differ in case, "
+                    "separators or side notation (e.g. hand_l and Hand.L)",
+        default=False
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "frame_offset")
+        layout.prop(self, "clear_existing")
+        layout.prop(self, "retarget_map")
+        layout.prop(self, "fuzzy_bone_names")
+        self.draw_filter_options(layout)
     
     def execute(self, context):
         armature = context.active_object
@@ -378,11 +1567,29 @@ class ANIM_OT_import_rotation_data(Operator, ImportHelper):
     
     def import_armature_animation(self, armature, filepath, frame_offset, clear_existing):
         """Import animation data to armature, rebuilding original bezier
-        handles/handle types/interpolation/easing/extrapolation exactly."""
+        handles/handle types/interpolation/easing/extrapolation exactly.
+
+        The file is streamed: each bone's keys are applied as soon as that
+        bone has been parsed, never holding the whole file in memory.
+
+        With a frame window (the operator's, or the one a partial export
+        recorded, shifted by frame_offset) keys are spliced into the
+        existing F-Curves, replacing only the keys inside that window."""
+        retarget_map = None
+        if self.retarget_map:
+            try:
+                retarget_map = RetargetMap.load(bpy.path.abspath(self.retarget_map))
+            except (OSError, ValueError, re.error) as e:
+                self.report({'ERROR'}, f"Failed to read retarget map: {str(e)}")
+                return 0, False
+        retargeter = BoneRetargeter(armature, retarget_map, self.fuzzy_bone_names)
+
+        events = iter_animation_file(filepath)
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-        except Exception as e:
+            # Pull the first entry before touching the armature, so an
+            # unreadable file leaves the existing animation alone
+            first_event = next(events, None)
+        except (OSError, ValueError) as e:
             self.report({'ERROR'}, f"Failed to read file: {str(e)}")
             return 0, False
         
@@ -391,46 +1598,57 @@ class ANIM_OT_import_rotation_data(Operator, ImportHelper):
             if armature.animation_data.action:
                 bpy.data.actions.remove(armature.animation_data.action)
         
-        # Ensure armature has animation data
-        if not armature.animation_data:
-            armature.animation_data_create()
-
-        for prop_name, value in data.get("object_custom_properties", {}).items():
-            set_custom_property(armature, prop_name, value)
-
-        style_tasks = []
+        action = ensure_action(armature)
+        frame_window = self.frame_window()
+        bone_filter = self.bone_filter(armature)
 
         object_animated = False
-        object_animation = data.get("object_animation")
-        if object_animation:
-            armature.rotation_mode = object_animation["rotation_mode"]
-            insert_channel_keyframes(armature, object_animation["channels"], "", frame_offset, style_tasks)
-            object_animated = True
-
         imported_count = 0
 
-        for source_bone, bone_data in data["bones"].items():
-            if source_bone not in armature.pose.bones:
-                print(f"Warning: Bone '{source_bone}' not found in target armature, skipping")
-                continue
-            
-            pose_bone = armature.pose.bones[source_bone]
-            pose_bone.rotation_mode = bone_data["rotation_mode"]
+        try:
+            for kind, key, value in itertools.chain([first_event] if first_event else [], events):
+                if kind == "bone":
+                    pose_bone = retargeter.resolve(key)
+                    if pose_bone is None:
+                        continue
+                    if bone_filter is not None and not bone_filter(pose_bone.name):
+                        continue
+                    self.import_bone_animation(armature, action, pose_bone, value, frame_offset, frame_window)
+                    imported_count += 1
+                elif key == "frame_window":
+                    if frame_window is None and value is not None:
+                        frame_window = (value[0] + frame_offset, value[1] + frame_offset)
+                elif key == "object_custom_properties":
+                    for prop_name, prop_value in value.items():
+                        set_custom_property(armature, prop_name, prop_value)
+                elif key == "object_animation":
+                    armature.rotation_mode = value["rotation_mode"]
+                    insert_channel_keyframes(
+                        action, armature, armature, value["channels"], "", "Object Transforms", frame_offset,
+                        frame_window
+                    )
+                    object_animated = True
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Failed to read file: {str(e)}")
 
-            for prop_name, value in bone_data.get("custom_properties", {}).items():
-                set_custom_property(pose_bone, prop_name, value)
+        summary = retargeter.summary()
+        if summary:
+            print(f"Warning: {summary}")
+            self.report({'WARNING'}, summary)
 
-            insert_channel_keyframes(
-                pose_bone, bone_data["channels"], f'pose.bones["{source_bone}"]', frame_offset, style_tasks
-            )
+        return imported_count, object_animated
 
-            imported_count += 1
+    def import_bone_animation(self, armature, action, pose_bone, bone_data, frame_offset, frame_window=None):
+        """Apply one streamed bone entry to its (retargeted) pose bone."""
+        pose_bone.rotation_mode = bone_data["rotation_mode"]
 
-        action = armature.animation_data.action
-        if action is not None:
-            apply_fcurve_styles(action, armature, style_tasks, frame_offset)
+        for prop_name, value in bone_data.get("custom_properties", {}).items():
+            set_custom_property(pose_bone, prop_name, value)
 
-        return imported_count, object_animated
+        insert_channel_keyframes(
+            action, armature, pose_bone, bone_data["channels"], f'pose.bones["{pose_bone.name}"]',
+            pose_bone.name, frame_offset, frame_window
+        )
 
 
 # UI PANEL
@@ -464,6 +1682,7 @@ class ANIM_PT_transfer_panel(Panel):
         box.label(text="Export Animation", icon='EXPORT')
         col = box.column(align=True)
         col.operator("anim.export_rotation_data", text="Export to File", icon='DISK_DRIVE')
+        col.operator("anim.batch_export_animation", text="Batch Export Armatures", icon='DOCUMENTS')
         
         layout.separator()
         
@@ -477,6 +1696,7 @@ class ANIM_PT_transfer_panel(Panel):
 # REGISTRATION
 classes = (
     ANIM_OT_export_rotation_data,
+    ANIM_OT_batch_export_animation,
     ANIM_OT_import_rotation_data,
     ANIM_PT_transfer_panel,
 )
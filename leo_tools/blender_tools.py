@@ -8,43 +8,14 @@ from leo_tools import collection_display
 from leo_tools import bake_tools
 from leo_tools import render_tools
 from leo_tools import rigging_tools
-
-
-def get_action_fcurves(action, id_data=None):
-    """Return the F-Curves of an action, compatible with both the legacy
-    Action API (action.fcurves, Blender < 5.0) and the layered/slotted
-    Action system (channelbags), which fully replaced it in Blender 5.0."""
-    if action is None:
-        return []
-
-    # Legacy API - still present on Blender versions before 5.0
-    if hasattr(action, "fcurves"):
-        return list(action.fcurves)
-
-    # Blender 5.0+: action.fcurves was removed, fcurves now live on
-    # per-slot channelbags (bpy_extras.anim_utils helpers)
-    try:
-        from bpy_extras import anim_utils
-    except ImportError:
-        return []
-
-    action_slot = None
-    if id_data is not None and getattr(id_data, "animation_data", None):
-        action_slot = id_data.animation_data.action_slot
-
-    if action_slot is not None:
-        channelbag = anim_utils.action_get_channelbag_for_slot(
-            action, action_slot)
-        return list(channelbag.fcurves) if channelbag else []
-
-    # No specific slot known - gather fcurves from every channelbag
-    fcurves = []
-    for layer in action.layers:
-        for strip in layer.strips:
-            if strip.type == 'KEYFRAME':
-                for channelbag in strip.channelbags:
-                    fcurves.extend(channelbag.fcurves)
-    return fcurves
+from leo_tools import fcurve_index
+from leo_tools import tween_engine
+from leo_tools import keyframe_index
+from leo_tools import interpolation_engine
+from leo_tools import animation_inventory
+from leo_tools import localization_engine
+from leo_tools import modifier_engine
+from leo_tools import gp_bake_engine
 
 
 class TexturingPanel(bpy.types.Panel):
@@ -97,8 +68,16 @@ class ModelingPanel(bpy.types.Panel):
                         text="Remove collision modifiers")
         layout.operator("leo_tools.remove_all_modifiers",
                         text="Remove all modifiers")
+        layout.operator("leo_tools.apply_modifiers",
+                        text="Apply subdivision modifiers").modifier_type = 'SUBSURF'
+        layout.operator("leo_tools.apply_modifiers",
+                        text="Apply all modifiers").modifier_type = 'ALL'
         layout.operator("leo_tools.copy_modifiers_with_drivers",
                         text="Copy modifiers with drivers")
+        layout.operator("leo_tools.profile_modifier_stacks",
+                        text="Profile modifier stacks")
+        layout.operator("leo_tools.disable_heavy_modifiers",
+                        text="Disable heavy modifiers")
         layout.separator()
         layout.label(text="Mesh")
         layout.operator("leo_tools.remove_all_vertex_groups",
@@ -127,8 +106,22 @@ class DisplayPanel(bpy.types.Panel):
                         text="Collection to Bounding Box")
         layout.operator("object.collection_textured",
                         text="Collection to Textured")
+        active_layer_collection = context.view_layer.active_layer_collection
+        performance_on = active_layer_collection is not None and collection_display.is_performance_mode(
+            active_layer_collection.collection)
+        layout.operator("object.collection_performance_mode",
+                        text="Restore from Performance Mode" if performance_on else "Collection Performance Mode",
+                        depress=performance_on)
         layout.operator("leo_tools.local_copy_linked_collection",
                         text="Local copy linked collection")
+        layout.operator("leo_tools.local_copy_linked_collection",
+                        text="Lazy local copy linked collection").mode = 'LAZY'
+        layout.operator("leo_tools.localize_object",
+                        text="Localize selected shells")
+        layout.operator("leo_tools.local_copy_linked_collection",
+                        text="Override linked collection").mode = 'OVERRIDE'
+        layout.operator("leo_tools.resync_library_overrides",
+                        text="Resync library overrides")
         layout.separator()
         layout.label(text="Grease Pencil")
         layout.operator("leo_tools.merge_gp_objects",
@@ -169,6 +162,10 @@ class AnimToolsPanel(bpy.types.Panel):
                         text="Select animated objects")
         layout.operator("leo_tools.delete_animation_actions",
                         text="Delete animation actions")
+        layout.operator("leo_tools.purge_unused_actions",
+                        text="Purge unused actions")
+        layout.operator("leo_tools.report_animation_inventory",
+                        text="Animation report")
 
         layout.separator()
 
@@ -210,6 +207,8 @@ class AnimToolsPanel(bpy.types.Panel):
         if obj and obj.type == 'ARMATURE' and obj.animation_data and obj.animation_data.action:
             layout.operator("anim.convert_rig_interpolation",
                             text="Stepped ↔ Curve")
+            layout.operator("anim.convert_rig_interpolation",
+                            text="Stepped, Curved Breakdowns").mode = 'STEPPED_CURVED_BREAKDOWNS'
         else:
             layout.label(text="No animated rig selected")
 
@@ -220,7 +219,8 @@ class AnimToolsPanel(bpy.types.Panel):
             layout.label(text=f"Selected Object: {obj.name}")
             layout.prop(context.scene, "tween_machine_percentage",
                         text="Percentage", slider=True)
-            if context.scene.tween_stored_pose:
+            layout.prop(context.scene, "tween_persist_pose")
+            if tween_engine.stored_pose() or context.scene.tween_stored_pose:
                 layout.operator("anim.reset_tween_stored_pose",
                                 text="Clear Stored Pose")
         else:
@@ -235,7 +235,7 @@ class reset_tween_stored_pose(bpy.types.Operator):
     bl_description = "Clear the stored pose from memory"
 
     def execute(self, context):
-        context.scene.tween_stored_pose = ""
+        tween_engine.clear_stored_pose(context.scene)
         self.report({'INFO'}, "Stored pose cleared")
         return {'FINISHED'}
 
@@ -295,6 +295,31 @@ class convert_rig_interpolation(bpy.types.Operator):
     bl_idname = "anim.convert_rig_interpolation"
     bl_label = "Convert Rig Interpolation"
     bl_description = "Convert all keyframes on the current rig between stepped and curve interpolation"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    mode: bpy.props.EnumProperty(
+        name="Mode",
+        items=interpolation_engine.CONVERSION_MODES,
+        default='TOGGLE')
+
+    all_selected_armatures: bpy.props.BoolProperty(
+        name="All Selected Armatures",
+        description="Convert every selected armature, not only the active one",
+        default=False)
+
+    selected_bones_only: bpy.props.BoolProperty(
+        name="Selected Bones Only",
+        description="Only convert the keys of selected bones",
+        default=False)
+
+    use_frame_range: bpy.props.BoolProperty(
+        name="Frame Range",
+        description="Only convert keys inside a frame range",
+        default=False)
+
+    frame_start: bpy.props.IntProperty(name="Start", default=1)
+
+    frame_end: bpy.props.IntProperty(name="End", default=250)
 
     def execute(self, context):
         obj = context.active_object
@@ -303,51 +328,49 @@ class convert_rig_interpolation(bpy.types.Operator):
             self.report({'ERROR'}, "Please select an armature")
             return {'CANCELLED'}
 
-        if not obj.animation_data or not obj.animation_data.action:
+        armatures = [obj]
+        if self.all_selected_armatures:
+            armatures += [o for o in context.selected_objects if o.type == 'ARMATURE' and o != obj]
+        armatures = [a for a in armatures if a.animation_data and a.animation_data.action]
+
+        if not armatures:
             self.report({'ERROR'}, "Armature has no animation data")
             return {'CANCELLED'}
 
-        action = obj.animation_data.action
+        # F-Curves shared through one action are converted once
+        fcurves = {}
+        for armature in armatures:
+            for fcurve in interpolation_engine.scoped_fcurves(armature, self.selected_bones_only):
+                fcurves.setdefault(fcurve.as_pointer(), fcurve)
 
-        # Count interpolation types to determine what to convert to
-        constant_count = 0
-        bezier_count = 0
-        total_keys = 0
+        frame_range = None
+        if self.use_frame_range:
+            frame_range = (min(self.frame_start, self.frame_end), max(self.frame_start, self.frame_end))
 
-        for fcurve in get_action_fcurves(action, obj):
-            for keyframe in fcurve.keyframe_points:
-                total_keys += 1
-                if keyframe.interpolation == 'CONSTANT':
-                    constant_count += 1
-                elif keyframe.interpolation == 'BEZIER':
-                    bezier_count += 1
+        converted, mode, total_keys = interpolation_engine.convert_interpolation(
+            list(fcurves.values()), self.mode, frame_range)
 
         if total_keys == 0:
             self.report({'WARNING'}, "No keyframes found")
             return {'CANCELLED'}
 
-        # Determine target interpolation (convert to whichever is less common)
-        if constant_count >= bezier_count:
-            target_interpolation = 'BEZIER'
-            target_name = "Curve (Bezier)"
-        else:
-            target_interpolation = 'CONSTANT'
-            target_name = "Stepped (Constant)"
-
-        # Convert all keyframes
-        converted = 0
-        for fcurve in get_action_fcurves(action, obj):
-            for keyframe in fcurve.keyframe_points:
-                if keyframe.interpolation != target_interpolation:
-                    keyframe.interpolation = target_interpolation
-                    converted += 1
-
+        target_names = {
+            'CURVE': "Curve (Bezier)",
+            'STEPPED': "Stepped (Constant)",
+            'STEPPED_CURVED_BREAKDOWNS': "Stepped with curved breakdowns",
+            'STEPPED_KEEP_BREAKDOWNS': "Stepped, breakdowns kept",
+        }
         self.report(
-            {'INFO'}, f"Converted {converted} keyframes to {target_name}")
+            {'INFO'}, f"Converted {converted} keyframes to {target_names[mode]}")
 
-        # Force viewport update
+        # foreach_set bypasses RNA updates: re-evaluate the rigs and redraw
+        # only the animation editors
+        for armature in armatures:
+            armature.animation_data.action.update_tag()
+            armature.update_tag()
         for area in context.screen.areas:
-            area.tag_redraw()
+            if area.type in {'GRAPH_EDITOR', 'DOPESHEET_EDITOR', 'NLA_EDITOR'}:
+                area.tag_redraw()
 
         return {'FINISHED'}
 
@@ -478,18 +501,23 @@ class local_copy_linked_collection(bpy.types.Operator):
     bl_idname = "leo_tools.local_copy_linked_collection"
     bl_label = "Local copy linked collection"
     bl_description = "Create a full local copy of linked collections from selection"
+    bl_options = {'REGISTER', 'UNDO'}
 
-    def _next_local_name(self, base_name, existing_names):
-        candidate = f"{base_name}_LOCAL"
-        if candidate not in existing_names:
-            return candidate
-
-        index = 2
-        while True:
-            candidate = f"{base_name}_LOCAL_{index:02d}"
-            if candidate not in existing_names:
-                return candidate
-            index += 1
+    mode: bpy.props.EnumProperty(
+        name="Mode",
+        items=[
+            ('FULL', "Full Copy", "Copy the collections, objects and all the data they use"),
+            ('LAZY', "Lazy", "Only create local collections and object shells that keep using the linked data; "
+                             "localize objects later, when they need editing"),
+            ('OVERRIDE', "Library Override", "Override the linked hierarchy instead of copying it; "
+                                             "only the listed properties stay overridden"),
+        ],
+        default='FULL')
+
+    editable_properties: bpy.props.StringProperty(
+        name="Editable Properties",
+        description="Comma-separated RNA path globs objects may override (Library Override mode)",
+        default=localization_engine.DEFAULT_OVERRIDE_PROPERTIES)
 
     def _parent_map(self):
         parent_map = {}
@@ -498,6 +526,13 @@ class local_copy_linked_collection(bpy.types.Operator):
                 parent_map.setdefault(child, []).append(parent)
         return parent_map
 
+    def _scene_map(self):
+        scene_map = {}
+        for scene in bpy.data.scenes:
+            for child in scene.collection.children:
+                scene_map.setdefault(child, []).append(scene)
+        return scene_map
+
     def _linked_source_collection(self, collection):
         if collection is None:
             return None
@@ -536,9 +571,19 @@ class local_copy_linked_collection(bpy.types.Operator):
 
         return None
 
-    def _collect_target_collections(self, context):
+    def _linked_object_collections(self):
+        """First linked collection containing each linked object, by pointer."""
+        object_collections = {}
+        for coll in bpy.data.collections:
+            if not coll.library:
+                continue
+            for obj in coll.all_objects:
+                object_collections.setdefault(obj.as_pointer(), coll)
+        return object_collections
+
+    def _collect_target_collections(self, context, parent_map):
         targets = []
-        parent_map = self._parent_map()
+        object_collections = None
 
         def add_target(candidate):
             linked = self._linked_source_collection(candidate)
@@ -557,12 +602,11 @@ class local_copy_linked_collection(bpy.types.Operator):
 
             if obj.library:
                 # Fallback: find a linked collection containing this linked object.
-                for coll in bpy.data.collections:
-                    if not coll.library:
-                        continue
-                    if obj.name in coll.all_objects:
-                        targets.append(coll)
-                        break
+                if object_collections is None:
+                    object_collections = self._linked_object_collections()
+                coll = object_collections.get(obj.as_pointer())
+                if coll is not None:
+                    targets.append(coll)
 
         active_layer_collection = context.view_layer.active_layer_collection
         if active_layer_collection:
@@ -579,89 +623,56 @@ class local_copy_linked_collection(bpy.types.Operator):
             deduped.append(coll)
         return deduped
 
-    def _copy_object_deep(self, src_obj, object_map):
-        new_obj = src_obj.copy()
-        new_obj.name = self._next_local_name(
-            src_obj.name, bpy.data.objects.keys())
-
-        if src_obj.data:
-            try:
-                new_obj.data = src_obj.data.copy()
-                if new_obj.data:
-                    new_obj.data.name = self._next_local_name(src_obj.data.name, getattr(
-                        bpy.data, src_obj.data.__class__.__name__.lower() + 's', bpy.data.meshes).keys())
-            except RuntimeError:
-                pass
-
-        if new_obj.animation_data and new_obj.animation_data.action:
-            try:
-                new_obj.animation_data.action = new_obj.animation_data.action.copy()
-                if new_obj.animation_data.action:
-                    new_obj.animation_data.action.name = self._next_local_name(
-                        new_obj.animation_data.action.name, bpy.data.actions.keys())
-            except RuntimeError:
-                pass
-
-        if new_obj.data and hasattr(new_obj.data, 'materials'):
-            for slot_index, material in enumerate(list(new_obj.data.materials)):
-                if material is None:
-                    continue
-                try:
-                    copied_mat = material.copy()
-                    copied_mat.name = self._next_local_name(
-                        material.name, bpy.data.materials.keys())
-                    new_obj.data.materials[slot_index] = copied_mat
-                except RuntimeError:
-                    pass
-
+    def _copy_object_deep(self, src_obj, object_map, memo):
+        new_obj, created = memo.copy(src_obj)
         object_map[src_obj] = new_obj
+        if not created:
+            # Already copied through another collection
+            return new_obj
+
+        if self.mode == 'LAZY':
+            # Shell: keeps the linked data until localize_object is run on it
+            new_obj[localization_engine.LAZY_SHELL_PROP] = True
+        else:
+            localization_engine.localize_object_data(new_obj, memo)
         return new_obj
 
-    def _copy_collection_recursive(self, src_collection, object_map):
-        new_collection_name = self._next_local_name(
-            src_collection.name, bpy.data.collections.keys())
+    def _copy_collection_recursive(self, src_collection, object_map, memo):
+        new_collection = memo.get(src_collection)
+        if new_collection is not None:
+            return new_collection
+
+        new_collection_name = memo.names.next_name(src_collection.name, 'COLLECTION')
         new_collection = bpy.data.collections.new(new_collection_name)
+        memo.add(src_collection, new_collection)
 
         for src_obj in src_collection.objects:
-            new_obj = self._copy_object_deep(src_obj, object_map)
+            new_obj = self._copy_object_deep(src_obj, object_map, memo)
             new_collection.objects.link(new_obj)
 
         for child in src_collection.children:
-            new_child = self._copy_collection_recursive(child, object_map)
+            new_child = self._copy_collection_recursive(child, object_map, memo)
             new_collection.children.link(new_child)
 
         return new_collection
 
-    def _parent_collections_of(self, target_collection):
-        parents = []
-        for parent in bpy.data.collections:
-            if any(child == target_collection for child in parent.children):
-                parents.append(parent)
-        return parents
-
-    def _link_collection_like_source(self, context, src_collection, new_collection):
+    def _link_collection_like_source(self, context, src_collection, new_collection, parent_map, scene_map):
         linked = 0
 
-        for parent in self._parent_collections_of(src_collection):
-            if any(child == new_collection for child in parent.children):
-                continue
+        # Linking where the copy is already a child raises and is skipped
+        for parent in parent_map.get(src_collection, []):
             try:
                 parent.children.link(new_collection)
                 linked += 1
             except RuntimeError:
                 pass
 
-        for scene in bpy.data.scenes:
-            has_src = any(
-                child == src_collection for child in scene.collection.children)
-            has_new = any(
-                child == new_collection for child in scene.collection.children)
-            if has_src and not has_new:
-                try:
-                    scene.collection.children.link(new_collection)
-                    linked += 1
-                except RuntimeError:
-                    pass
+        for scene in scene_map.get(src_collection, []):
+            try:
+                scene.collection.children.link(new_collection)
+                linked += 1
+            except RuntimeError:
+                pass
 
         if linked == 0:
             try:
@@ -686,22 +697,65 @@ class local_copy_linked_collection(bpy.types.Operator):
                     if target_obj in object_map:
                         modifier.object = object_map[target_obj]
 
+    def _override_collections(self, context, linked_collections):
+        patterns = localization_engine.parse_patterns(self.editable_properties)
+        override_count = 0
+        editable_count = 0
+        overridden = set()
+        for src_collection in linked_collections:
+            try:
+                root, editable = localization_engine.create_override_hierarchy(
+                    src_collection, context.scene, context.view_layer, patterns)
+            except RuntimeError as error:
+                self.report({'WARNING'}, f"Could not override '{src_collection.name}': {error}")
+                continue
+            if root is None:
+                continue
+            overridden.add(src_collection.as_pointer())
+            override_count += 1
+            editable_count += editable
+
+        # The override hierarchy is instanced in the scene; the empties
+        # instancing the linked collection would show it twice
+        disabled_instances = 0
+        for obj in context.selected_objects:
+            if (obj.instance_type == 'COLLECTION' and obj.instance_collection
+                    and obj.instance_collection.as_pointer() in overridden):
+                obj.instance_type = 'NONE'
+                disabled_instances += 1
+
+        self.report(
+            {'INFO'},
+            f"Overrode {override_count} collection hierarchy(ies), {editable_count} editable object(s), "
+            f"disabled {disabled_instances} instance(s)"
+        )
+        return {'FINISHED'} if override_count else {'CANCELLED'}
+
     def execute(self, context):
-        linked_collections = self._collect_target_collections(context)
+        # Parent lookups and name allocation are indexed once per run
+        parent_map = self._parent_map()
+        scene_map = self._scene_map()
+        # Lazy shells are localized later, by runs that seed from the stamps
+        memo = localization_engine.LocalCopyMemo(stamp=self.mode == 'LAZY')
+
+        linked_collections = self._collect_target_collections(context, parent_map)
         if not linked_collections:
             self.report(
                 {'ERROR'}, "No linked collection found. Select a linked collection instance or an object from a linked hierarchy")
             return {'CANCELLED'}
 
+        if self.mode == 'OVERRIDE':
+            return self._override_collections(context, linked_collections)
+
         copied_count = 0
         object_map = {}
         collection_map = {}
 
         for src_collection in linked_collections:
             new_collection = self._copy_collection_recursive(
-                src_collection, object_map)
+                src_collection, object_map, memo)
             self._link_collection_like_source(
-                context, src_collection, new_collection)
+                context, src_collection, new_collection, parent_map, scene_map)
             collection_map[src_collection] = new_collection
             copied_count += 1
 
@@ -714,9 +768,92 @@ class local_copy_linked_collection(bpy.types.Operator):
                 obj.instance_collection = collection_map[obj.instance_collection]
                 repointed_instances += 1
 
+        if self.mode == 'LAZY':
+            self.report(
+                {'INFO'},
+                f"Created {copied_count} local collection copy(ies), {len(object_map)} lazy object shell(s) "
+                f"using linked data, repointed {repointed_instances} instance(s)"
+            )
+            return {'FINISHED'}
+
+        self.report(
+            {'INFO'},
+            f"Created {copied_count} local collection copy(ies), {len(object_map)} object copy(ies), "
+            f"{memo.copy_count} datablock copy(ies) in total, {memo.reused} copy(ies) avoided by sharing, "
+            f"repointed {repointed_instances} instance(s)"
+        )
+        return {'FINISHED'}
+
+
+class localize_object(bpy.types.Operator):
+    bl_idname = "leo_tools.localize_object"
+    bl_label = "Localize object"
+    bl_description = "Copy the linked data, materials and actions of selected lazy local shells"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        shells = localization_engine.lazy_shells(context.selected_objects)
+        if not shells:
+            self.report({'WARNING'}, "No lazy local shell selected")
+            return {'CANCELLED'}
+
+        # Shells localized earlier keep sharing data with these ones
+        memo = localization_engine.LocalCopyMemo(stamp=True)
+        memo.seed()
+        for obj in shells:
+            localization_engine.localize_object_data(obj, memo)
+
         self.report(
             {'INFO'},
-            f"Created {copied_count} local collection copy(ies), {len(object_map)} object copy(ies), repointed {repointed_instances} instance(s)"
+            f"Localized {len(shells)} object(s): {memo.copy_count} datablock copy(ies), "
+            f"{memo.reused} reused"
+        )
+        return {'FINISHED'}
+
+
+class resync_library_overrides(bpy.types.Operator):
+    bl_idname = "leo_tools.resync_library_overrides"
+    bl_label = "Resync library overrides"
+    bl_description = "Reload the libraries used by overrides and resync every override hierarchy once"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    reload_libraries: bpy.props.BoolProperty(
+        name="Reload Libraries",
+        description="Reload each library before resyncing",
+        default=True)
+
+    restrict_properties: bpy.props.BoolProperty(
+        name="Restrict Properties",
+        description="Drop property overrides outside the editable list before resyncing "
+                    "(ID pointer overrides such as parents and targets are always kept)",
+        default=True)
+
+    editable_properties: bpy.props.StringProperty(
+        name="Editable Properties",
+        description="Comma-separated RNA path globs objects may override",
+        default=localization_engine.DEFAULT_OVERRIDE_PROPERTIES)
+
+    def execute(self, context):
+        ids = localization_engine.override_ids()
+        if not ids:
+            self.report({'WARNING'}, "No library override in this file")
+            return {'CANCELLED'}
+
+        removed = 0
+        if self.restrict_properties:
+            patterns = localization_engine.parse_patterns(self.editable_properties)
+            for id_data in ids:
+                if isinstance(id_data, bpy.types.Object):
+                    removed += localization_engine.restrict_override_properties(id_data, patterns)
+
+        roots = localization_engine.override_roots(ids)
+        library_count, resynced, root_count = localization_engine.resync_overrides(
+            roots, context.scene, context.view_layer, self.reload_libraries)
+
+        self.report(
+            {'INFO'},
+            f"Resynced {resynced}/{root_count} override hierarchy(ies) from {library_count} library(ies), "
+            f"dropped {removed} property override(s)"
         )
         return {'FINISHED'}
 
@@ -787,21 +924,6 @@ class remove_all_modifiers(bpy.types.Operator):
         return {'FINISHED'}
 
 
-def _copy_modifier_properties(mod, new_mod):
-    for prop in mod.bl_rna.properties:
-        identifier = prop.identifier
-        if prop.is_readonly or identifier in ('rna_type', 'name', 'type'):
-            continue
-        try:
-            value = getattr(mod, identifier)
-        except AttributeError:
-            continue
-        try:
-            setattr(new_mod, identifier, value)
-        except (AttributeError, TypeError):
-            pass
-
-
 class copy_modifiers_with_drivers(bpy.types.Operator):
     bl_idname = "leo_tools.copy_modifiers_with_drivers"
     bl_label = "Copy Modifiers With Drivers"
@@ -820,48 +942,84 @@ class copy_modifiers_with_drivers(bpy.types.Operator):
                 {'ERROR'}, "Select at least two objects (active object is the source)")
             return {'CANCELLED'}
 
-        copied_modifiers = 0
-        copied_drivers = 0
-
+        # Snapshot the source stack once, then diff it onto every target
+        plan = modifier_engine.ModifierCopyPlan(source)
+        stats = modifier_engine.ModifierCopyStats()
         for target in targets:
             if not hasattr(target, 'modifiers'):
                 continue
+            plan.apply(target, stats)
 
-            for mod in source.modifiers:
-                existing = target.modifiers.get(mod.name)
-                if existing:
-                    target.modifiers.remove(existing)
-                new_mod = target.modifiers.new(name=mod.name, type=mod.type)
-                _copy_modifier_properties(mod, new_mod)
-                copied_modifiers += 1
+        self.report(
+            {'INFO'}, f"Copied {stats.created} new and {stats.updated} changed modifier(s) "
+            f"({stats.unchanged} unchanged) and {stats.drivers} driver(s) "
+            f"({stats.unchanged_drivers} unchanged) to {len(targets)} object(s)")
+        return {'FINISHED'}
 
-                if not (source.animation_data and source.animation_data.drivers):
-                    continue
 
-                prefix = f'modifiers["{mod.name}"]'
-                for fcurve in source.animation_data.drivers:
-                    if not fcurve.data_path.startswith(prefix):
-                        continue
-                    try:
-                        target.driver_remove(
-                            fcurve.data_path, fcurve.array_index)
-                    except (TypeError, ValueError):
-                        try:
-                            target.driver_remove(fcurve.data_path)
-                        except (TypeError, ValueError):
-                            pass
-                    try:
-                        new_fcurve = target.driver_add(
-                            fcurve.data_path, fcurve.array_index)
-                    except TypeError:
-                        new_fcurve = target.driver_add(fcurve.data_path)
-                    rigging_tools.copy_fcurve_properties(
-                        fcurve, new_fcurve, mirror_targets=False)
-                    copied_drivers += 1
+class profile_modifier_stacks(bpy.types.Operator):
+    bl_idname = "leo_tools.profile_modifier_stacks"
+    bl_label = "Profile modifier stacks"
+    bl_description = "Time the viewport evaluation of every modifier and print the heaviest ones with their vertex counts"
+
+    selected_only: bpy.props.BoolProperty(
+        name="Selected Only",
+        description="Profile the selected objects instead of the whole scene",
+        default=False)
+
+    samples: bpy.props.IntProperty(
+        name="Samples",
+        description="Evaluations per measurement; the fastest one is kept",
+        default=3, min=1, max=20)
+
+    top: bpy.props.IntProperty(
+        name="Top",
+        description="Number of modifiers to print",
+        default=20, min=1)
 
+    def execute(self, context):
+        if context.mode != 'OBJECT':
+            self.report({'ERROR'}, "Switch to Object mode to profile modifiers")
+            return {'CANCELLED'}
+
+        objects = context.selected_objects if self.selected_only else context.scene.objects
+        costs = modifier_engine.profile_modifiers(context, objects, self.samples)
+        if not costs:
+            self.report({'WARNING'}, "No enabled modifier on visible mesh objects")
+            return {'CANCELLED'}
+
+        total = sum(cost.seconds for cost in costs)
+        print(f"Modifier profile: {len(costs)} modifier(s), {total * 1000.0:.2f} ms total")
+        for cost in costs[:self.top]:
+            print(f"  {cost.report_line()}")
+
+        heaviest = costs[0]
         self.report(
-            {'INFO'}, f"Copied {copied_modifiers} modifier(s) and {copied_drivers} driver(s) "
-            f"to {len(targets)} object(s)")
+            {'INFO'},
+            f"{len(costs)} modifier(s), {total * 1000.0:.1f} ms; heaviest {heaviest.object_name} / "
+            f"{heaviest.modifier_name} ({heaviest.seconds * 1000.0:.1f} ms) (details in the console)"
+        )
+        return {'FINISHED'}
+
+
+class disable_heavy_modifiers(bpy.types.Operator):
+    bl_idname = "leo_tools.disable_heavy_modifiers"
+    bl_label = "Disable heavy modifiers"
+    bl_description = "Hide the heaviest modifiers of the last profile in the viewport (render is unchanged)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    count: bpy.props.IntProperty(
+        name="Count",
+        description="Number of heaviest modifiers to hide in the viewport",
+        default=5, min=1)
+
+    def execute(self, context):
+        if not modifier_engine.last_profile():
+            self.report({'WARNING'}, "Profile the modifier stacks first")
+            return {'CANCELLED'}
+
+        disabled = modifier_engine.disable_heavy_modifiers(self.count)
+        self.report({'INFO'}, f"Hid {disabled} modifier(s) in the viewport")
         return {'FINISHED'}
 
 
@@ -902,6 +1060,17 @@ class select_animated_objects(bpy.types.Operator):
     bl_idname = "leo_tools.select_animated_objects"
     bl_label = "Select animated objects"
     bl_description = "Select all objects in the active scene that have an animation Action"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    include_data: bpy.props.BoolProperty(
+        name="Data Animation",
+        description="Also select objects whose data, shape keys or materials are animated (actions or NLA)",
+        default=True)
+
+    include_drivers: bpy.props.BoolProperty(
+        name="Drivers",
+        description="Also select objects that are only driven",
+        default=False)
 
     def execute(self, context):
         if context.mode != 'OBJECT':
@@ -914,11 +1083,10 @@ class select_animated_objects(bpy.types.Operator):
 
         bpy.ops.object.select_all(action='DESELECT')
 
-        animated_objects = []
-        for obj in context.scene.objects:
-            if obj.animation_data and obj.animation_data.action:
-                obj.select_set(True)
-                animated_objects.append(obj)
+        animated_objects = animation_inventory.get_inventory().animated_objects(
+            context.scene.objects, self.include_data, self.include_drivers)
+        for obj in animated_objects:
+            obj.select_set(True)
 
         if not animated_objects:
             self.report({'WARNING'}, "No animated object found in the scene")
@@ -934,33 +1102,49 @@ class delete_animation_actions(bpy.types.Operator):
     bl_idname = "leo_tools.delete_animation_actions"
     bl_label = "Delete animation actions"
     bl_description = "Delete animation Action datablocks from selected objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    include_data: bpy.props.BoolProperty(
+        name="Data Animation",
+        description="Also delete the actions of the objects' data, shape keys and materials",
+        default=False)
 
     def execute(self, context):
+        inventory = animation_inventory.get_inventory()
         deleted_count = 0
         unlinked_shared_count = 0
         touched_objects = 0
+        handled = set()
 
         for obj in context.selected_objects:
-            if not obj.animation_data or not obj.animation_data.action:
+            entries = [entry for entry in inventory.object_entries(obj, self.include_data)
+                       if entry.action is not None]
+            if not entries:
                 continue
-
-            action = obj.animation_data.action
             touched_objects += 1
 
-            # Keep shared actions used by other datablocks; only unlink from this object.
-            if action.users > 1:
-                obj.animation_data.action = None
-                unlinked_shared_count += 1
-            else:
-                obj.animation_data.action = None
-                bpy.data.actions.remove(action)
-                deleted_count += 1
+            for entry in entries:
+                # Data and materials can be shared by several selected objects
+                if entry.id_data.as_pointer() in handled:
+                    continue
+                handled.add(entry.id_data.as_pointer())
+
+                action = entry.action
+                # Keep shared actions used by other datablocks; only unlink from this one.
+                if action.users > 1:
+                    entry.id_data.animation_data.action = None
+                    unlinked_shared_count += 1
+                else:
+                    entry.id_data.animation_data.action = None
+                    bpy.data.actions.remove(action)
+                    deleted_count += 1
 
         if touched_objects == 0:
             self.report(
                 {'WARNING'}, "No selected object has an animation Action")
             return {'CANCELLED'}
 
+        animation_inventory.invalidate()
         self.report(
             {'INFO'},
             f"Deleted {deleted_count} action(s), unlinked {unlinked_shared_count} shared action(s)"
@@ -968,6 +1152,53 @@ class delete_animation_actions(bpy.types.Operator):
         return {'FINISHED'}
 
 
+class purge_unused_actions(bpy.types.Operator):
+    bl_idname = "leo_tools.purge_unused_actions"
+    bl_label = "Purge unused actions"
+    bl_description = "Delete the actions with no users"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    include_fake_users: bpy.props.BoolProperty(
+        name="Include Fake Users",
+        description="Also delete unused actions protected by a fake user",
+        default=False)
+
+    def execute(self, context):
+        unused = animation_inventory.unused_actions(self.include_fake_users)
+        if not unused:
+            self.report({'INFO'}, "No unused action found")
+            return {'CANCELLED'}
+
+        count = len(unused)
+        bpy.data.batch_remove(unused)
+        animation_inventory.invalidate()
+        self.report({'INFO'}, f"Deleted {count} unused action(s)")
+        return {'FINISHED'}
+
+
+class report_animation_inventory(bpy.types.Operator):
+    bl_idname = "leo_tools.report_animation_inventory"
+    bl_label = "Animation report"
+    bl_description = "Print every animated datablock with its action, slot, key, NLA and driver counts"
+
+    def execute(self, context):
+        inventory = animation_inventory.get_inventory()
+        lines = inventory.report_lines()
+        print(f"Animation inventory: {len(lines)} animated datablock(s)")
+        for line in lines:
+            print(f"  {line}")
+
+        keys = sum(entry.key_count for entry in inventory.entries)
+        drivers = sum(entry.driver_count for entry in inventory.entries)
+        unused = len(animation_inventory.unused_actions())
+        self.report(
+            {'INFO'},
+            f"{len(lines)} animated datablock(s), {keys} keys, {drivers} drivers, "
+            f"{unused} unused action(s) (details in the console)"
+        )
+        return {'FINISHED'}
+
+
 MIRROR_EMPTY_NAME = "_mirror_center"
 
 
@@ -1051,20 +1282,17 @@ class add_mirror_modifier(bpy.types.Operator):
         return {'FINISHED'}
 
 
-class apply_mirror_modifiers(bpy.types.Operator):
-    bl_idname = "leo_tools.apply_mirror_modifiers"
-    bl_label = "Apply mirror modifiers on selected objects"
-    bl_description = "Apply all Mirror modifiers on selected objects"
+class ModifierApplyMixin:
+    """Apply modifiers on the selected objects through modifier_engine,
+    from Object mode, restoring the previous mode afterwards."""
 
-    def execute(self, context):
+    def apply_selected(self, context, predicate, label):
         selected_objects = list(context.selected_objects)
         if not selected_objects:
             self.report({'ERROR'}, "No object selected")
             return {'CANCELLED'}
 
-        original_active = context.view_layer.objects.active
         original_mode = context.mode
-
         if context.mode != 'OBJECT':
             try:
                 bpy.ops.object.mode_set(mode='OBJECT')
@@ -1073,38 +1301,9 @@ class apply_mirror_modifiers(bpy.types.Operator):
                     {'ERROR'}, "Switch to Object mode to apply modifiers")
                 return {'CANCELLED'}
 
-        applied_count = 0
-        touched_objects = 0
-        failed_count = 0
-
-        for obj in selected_objects:
-            if not hasattr(obj, "modifiers"):
-                continue
-
-            mirror_modifiers = [
-                mod.name for mod in obj.modifiers if mod.type == 'MIRROR']
-            if not mirror_modifiers:
-                continue
-
-            touched_objects += 1
-            bpy.ops.object.select_all(action='DESELECT')
-            obj.select_set(True)
-            context.view_layer.objects.active = obj
-
-            for modifier_name in mirror_modifiers:
-                try:
-                    bpy.ops.object.modifier_apply(modifier=modifier_name)
-                    applied_count += 1
-                except RuntimeError:
-                    failed_count += 1
-
-        bpy.ops.object.select_all(action='DESELECT')
-        for obj in selected_objects:
-            if obj.name in bpy.data.objects:
-                obj.select_set(True)
-
-        if original_active and original_active.name in bpy.data.objects:
-            context.view_layer.objects.active = original_active
+        stats = modifier_engine.apply_modifiers(
+            context, selected_objects, predicate)
+        noun = f"{label} modifier(s)" if label else "modifier(s)"
 
         if original_mode != 'OBJECT' and context.view_layer.objects.active:
             try:
@@ -1112,21 +1311,50 @@ class apply_mirror_modifiers(bpy.types.Operator):
             except RuntimeError:
                 pass
 
-        if applied_count == 0 and touched_objects == 0:
+        if stats.applied == 0 and stats.failed == 0 and stats.shared == 0:
             self.report(
-                {'WARNING'}, "No Mirror modifier found on selected objects")
+                {'WARNING'}, f"No {noun[:-3]} found on selected objects")
             return {'CANCELLED'}
 
-        if failed_count > 0:
+        if stats.failed or stats.shared:
             self.report(
-                {'WARNING'}, f"Applied {applied_count} Mirror modifier(s), {failed_count} failed")
+                {'WARNING'}, f"Applied {stats.applied} {noun}, {stats.failed} failed, "
+                f"{stats.shared} skipped on meshes shared with other modifier setups")
             return {'FINISHED'}
 
         self.report(
-            {'INFO'}, f"Applied {applied_count} Mirror modifier(s) on {touched_objects} object(s)")
+            {'INFO'}, f"Applied {stats.applied} {noun} on {stats.objects} object(s) "
+            f"({stats.meshes} mesh(es))")
         return {'FINISHED'}
 
 
+class apply_mirror_modifiers(ModifierApplyMixin, bpy.types.Operator):
+    bl_idname = "leo_tools.apply_mirror_modifiers"
+    bl_label = "Apply mirror modifiers on selected objects"
+    bl_description = "Apply all Mirror modifiers on selected objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        return self.apply_selected(context, lambda mod: mod.type == 'MIRROR', "Mirror")
+
+
+class apply_modifiers(ModifierApplyMixin, bpy.types.Operator):
+    bl_idname = "leo_tools.apply_modifiers"
+    bl_label = "Apply modifiers on selected objects"
+    bl_description = "Apply the modifiers of one type (or all of them) on selected objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    modifier_type: bpy.props.EnumProperty(
+        name="Type",
+        items=modifier_engine.modifier_type_items)
+
+    def execute(self, context):
+        modifier_type = self.modifier_type
+        if modifier_type == 'ALL':
+            return self.apply_selected(context, lambda mod: True, "")
+        return self.apply_selected(context, lambda mod: mod.type == modifier_type, modifier_type.title())
+
+
 class remove_all_vertex_groups(bpy.types.Operator):
     bl_idname = "leo_tools.remove_all_vertex_groups"
     bl_label = "Remove all vertex groups from selected objects"
@@ -1244,160 +1472,6 @@ class bake_gp_objects(bpy.types.Operator):
         layout.prop(self, "bake_suffix")
         layout.prop(self, "bake_modifiers")
 
-    def bake_gp_transforms(self, context, gp_obj, frame_start, frame_end):
-        """Bake all constraints and parenting transforms to keyframes for a GP object"""
-        scene = context.scene
-
-        # Check if object has constraints or parent
-        has_constraints = len(gp_obj.constraints) > 0
-        has_parent = gp_obj.parent is not None
-
-        if not has_constraints and not has_parent:
-            return False  # Nothing to bake
-
-        # Store world matrices for each frame
-        world_matrices = {}
-        for frame in range(frame_start, frame_end + 1):
-            scene.frame_set(frame)
-            world_matrices[frame] = gp_obj.matrix_world.copy()
-
-        # Remove constraints
-        for constraint in gp_obj.constraints[:]:
-            gp_obj.constraints.remove(constraint)
-
-        # Clear parent while keeping transform
-        if gp_obj.parent:
-            # Store current world matrix
-            mat_world = gp_obj.matrix_world.copy()
-            gp_obj.parent = None
-            gp_obj.matrix_world = mat_world
-
-        # Bake keyframes
-        for frame, mat in world_matrices.items():
-            scene.frame_set(frame)
-            gp_obj.matrix_world = mat
-            gp_obj.keyframe_insert(data_path="location", frame=frame)
-            gp_obj.keyframe_insert(data_path="rotation_euler", frame=frame)
-            gp_obj.keyframe_insert(data_path="scale", frame=frame)
-
-        return True
-
-    def get_gp_modifiers(self, gp_obj):
-        """Get GP modifiers - different attribute name for legacy GP vs GP v3"""
-        # Legacy GP (Blender 3.x) uses grease_pencil_modifiers
-        if hasattr(gp_obj, 'grease_pencil_modifiers') and gp_obj.grease_pencil_modifiers:
-            return gp_obj.grease_pencil_modifiers
-        # GP v3 (Blender 4.0+) uses regular modifiers
-        if hasattr(gp_obj, 'modifiers') and gp_obj.modifiers:
-            return gp_obj.modifiers
-        return None
-
-    def bake_gp_modifiers(self, context, gp_obj, frame_start, frame_end):
-        """Bake GP modifiers (like Shrinkwrap) into the stroke point data"""
-        # Get the appropriate modifier collection
-        gp_modifiers = self.get_gp_modifiers(gp_obj)
-
-        if not gp_modifiers or len(gp_modifiers) == 0:
-            return False
-
-        scene = context.scene
-        depsgraph = context.evaluated_depsgraph_get()
-        gp_data = gp_obj.data
-
-        # Determine if this is legacy GP or GP v3
-        is_legacy_gp = gp_obj.type == 'GPENCIL'
-
-        # For each frame, get the evaluated (modifier-applied) stroke positions
-        for frame in range(frame_start, frame_end + 1):
-            scene.frame_set(frame)
-            depsgraph.update()
-
-            # Get evaluated object with modifiers applied
-            eval_obj = gp_obj.evaluated_get(depsgraph)
-            eval_data = eval_obj.data
-
-            if is_legacy_gp:
-                # Legacy GP (Blender 3.x): layers -> frames -> strokes -> points
-                for layer_idx, layer in enumerate(gp_data.layers):
-                    if layer_idx >= len(eval_data.layers):
-                        continue
-                    eval_layer = eval_data.layers[layer_idx]
-
-                    # Find the frame for this frame number
-                    src_frame = None
-                    eval_frame = None
-                    for f in layer.frames:
-                        if f.frame_number == frame:
-                            src_frame = f
-                            break
-                    for f in eval_layer.frames:
-                        if f.frame_number == frame:
-                            eval_frame = f
-                            break
-
-                    if src_frame is None or eval_frame is None:
-                        continue
-
-                    # Copy deformed point positions from evaluated to original
-                    for stroke_idx, stroke in enumerate(src_frame.strokes):
-                        if stroke_idx >= len(eval_frame.strokes):
-                            continue
-                        eval_stroke = eval_frame.strokes[stroke_idx]
-
-                        for point_idx, point in enumerate(stroke.points):
-                            if point_idx >= len(eval_stroke.points):
-                                continue
-                            # Copy the deformed position
-                            point.co = eval_stroke.points[point_idx].co.copy()
-            else:
-                # GP v3 (Blender 4.0+): structure is different
-                # layers -> frames -> drawing
-                for layer_idx, layer in enumerate(gp_data.layers):
-                    if layer_idx >= len(eval_data.layers):
-                        continue
-                    eval_layer = eval_data.layers[layer_idx]
-
-                    # Find matching frames
-                    for frame_idx, gp_frame in enumerate(layer.frames):
-                        if gp_frame.frame_number != frame:
-                            continue
-
-                        # Find corresponding eval frame
-                        eval_gp_frame = None
-                        for ef in eval_layer.frames:
-                            if ef.frame_number == frame:
-                                eval_gp_frame = ef
-                                break
-
-                        if eval_gp_frame is None:
-                            continue
-
-                        # Access drawing data (GP v3 structure)
-                        if hasattr(gp_frame, 'drawing') and hasattr(eval_gp_frame, 'drawing'):
-                            src_drawing = gp_frame.drawing
-                            eval_drawing = eval_gp_frame.drawing
-
-                            if hasattr(src_drawing, 'strokes') and hasattr(eval_drawing, 'strokes'):
-                                for stroke_idx, stroke in enumerate(src_drawing.strokes):
-                                    if stroke_idx >= len(eval_drawing.strokes):
-                                        continue
-                                    eval_stroke = eval_drawing.strokes[stroke_idx]
-
-                                    # Copy points - GP v3 uses 'points' attribute
-                                    if hasattr(stroke, 'points') and hasattr(eval_stroke, 'points'):
-                                        for point_idx in range(min(len(stroke.points), len(eval_stroke.points))):
-                                            stroke.points[point_idx].position = eval_stroke.points[point_idx].position.copy(
-                                            )
-
-        # Remove all GP modifiers after baking
-        modifier_names = [mod.name for mod in gp_modifiers]
-        for mod_name in modifier_names:
-            mod = gp_modifiers.get(mod_name)
-            if mod:
-                gp_modifiers.remove(mod)
-
-        return True
-
     def get_layer_name_attr(self, layer):
         """Get layer name attribute - 'info' for legacy GP, 'name' for GP v3"""
         if hasattr(layer, 'info'):
@@ -1470,18 +1544,13 @@ class bake_gp_objects(bpy.types.Operator):
                     self.set_layer_name(
                         layer, f"{original_name}_{current_name}")
 
-        # Step 3: Bake GP modifiers (Shrinkwrap, etc.) if enabled
-        modifiers_baked = 0
-        if self.bake_modifiers:
-            for gp_obj in duplicated_gp:
-                if self.bake_gp_modifiers(context, gp_obj, frame_start, frame_end):
-                    modifiers_baked += 1
-
-        # Step 4: Bake constraints/parenting for all duplicated GP objects
-        transforms_baked = 0
-        for gp_obj in duplicated_gp:
-            if self.bake_gp_transforms(context, gp_obj, frame_start, frame_end):
-                transforms_baked += 1
+        # Steps 3 & 4: Bake GP modifiers (Shrinkwrap, etc.) if enabled, and
+        # constraints/parenting, for all duplicated GP objects in one walk
+        # over the frame range
+        transform_objects, modifier_objects = gp_bake_engine.bake_objects(
+            context, duplicated_gp, frame_start, frame_end, self.bake_modifiers)
+        transforms_baked = len(transform_objects)
+        modifiers_baked = len(modifier_objects)
 
         # Restore frame
         context.scene.frame_set(current_frame)
@@ -1501,212 +1570,9 @@ class bake_gp_objects(bpy.types.Operator):
 
 
 def update_tween(self, context):
-    current_frame = context.scene.frame_current
-    # Get the percentage from the scene property
-    factor = context.scene.tween_machine_percentage / 100.0
-
-    # Get or create stored pose data
-    import json
-    stored_data = {}
-    if context.scene.tween_stored_pose:
-        try:
-            stored_data = json.loads(context.scene.tween_stored_pose)
-        except:
-            stored_data = {}
-
-    # Handle armature in pose mode - work with selected bones
-    if (context.object and context.object.type == 'ARMATURE' and
-            context.object.mode == 'POSE'):
-
-        armature = context.object
-        if not armature.animation_data or not armature.animation_data.action:
-            return
-
-        action = armature.animation_data.action
-        selected_bones = [
-            bone for bone in armature.pose.bones if bone.select]
-
-        # Gather and index all fcurves once instead of re-scanning them
-        # for every bone/property combination (this was the main cause of
-        # lag, especially with the Blender 5.0 channelbag-based lookup).
-        fcurves_by_path = {}
-        for fc in get_action_fcurves(action, armature):
-            fcurves_by_path.setdefault(fc.data_path, []).append(fc)
-
-        # Store initial pose if not already stored
-        if not stored_data:
-            stored_data = {"armature": armature.name, "bones": {}}
-            for bone in selected_bones:
-                bone_name = bone.name
-                stored_data["bones"][bone_name] = {
-                    "location": list(bone.location),
-                    "rotation_euler": list(bone.rotation_euler),
-                    "rotation_quaternion": list(bone.rotation_quaternion),
-                    "scale": list(bone.scale)
-                }
-            context.scene.tween_stored_pose = json.dumps(stored_data)
-
-        for bone in selected_bones:
-            bone_name = bone.name
-            # Process location, rotation, and scale channels for each bone
-            for data_path_base in ["location", "rotation_euler", "rotation_quaternion", "scale"]:
-                data_path = f'pose.bones["{bone_name}"].{data_path_base}'
-
-                # Find fcurves for this bone's property
-                bone_fcurves = fcurves_by_path.get(data_path)
-                if not bone_fcurves:
-                    continue
-
-                previous_frame, next_frame = find_keyframe_range(
-                    bone_fcurves, current_frame)
-
-                # If no keys found, skip
-                if previous_frame is None and next_frame is None:
-                    continue
-
-                # Interpolate values for each component (x, y, z or w for quaternion)
-                interpolated_values = []
-                for i, fcurve in enumerate(bone_fcurves):
-                    if previous_frame is not None and next_frame is not None:
-                        # Both keys exist - normal interpolation
-                        prev_value = fcurve.evaluate(previous_frame)
-                        next_value = fcurve.evaluate(next_frame)
-                        interpolated_value = (
-                            1 - factor) * prev_value + factor * next_value
-                    elif previous_frame is not None:
-                        # Only previous key exists - interpolate from previous to stored current
-                        prev_value = fcurve.evaluate(previous_frame)
-                        # Use stored value instead of evaluated current
-                        if bone_name in stored_data.get("bones", {}):
-                            stored_bone = stored_data["bones"][bone_name]
-                            if data_path_base in stored_bone:
-                                current_value = stored_bone[data_path_base][i]
-                            else:
-                                current_value = fcurve.evaluate(current_frame)
-                        else:
-                            current_value = fcurve.evaluate(current_frame)
-                        interpolated_value = (
-                            1 - factor) * prev_value + factor * current_value
-                    else:
-                        # Only next key exists - interpolate from stored current to next
-                        next_value = fcurve.evaluate(next_frame)
-                        # Use stored value instead of evaluated current
-                        if bone_name in stored_data.get("bones", {}):
-                            stored_bone = stored_data["bones"][bone_name]
-                            if data_path_base in stored_bone:
-                                current_value = stored_bone[data_path_base][i]
-                            else:
-                                current_value = fcurve.evaluate(current_frame)
-                        else:
-                            current_value = fcurve.evaluate(current_frame)
-                        interpolated_value = (
-                            1 - factor) * current_value + factor * next_value
-                    interpolated_values.append(interpolated_value)
-
-                # Apply interpolated values to bone
-                if data_path_base == "location" and len(interpolated_values) >= 3:
-                    bone.location = interpolated_values[:3]
-                elif data_path_base == "rotation_euler" and len(interpolated_values) >= 3:
-                    bone.rotation_euler = interpolated_values[:3]
-                elif data_path_base == "rotation_quaternion" and len(interpolated_values) >= 4:
-                    bone.rotation_quaternion = interpolated_values[:4]
-                elif data_path_base == "scale" and len(interpolated_values) >= 3:
-                    bone.scale = interpolated_values[:3]
-
-                # Auto keyframe if enabled
-                if context.scene.tool_settings.use_keyframe_insert_auto:
-                    bone.keyframe_insert(
-                        data_path=data_path_base, frame=current_frame)
-
-    # Handle regular objects - work with all selected objects
-    else:
-        selected_objects = context.selected_objects
-        if not selected_objects:
-            selected_objects = [context.object] if context.object else []
-
-        for obj in selected_objects:
-            if not obj or not obj.animation_data or not obj.animation_data.action:
-                continue
-
-            action = obj.animation_data.action
-
-            # Gather and index all fcurves once instead of re-scanning
-            # them for every property (see note in the pose-bone branch above).
-            fcurves_by_path = {}
-            for fc in get_action_fcurves(action, obj):
-                fcurves_by_path.setdefault(fc.data_path, []).append(fc)
-
-            # Process location, rotation, and scale for each object
-            for data_path in ["location", "rotation_euler", "rotation_quaternion", "scale"]:
-                obj_fcurves = fcurves_by_path.get(data_path)
-                if not obj_fcurves:
-                    continue
-
-                previous_frame, next_frame = find_keyframe_range(
-                    obj_fcurves, current_frame)
-
-                # If no keys found, skip
-                if previous_frame is None and next_frame is None:
-                    continue
-
-                # Interpolate values for each component
-                interpolated_values = []
-                for fcurve in obj_fcurves:
-                    if previous_frame is not None and next_frame is not None:
-                        # Both keys exist - normal interpolation
-                        prev_value = fcurve.evaluate(previous_frame)
-                        next_value = fcurve.evaluate(next_frame)
-                        interpolated_value = (
-                            1 - factor) * prev_value + factor * next_value
-                    elif previous_frame is not None:
-                        # Only previous key exists - interpolate from previous to current
-                        prev_value = fcurve.evaluate(previous_frame)
-                        current_value = fcurve.evaluate(current_frame)
-                        interpolated_value = (
-                            1 - factor) * prev_value + factor * current_value
-                    else:
-                        # Only next key exists - interpolate from current to next
-                        current_value = fcurve.evaluate(current_frame)
-                        next_value = fcurve.evaluate(next_frame)
-                        interpolated_value = (
-                            1 - factor) * current_value + factor * next_value
-                    interpolated_values.append(interpolated_value)
-
-                # Apply interpolated values to object
-                if data_path == "location" and len(interpolated_values) >= 3:
-                    obj.location = interpolated_values[:3]
-                elif data_path == "rotation_euler" and len(interpolated_values) >= 3:
-                    obj.rotation_euler = interpolated_values[:3]
-                elif data_path == "rotation_quaternion" and len(interpolated_values) >= 4:
-                    obj.rotation_quaternion = interpolated_values[:4]
-                elif data_path == "scale" and len(interpolated_values) >= 3:
-                    obj.scale = interpolated_values[:3]
-
-                # Auto keyframe if enabled
-                if context.scene.tool_settings.use_keyframe_insert_auto:
-                    obj.keyframe_insert(data_path=data_path,
-                                        frame=current_frame)
-
-
-def find_keyframe_range(fcurves, current_frame):
-    """Helper function to find previous and next keyframes"""
-    previous_frame = None
-    next_frame = None
-
-    for fcurve in fcurves:
-        keyframe_points = fcurve.keyframe_points
-        for key in keyframe_points:
-            if key.co[0] < current_frame:
-                if previous_frame is None or key.co[0] > previous_frame:
-                    previous_frame = key.co[0]
-            elif key.co[0] > current_frame:
-                if next_frame is None or key.co[0] < next_frame:
-                    next_frame = key.co[0]
-
-        if previous_frame is not None and next_frame is not None:
-            break
-
-    return previous_frame, next_frame
+    # Keys, F-Curves and the stored pose are resolved once per frame and
+    # selection by the tween session; a slider tick only blends and writes
+    tween_engine.update_tween(context)
 
 
 def clean_object_shapes_names():
@@ -1953,6 +1819,12 @@ def remove_shaders():
 
 
 def register():
+    # Register the F-Curve index, keyframe index, tween and inventory handlers
+    fcurve_index.register()
+    keyframe_index.register()
+    tween_engine.register()
+    animation_inventory.register()
+
     # Register texturing tools
     texturing_tools.register()
 
@@ -1986,6 +1858,10 @@ def register():
         bpy.utils.register_class(create_udim_paint_mask)
     if not hasattr(bpy.types, 'LEO_TOOLS_OT_local_copy_linked_collection'):
         bpy.utils.register_class(local_copy_linked_collection)
+    if not hasattr(bpy.types, 'LEO_TOOLS_OT_localize_object'):
+        bpy.utils.register_class(localize_object)
+    if not hasattr(bpy.types, 'LEO_TOOLS_OT_resync_library_overrides'):
+        bpy.utils.register_class(resync_library_overrides)
     if not hasattr(bpy.types, 'LEO_TOOLS_OT_remove_materials'):
         bpy.utils.register_class(remove_materials)
     if not hasattr(bpy.types, 'LEO_TOOLS_OT_init_settings'):
@@ -2010,6 +1886,10 @@ def register():
         bpy.utils.register_class(remove_all_modifiers)
     if not hasattr(bpy.types, 'LEO_TOOLS_OT_copy_modifiers_with_drivers'):
         bpy.utils.register_class(copy_modifiers_with_drivers)
+    if not hasattr(bpy.types, 'LEO_TOOLS_OT_profile_modifier_stacks'):
+        bpy.utils.register_class(profile_modifier_stacks)
+    if not hasattr(bpy.types, 'LEO_TOOLS_OT_disable_heavy_modifiers'):
+        bpy.utils.register_class(disable_heavy_modifiers)
     if not hasattr(bpy.types, 'LEO_TOOLS_OT_remove_collision_modifiers'):
         bpy.utils.register_class(remove_collision_modifiers)
     if not hasattr(bpy.types, 'LEO_TOOLS_OT_remove_subdivision_modifiers'):
@@ -2018,10 +1898,16 @@ def register():
         bpy.utils.register_class(select_animated_objects)
     if not hasattr(bpy.types, 'LEO_TOOLS_OT_delete_animation_actions'):
         bpy.utils.register_class(delete_animation_actions)
+    if not hasattr(bpy.types, 'LEO_TOOLS_OT_purge_unused_actions'):
+        bpy.utils.register_class(purge_unused_actions)
+    if not hasattr(bpy.types, 'LEO_TOOLS_OT_report_animation_inventory'):
+        bpy.utils.register_class(report_animation_inventory)
     if not hasattr(bpy.types, 'LEO_TOOLS_OT_add_mirror_modifier'):
         bpy.utils.register_class(add_mirror_modifier)
     if not hasattr(bpy.types, 'LEO_TOOLS_OT_apply_mirror_modifiers'):
         bpy.utils.register_class(apply_mirror_modifiers)
+    if not hasattr(bpy.types, 'LEO_TOOLS_OT_apply_modifiers'):
+        bpy.utils.register_class(apply_modifiers)
     if not hasattr(bpy.types, 'LEO_TOOLS_OT_remove_all_vertex_groups'):
         bpy.utils.register_class(remove_all_vertex_groups)
     if not hasattr(bpy.types, 'LEO_TOOLS_OT_merge_gp_objects'):
@@ -2051,9 +1937,14 @@ def register():
 
     bpy.types.Scene.tween_stored_pose = bpy.props.StringProperty(
         name="Stored Pose",
-        description="JSON data storing the initial pose for tweening",
+        description="JSON copy of the initial tween pose, only written when Keep Pose in File is enabled",
         default="")
 
+    bpy.types.Scene.tween_persist_pose = bpy.props.BoolProperty(
+        name="Keep Pose in File",
+        description="Also save the initial tween pose in the scene so it survives reloading the file",
+        default=False)
+
 
 def unregister():
     # Unregister operators (only if registered)
@@ -2071,6 +1962,10 @@ def unregister():
         bpy.utils.unregister_class(create_udim_paint_mask)
     if hasattr(bpy.types, 'LEO_TOOLS_OT_local_copy_linked_collection'):
         bpy.utils.unregister_class(local_copy_linked_collection)
+    if hasattr(bpy.types, 'LEO_TOOLS_OT_localize_object'):
+        bpy.utils.unregister_class(localize_object)
+    if hasattr(bpy.types, 'LEO_TOOLS_OT_resync_library_overrides'):
+        bpy.utils.unregister_class(resync_library_overrides)
     if hasattr(bpy.types, 'LEO_TOOLS_OT_remove_materials'):
         bpy.utils.unregister_class(remove_materials)
     if hasattr(bpy.types, 'LEO_TOOLS_OT_init_settings'):
@@ -2095,6 +1990,10 @@ def unregister():
         bpy.utils.unregister_class(remove_all_modifiers)
     if hasattr(bpy.types, 'LEO_TOOLS_OT_copy_modifiers_with_drivers'):
         bpy.utils.unregister_class(copy_modifiers_with_drivers)
+    if hasattr(bpy.types, 'LEO_TOOLS_OT_profile_modifier_stacks'):
+        bpy.utils.unregister_class(profile_modifier_stacks)
+    if hasattr(bpy.types, 'LEO_TOOLS_OT_disable_heavy_modifiers'):
+        bpy.utils.unregister_class(disable_heavy_modifiers)
     if hasattr(bpy.types, 'LEO_TOOLS_OT_remove_collision_modifiers'):
         bpy.utils.unregister_class(remove_collision_modifiers)
     if hasattr(bpy.types, 'LEO_TOOLS_OT_remove_subdivision_modifiers'):
@@ -2103,10 +2002,16 @@ def unregister():
         bpy.utils.unregister_class(select_animated_objects)
     if hasattr(bpy.types, 'LEO_TOOLS_OT_delete_animation_actions'):
         bpy.utils.unregister_class(delete_animation_actions)
+    if hasattr(bpy.types, 'LEO_TOOLS_OT_purge_unused_actions'):
+        bpy.utils.unregister_class(purge_unused_actions)
+    if hasattr(bpy.types, 'LEO_TOOLS_OT_report_animation_inventory'):
+        bpy.utils.unregister_class(report_animation_inventory)
     if hasattr(bpy.types, 'LEO_TOOLS_OT_add_mirror_modifier'):
         bpy.utils.unregister_class(add_mirror_modifier)
     if hasattr(bpy.types, 'LEO_TOOLS_OT_apply_mirror_modifiers'):
         bpy.utils.unregister_class(apply_mirror_modifiers)
+    if hasattr(bpy.types, 'LEO_TOOLS_OT_apply_modifiers'):
+        bpy.utils.unregister_class(apply_modifiers)
     if hasattr(bpy.types, 'LEO_TOOLS_OT_remove_all_vertex_groups'):
         bpy.utils.unregister_class(remove_all_vertex_groups)
     if hasattr(bpy.types, 'LEO_TOOLS_OT_merge_gp_objects'):
@@ -2140,11 +2045,19 @@ def unregister():
     # Unregister rigging tools (panel, operators, shape key modules)
     rigging_tools.unregister()
 
+    # Unregister the F-Curve index, keyframe index, tween and inventory handlers
+    animation_inventory.unregister()
+    tween_engine.unregister()
+    keyframe_index.unregister()
+    fcurve_index.unregister()
+
     # Delete scene properties (only if they exist)
     if hasattr(bpy.types.Scene, 'tween_machine_percentage'):
         del bpy.types.Scene.tween_machine_percentage
     if hasattr(bpy.types.Scene, 'tween_stored_pose'):
         del bpy.types.Scene.tween_stored_pose
+    if hasattr(bpy.types.Scene, 'tween_persist_pose'):
+        del bpy.types.Scene.tween_persist_pose
 
 
 if __name__ == "__main__":
@@ -1,11 +1,92 @@
 """
 Collection Display Tools
-Set display properties for all objects in a collection
+Set display properties for all objects in a collection, and a reversible
+performance mode that downgrades a collection for the viewport
 """
 
+import uuid
+
 import bpy
 from bpy.types import Operator
-from bpy.props import StringProperty
+from bpy.props import StringProperty, EnumProperty, IntProperty, BoolProperty
+
+
+# Collection custom property marking performance mode, holding its token
+PERFORMANCE_STATE_PROP = "leo_performance_state"
+# Object custom property holding the state performance mode replaced, with
+# the token of the collection that replaced it (kept on the object, so
+# renaming it does not lose the state)
+PERFORMANCE_OBJECT_PROP = "leo_performance_object_state"
+
+# Modifiers hidden in the viewport by performance mode
+HEAVY_MODIFIER_TYPES = {
+    'BOOLEAN', 'REMESH', 'CLOTH', 'SOFT_BODY', 'OCEAN', 'PARTICLE_INSTANCE',
+    'DYNAMIC_PAINT', 'FLUID', 'SURFACE_DEFORM', 'MESH_DEFORM',
+}
+
+# Modifiers whose viewport levels are capped by performance mode
+SUBDIVISION_MODIFIER_TYPES = {'SUBSURF', 'MULTIRES'}
+
+
+def is_performance_mode(collection):
+    return collection is not None and PERFORMANCE_STATE_PROP in collection
+
+
+def enable_performance_mode(collection, display_type='BOUNDS', max_subdivision=0, hide_heavy=True):
+    """Store each editable object's display type, subdivision viewport
+    levels and modifier viewport flags on the object, then downgrade them,
+    in one pass. Objects already downgraded through another collection
+    are left to it. Returns the number of objects changed."""
+    token = uuid.uuid4().hex
+    changed = 0
+    for obj in collection.all_objects:
+        if obj.library is not None or PERFORMANCE_OBJECT_PROP in obj:
+            continue
+        modifiers = {}
+        for mod in getattr(obj, "modifiers", ()):
+            modifiers[mod.name] = {"show_viewport": mod.show_viewport}
+            if mod.type in SUBDIVISION_MODIFIER_TYPES:
+                modifiers[mod.name]["levels"] = mod.levels
+        obj[PERFORMANCE_OBJECT_PROP] = {"token": token, "display_type": obj.display_type, "modifiers": modifiers}
+
+        obj.display_type = display_type
+        for mod in getattr(obj, "modifiers", ()):
+            if mod.type in SUBDIVISION_MODIFIER_TYPES:
+                mod.levels = min(mod.levels, max_subdivision)
+            elif hide_heavy and mod.type in HEAVY_MODIFIER_TYPES:
+                mod.show_viewport = False
+        changed += 1
+
+    collection[PERFORMANCE_STATE_PROP] = token
+    return changed
+
+
+def disable_performance_mode(collection):
+    """Put back exactly what enable_performance_mode stored, on every
+    object it changed, including ones renamed or unlinked since. Returns
+    the number of objects restored."""
+    token = collection.get(PERFORMANCE_STATE_PROP)
+    if token is None:
+        return 0
+
+    restored = 0
+    for obj in bpy.data.objects:
+        obj_state = obj.get(PERFORMANCE_OBJECT_PROP) if obj.library is None else None
+        if obj_state is None or obj_state.get("token") != token:
+            continue
+        obj.display_type = obj_state["display_type"]
+        for mod_name, mod_state in obj_state["modifiers"].items():
+            mod = obj.modifiers.get(mod_name)
+            if mod is None:
+                continue
+            mod.show_viewport = bool(mod_state["show_viewport"])
+            if "levels" in mod_state:
+                mod.levels = mod_state["levels"]
+        del obj[PERFORMANCE_OBJECT_PROP]
+        restored += 1
+
+    del collection[PERFORMANCE_STATE_PROP]
+    return restored
 
 
 class OBJECT_OT_collection_bounding_box(Operator):
@@ -100,10 +181,85 @@ class OBJECT_OT_collection_textured(Operator):
         return {'FINISHED'}
 
 
+class OBJECT_OT_collection_performance_mode(Operator):
+    """Toggle a reversible viewport performance mode on a collection"""
+    bl_idname = "object.collection_performance_mode"
+    bl_label = "Collection Performance Mode"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    collection_name: StringProperty(
+        name="Collection Name",
+        description="Name of the collection to toggle performance mode on",
+        default=""
+    )
+    
+    display_type: EnumProperty(
+        name="Display As",
+        items=[
+            ('BOUNDS', "Bounds", "Display the objects as their bounding box"),
+            ('WIRE', "Wire", "Display the objects as wireframe"),
+            ('SOLID', "Solid", "Display the objects as solid"),
+        ],
+        default='BOUNDS'
+    )
+    
+    max_subdivision: IntProperty(
+        name="Max Subdivision",
+        description="Highest viewport level kept on Subdivision and Multires modifiers",
+        default=0,
+        min=0
+    )
+    
+    hide_heavy: BoolProperty(
+        name="Hide Heavy Modifiers",
+        description="Hide simulation, boolean, remesh and deform-binding modifiers in the viewport",
+        default=True
+    )
+    
+    @classmethod
+    def poll(cls, context):
+        return context.view_layer.active_layer_collection is not None
+    
+    def invoke(self, context, event):
+        # Get the active collection name
+        active_collection = context.view_layer.active_layer_collection.collection
+        self.collection_name = active_collection.name
+        if is_performance_mode(active_collection):
+            # Restoring needs no settings
+            return self.execute(context)
+        return context.window_manager.invoke_props_dialog(self)
+    
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "collection_name")
+        layout.prop(self, "display_type")
+        layout.prop(self, "max_subdivision")
+        layout.prop(self, "hide_heavy")
+    
+    def execute(self, context):
+        # Find the collection by name
+        collection = bpy.data.collections.get(self.collection_name)
+        
+        if not collection:
+            self.report({'ERROR'}, f"Collection '{self.collection_name}' not found")
+            return {'CANCELLED'}
+        
+        if is_performance_mode(collection):
+            count = disable_performance_mode(collection)
+            self.report({'INFO'}, f"Restored {count} objects in '{self.collection_name}'")
+            return {'FINISHED'}
+        
+        count = enable_performance_mode(
+            collection, self.display_type, self.max_subdivision, self.hide_heavy)
+        self.report({'INFO'}, f"Performance mode on {count} objects in '{self.collection_name}'")
+        return {'FINISHED'}
+
+
 # Registration
 classes = (
     OBJECT_OT_collection_bounding_box,
     OBJECT_OT_collection_textured,
+    OBJECT_OT_collection_performance_mode,
 )
 
 
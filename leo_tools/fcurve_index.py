@@ -0,0 +1,211 @@
+"""
+F-Curve Index
+Cached F-Curve lookup shared by the animation tools, for both the legacy
+Action API and layered/slotted actions (Blender 4.4+, the only kind in 5.0)
+"""
+
+import re
+
+import bpy
+from bpy.app.handlers import persistent
+
+
+BONE_PATH_RE = re.compile(r'^pose\.bones\["(.+?)"\]')
+
+# (action session uid, slot handle) -> FCurveIndex
+_indices = {}
+
+
+def _action_key(action):
+    return getattr(action, "session_uid", None) or action.as_pointer()
+
+
+def _action_slot(id_data):
+    if id_data is None or getattr(id_data, "animation_data", None) is None:
+        return None
+    return getattr(id_data.animation_data, "action_slot", None)
+
+
+def _channelbags(action, slot):
+    """Channelbags holding the action's F-Curves for slot (all slots if None)."""
+    if slot is not None:
+        try:
+            from bpy_extras import anim_utils
+        except ImportError:
+            anim_utils = None
+        if anim_utils is not None and hasattr(anim_utils, "action_get_channelbag_for_slot"):
+            channelbag = anim_utils.action_get_channelbag_for_slot(action, slot)
+            return [channelbag] if channelbag else []
+
+    channelbags = []
+    for layer in getattr(action, "layers", ()):
+        for strip in layer.strips:
+            for channelbag in getattr(strip, "channelbags", ()):
+                if slot is None or channelbag.slot_handle == slot.handle:
+                    channelbags.append(channelbag)
+    return channelbags
+
+
+def _is_legacy(action):
+    """Legacy (pre-slot) action. Blender 4.4 still exposes action.fcurves on
+    layered actions, but only for the first slot, so the channelbags are
+    read whenever the action is not a legacy one."""
+    legacy = getattr(action, "is_action_legacy", None)
+    if legacy is None:
+        # Before 4.4 every action is legacy; 5.0 dropped the legacy API
+        return hasattr(action, "fcurves")
+    return legacy
+
+
+def _is_live(fcurve, data_path, index=None):
+    """The cached F-Curve still exists and still animates data_path (and
+    array index, when given)."""
+    try:
+        return fcurve.data_path == data_path and (index is None or fcurve.array_index == index)
+    except ReferenceError:
+        return False
+
+
+class FCurveIndex:
+    """The F-Curves of one action (and slot), indexed by (data_path, array_index),
+    by data_path (components in array_index order) and by pose bone name."""
+
+    def __init__(self, action, slot=None):
+        self.action = action
+        self.slot = slot
+        self._build()
+
+    def _build(self):
+        if _is_legacy(self.action):
+            self.collections = [self.action.fcurves]
+        else:
+            self.collections = [channelbag.fcurves for channelbag in _channelbags(self.action, self.slot)]
+
+        self.fcurves = []
+        self.by_key = {}
+        self.by_path = {}
+        self.by_bone = {}
+        for fcurves in self.collections:
+            for fcurve in fcurves:
+                self.add(fcurve)
+        self.count = len(self.fcurves)
+
+    def add(self, fcurve):
+        """Index an F-Curve created after the index was built."""
+        self.fcurves.append(fcurve)
+        self.by_key[(fcurve.data_path, fcurve.array_index)] = fcurve
+        components = self.by_path.setdefault(fcurve.data_path, [])
+        components.append(fcurve)
+        try:
+            if len(components) > 1 and components[-2].array_index > fcurve.array_index:
+                components.sort(key=lambda component: component.array_index)
+        except ReferenceError:
+            # A cached component was removed: the rebuild also picks up
+            # fcurve, which is already in its collection
+            self._build()
+            return
+        match = BONE_PATH_RE.match(fcurve.data_path)
+        if match:
+            self.by_bone.setdefault(match.group(1), []).append(fcurve)
+        self.count = len(self.fcurves)
+
+    def find(self, data_path, index=0):
+        fcurve = self.by_key.get((data_path, index))
+        if fcurve is not None and not _is_live(fcurve, data_path, index):
+            # Removed, replaced or retargeted without the count changing
+            self._build()
+            fcurve = self.by_key.get((data_path, index))
+        return fcurve
+
+    def path_fcurves(self, data_path):
+        """Components of one property, e.g. every location F-Curve of a bone."""
+        components = self.by_path.get(data_path, [])
+        if not all(_is_live(fcurve, data_path) for fcurve in components):
+            self._build()
+            components = self.by_path.get(data_path, [])
+        return components
+
+    def bone_fcurves(self, bone_name):
+        return self.by_bone.get(bone_name, [])
+
+    def is_current(self):
+        # F-Curves added or removed outside add() change the count, a
+        # changed first/last curve catches same-count replacements; find()
+        # checks the curve it returns and the handlers below catch the rest
+        if sum(len(fcurves) for fcurves in self.collections) != self.count:
+            return False
+        live = [fcurves for fcurves in self.collections if len(fcurves)]
+        if not live:
+            return True
+        ends = ((live[0][0], self.fcurves[0]), (live[-1][-1], self.fcurves[-1]))
+        try:
+            return all(_is_live(cached, fcurve.data_path, fcurve.array_index) for fcurve, cached in ends)
+        except ReferenceError:
+            return False
+
+
+def get_fcurve_index(action, id_data=None):
+    """Cached FCurveIndex for the action, limited to id_data's slot on
+    slotted actions (every slot if id_data is None or has none)."""
+    slot = _action_slot(id_data)
+    key = (_action_key(action), slot.handle if slot is not None else None)
+    index = _indices.get(key)
+    if index is None or not index.is_current():
+        index = _indices[key] = FCurveIndex(action, slot)
+    return index
+
+
+def get_action_fcurves(action, id_data=None):
+    """Return the F-Curves of an action, compatible with both the legacy
+    Action API (action.fcurves, Blender < 5.0) and the layered/slotted
+    Action system (channelbags), which fully replaced it in Blender 5.0."""
+    if action is None:
+        return []
+    return get_fcurve_index(action, id_data).fcurves
+
+
+def invalidate(action=None):
+    """Drop the cached index of one action, or of every action."""
+    if action is None:
+        _indices.clear()
+        return
+    action_key = _action_key(action)
+    for key in [key for key in _indices if key[0] == action_key]:
+        del _indices[key]
+
+
+@persistent
+def _depsgraph_update_post(scene, depsgraph):
+    if not _indices:
+        return
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Action):
+            invalidate(update.id.original)
+
+
+@persistent
+def _invalidate_all(*args):
+    # Undo/redo and file loads reallocate every action, so the cached
+    # F-Curve references are no longer valid
+    invalidate()
+
+
+_handlers = (
+    (bpy.app.handlers.depsgraph_update_post, _depsgraph_update_post),
+    (bpy.app.handlers.undo_post, _invalidate_all),
+    (bpy.app.handlers.redo_post, _invalidate_all),
+    (bpy.app.handlers.load_post, _invalidate_all),
+)
+
+
+def register():
+    for handlers, handler in _handlers:
+        if handler not in handlers:
+            handlers.append(handler)
+
+
+def unregister():
+    for handlers, handler in _handlers:
+        if handler in handlers:
+            handlers.remove(handler)
+    invalidate()
@@ -0,0 +1,213 @@
+"""
+Grease Pencil Bake Engine
+Transform and modifier baking for Grease Pencil objects in a single walk
+over the frame range: world matrices of every baked object are captured
+and written as keys in bulk afterwards, and evaluated stroke points are
+copied back with one buffer per drawing (GP v3) or per stroke (legacy)
+"""
+
+import bpy
+import numpy as np
+
+from leo_tools import animation_transfer
+
+
+TRANSFORM_GROUP = "Object Transforms"
+EULER_ORDERS = {'XYZ', 'XZY', 'YXZ', 'YZX', 'ZXY', 'ZYX'}
+
+
+def needs_transform_bake(obj):
+    """Constraints or a parent drive the object's transform."""
+    return len(obj.constraints) > 0 or obj.parent is not None
+
+
+def clear_constraints_and_parent(obj):
+    """Remove the constraints and the parent, keeping the current world transform."""
+    for constraint in obj.constraints[:]:
+        obj.constraints.remove(constraint)
+    if obj.parent:
+        mat_world = obj.matrix_world.copy()
+        obj.parent = None
+        obj.matrix_world = mat_world
+
+
+def transform_columns(obj, matrices):
+    """Location, Euler rotation and scale per frame, as (frames, 3) arrays.
+    Eulers stay compatible with the previous frame to avoid flips."""
+    order = obj.rotation_mode if obj.rotation_mode in EULER_ORDERS else 'XYZ'
+    location = np.empty((len(matrices), 3), dtype=np.float64)
+    rotation = np.empty((len(matrices), 3), dtype=np.float64)
+    scale = np.empty((len(matrices), 3), dtype=np.float64)
+    previous = None
+    for row, matrix in enumerate(matrices):
+        loc, quat, size = matrix.decompose()
+        euler = quat.to_euler(order, previous) if previous is not None else quat.to_euler(order)
+        previous = euler
+        location[row] = loc
+        rotation[row] = euler
+        scale[row] = size
+    return location, rotation, scale
+
+
+def write_transform_keys(obj, frame_start, matrices):
+    """Key location/rotation_euler/scale from the captured matrices, one
+    bulk write per F-Curve, replacing existing keys in the baked range."""
+    frames = np.arange(frame_start, frame_start + len(matrices), dtype=np.float32)
+    frame_window = (float(frames[0]), float(frames[-1]))
+    edit = bpy.context.preferences.edit
+    action = animation_transfer.ensure_action(obj)
+    if obj.rotation_mode not in EULER_ORDERS:
+        # The baked rotation is keyed as Euler angles
+        obj.rotation_mode = 'XYZ'
+
+    channels = zip(("location", "rotation_euler", "scale"), transform_columns(obj, matrices))
+    for data_path, columns in channels:
+        for index in range(3):
+            fcurve = animation_transfer.ensure_fcurve(action, obj, data_path, index, TRANSFORM_GROUP)
+            count, arrays = animation_transfer.new_keyframe_arrays(
+                frames, columns[:, index], edit.keyframe_new_interpolation_type, edit.keyframe_new_handle_type)
+            animation_transfer.replace_keyframe_window(fcurve, count, arrays, frame_window)
+
+
+def gp_modifiers(obj):
+    """GP modifiers - grease_pencil_modifiers on legacy GP, modifiers on GP v3."""
+    if hasattr(obj, 'grease_pencil_modifiers') and obj.grease_pencil_modifiers:
+        return obj.grease_pencil_modifiers
+    if hasattr(obj, 'modifiers') and obj.modifiers:
+        return obj.modifiers
+    return None
+
+
+def layer_frame_index(layer):
+    """Frame number -> GP frame of a layer, built once per bake."""
+    return {gp_frame.frame_number: gp_frame for gp_frame in layer.frames}
+
+
+def _evaluated_frame(eval_layer, frame):
+    """The evaluated layer's frame at frame: the one shown at the current
+    frame when it is that key, otherwise looked up."""
+    current = getattr(eval_layer, "active_frame", None)
+    if current is None and hasattr(eval_layer, "current_frame"):
+        current = eval_layer.current_frame()
+    if current is not None and current.frame_number == frame:
+        return current
+    for gp_frame in eval_layer.frames:
+        if gp_frame.frame_number == frame:
+            return gp_frame
+    return None
+
+
+def _read_vectors(collection, attr, count):
+    buffer = np.empty(count * 3, dtype=np.float32)
+    collection.foreach_get(attr, buffer)
+    return buffer
+
+
+def copy_legacy_frame_points(src_frame, eval_frame):
+    """Legacy GP: evaluated point positions back into the frame's strokes,
+    one foreach_get/foreach_set per stroke."""
+    for src_stroke, eval_stroke in zip(src_frame.strokes, eval_frame.strokes):
+        src_points = src_stroke.points
+        eval_points = eval_stroke.points
+        count = len(src_points)
+        eval_count = len(eval_points)
+        if not count or not eval_count:
+            continue
+        co = _read_vectors(eval_points, "co", eval_count)
+        if eval_count != count:
+            # Only the points both strokes have are copied
+            src_co = _read_vectors(src_points, "co", count)
+            shared = min(count, eval_count) * 3
+            src_co[:shared] = co[:shared]
+            co = src_co
+        src_points.foreach_set("co", co)
+
+
+def _curve_offsets(drawing):
+    offsets = drawing.curve_offsets
+    buffer = np.empty(len(offsets), dtype=np.int32)
+    offsets.foreach_get("value", buffer)
+    return buffer
+
+
+def copy_drawing_points(src_drawing, eval_drawing):
+    """GP v3: evaluated positions back into the drawing, one position
+    attribute buffer for the whole drawing."""
+    src_attribute = src_drawing.attributes.get("position")
+    eval_attribute = eval_drawing.attributes.get("position")
+    if src_attribute is None or eval_attribute is None:
+        return
+    count = len(src_attribute.data)
+    eval_count = len(eval_attribute.data)
+    if not count or not eval_count:
+        return
+
+    positions = _read_vectors(eval_attribute.data, "vector", eval_count)
+    if eval_count != count:
+        # Different topology: copy the points each stroke has in both
+        src_positions = _read_vectors(src_attribute.data, "vector", count)
+        src_offsets = _curve_offsets(src_drawing)
+        eval_offsets = _curve_offsets(eval_drawing)
+        for stroke in range(min(len(src_offsets), len(eval_offsets)) - 1):
+            shared = min(src_offsets[stroke + 1] - src_offsets[stroke],
+                         eval_offsets[stroke + 1] - eval_offsets[stroke])
+            src_start = src_offsets[stroke] * 3
+            eval_start = eval_offsets[stroke] * 3
+            src_positions[src_start:src_start + shared * 3] = positions[eval_start:eval_start + shared * 3]
+        positions = src_positions
+    src_attribute.data.foreach_set("vector", positions)
+    if hasattr(src_drawing, "tag_positions_changed"):
+        src_drawing.tag_positions_changed()
+
+
+def _bake_modifier_frame(obj, layer_indexes, eval_obj, frame):
+    eval_layers = eval_obj.data.layers
+    for layer_index, frame_index in enumerate(layer_indexes):
+        src_frame = frame_index.get(frame)
+        if src_frame is None or layer_index >= len(eval_layers):
+            continue
+        eval_frame = _evaluated_frame(eval_layers[layer_index], frame)
+        if eval_frame is None:
+            continue
+        if obj.type == 'GPENCIL':
+            copy_legacy_frame_points(src_frame, eval_frame)
+        elif hasattr(src_frame, 'drawing') and hasattr(eval_frame, 'drawing'):
+            copy_drawing_points(src_frame.drawing, eval_frame.drawing)
+
+
+def bake_objects(context, objects, frame_start, frame_end, bake_modifiers=True):
+    """Bake constraints/parenting into keys and, optionally, GP modifiers
+    into the stroke points, in one walk over the frame range: frames are
+    only evaluated when a transform is baked or a layer has a key there.
+    Modifiers are evaluated with the constraints still active, as before.
+
+    Returns (transform baked objects, modifier baked objects)."""
+    scene = context.scene
+    transform_objects = [obj for obj in objects if needs_transform_bake(obj)]
+    modifier_objects = [obj for obj in objects if bake_modifiers and gp_modifiers(obj)]
+    layer_indexes = [[layer_frame_index(layer) for layer in obj.data.layers] for obj in modifier_objects]
+    key_frames = {
+        frame for obj_indexes in layer_indexes for frame_index in obj_indexes for frame in frame_index
+    }
+
+    matrices = [[] for _obj in transform_objects]
+    depsgraph = context.evaluated_depsgraph_get()
+    for frame in range(frame_start, frame_end + 1):
+        if not transform_objects and frame not in key_frames:
+            continue
+        scene.frame_set(frame)
+        for obj, obj_matrices in zip(transform_objects, matrices):
+            obj_matrices.append(obj.matrix_world.copy())
+        if frame in key_frames:
+            for obj, obj_indexes in zip(modifier_objects, layer_indexes):
+                _bake_modifier_frame(obj, obj_indexes, obj.evaluated_get(depsgraph), frame)
+
+    for obj in modifier_objects:
+        modifiers = gp_modifiers(obj)
+        for mod in list(modifiers):
+            modifiers.remove(mod)
+
+    for obj, obj_matrices in zip(transform_objects, matrices):
+        clear_constraints_and_parent(obj)
+        write_transform_keys(obj, frame_start, obj_matrices)
+    return transform_objects, modifier_objects
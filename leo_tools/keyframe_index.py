@@ -0,0 +1,115 @@
+"""
+Keyframe Index
+Sorted key frame arrays per F-Curve, read once with foreach_get and cached
+on the F-Curve and its key count, for O(log n) previous/next key queries
+"""
+
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+
+
+# F-Curve pointer -> (key count, sorted frames)
+_frames = {}
+
+
+def key_frames(fcurve):
+    """Sorted key frames of an F-Curve as a float64 NumPy array."""
+    keyframe_points = fcurve.keyframe_points
+    count = len(keyframe_points)
+    pointer = fcurve.as_pointer()
+    cached = _frames.get(pointer)
+    if cached is not None and cached[0] == count:
+        return cached[1]
+
+    co = np.empty(count * 2, dtype=np.float32)
+    keyframe_points.foreach_get("co", co)
+    # Keys are normally sorted already; sorting keeps the index correct
+    # while a transform has left them out of order
+    frames = np.sort(co[0::2].astype(np.float64))
+    _frames[pointer] = (count, frames)
+    return frames
+
+
+def previous_key(fcurve, frame):
+    """Frame of the last key before frame, or None."""
+    frames = key_frames(fcurve)
+    position = np.searchsorted(frames, frame, side='left')
+    return float(frames[position - 1]) if position > 0 else None
+
+
+def next_key(fcurve, frame):
+    """Frame of the first key after frame, or None."""
+    frames = key_frames(fcurve)
+    position = np.searchsorted(frames, frame, side='right')
+    return float(frames[position]) if position < len(frames) else None
+
+
+def bracket_keys(fcurves, frame):
+    """Closest key frame before and after frame over all fcurves (None
+    where there is none)."""
+    previous_frame = None
+    next_frame = None
+    for fcurve in fcurves:
+        before = previous_key(fcurve, frame)
+        if before is not None and (previous_frame is None or before > previous_frame):
+            previous_frame = before
+        after = next_key(fcurve, frame)
+        if after is not None and (next_frame is None or after < next_frame):
+            next_frame = after
+    return previous_frame, next_frame
+
+
+def union_key_frames(fcurves):
+    """Sorted unique key frames of all fcurves."""
+    arrays = [key_frames(fcurve) for fcurve in fcurves]
+    if not arrays:
+        return np.empty(0, dtype=np.float64)
+    return np.unique(np.concatenate(arrays))
+
+
+def nearest_key(fcurves, frame):
+    """Key frame of any of the fcurves closest to frame (for snapping), or None."""
+    frames = union_key_frames(fcurves)
+    if not len(frames):
+        return None
+    position = np.searchsorted(frames, frame)
+    candidates = frames[max(position - 1, 0):position + 1]
+    return float(candidates[np.argmin(np.abs(candidates - frame))])
+
+
+def invalidate():
+    _frames.clear()
+
+
+@persistent
+def _depsgraph_update_post(scene, depsgraph):
+    # Moving keys keeps their count, so any action change drops the cache
+    if _frames and any(isinstance(update.id, bpy.types.Action) for update in depsgraph.updates):
+        invalidate()
+
+
+@persistent
+def _invalidate_all(*args):
+    invalidate()
+
+
+_handlers = (
+    (bpy.app.handlers.depsgraph_update_post, _depsgraph_update_post),
+    (bpy.app.handlers.undo_post, _invalidate_all),
+    (bpy.app.handlers.redo_post, _invalidate_all),
+    (bpy.app.handlers.load_post, _invalidate_all),
+)
+
+
+def register():
+    for handlers, handler in _handlers:
+        if handler not in handlers:
+            handlers.append(handler)
+
+
+def unregister():
+    for handlers, handler in _handlers:
+        if handler in handlers:
+            handlers.remove(handler)
+    invalidate()
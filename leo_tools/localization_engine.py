@@ -0,0 +1,319 @@
+"""
+Localization Engine
+Local copies of linked data: unique "_LOCAL" names, one copy per source ID
+so shared data stays shared, lazy object shells that keep using the
+linked data until they are localized on demand, and library overrides
+restricted to a list of editable properties, with batch resync
+"""
+
+import fnmatch
+
+import bpy
+
+
+# bpy.data collection holding each ID type
+ID_TYPE_COLLECTIONS = {
+    'OBJECT': "objects",
+    'COLLECTION': "collections",
+    'MESH': "meshes",
+    'CURVE': "curves",
+    'CURVES': "hair_curves",
+    'ARMATURE': "armatures",
+    'LATTICE': "lattices",
+    'META': "metaballs",
+    'LIGHT': "lights",
+    'LIGHT_PROBE': "lightprobes",
+    'CAMERA': "cameras",
+    'SPEAKER': "speakers",
+    'VOLUME': "volumes",
+    'POINTCLOUD': "pointclouds",
+    'GREASEPENCIL': "grease_pencils",
+    'GREASEPENCIL_V3': "grease_pencils_v3",
+    'MATERIAL': "materials",
+    'ACTION': "actions",
+    'NODETREE': "node_groups",
+    'IMAGE': "images",
+}
+
+# Custom properties on lazily localized copies: the ID they were copied
+# from, and the copy's own name (ID.copy() duplicates carry the first one)
+LOCAL_SOURCE_PROP = "leo_local_source"
+LOCAL_NAME_PROP = "leo_local_name"
+# Custom property on lazy object shells still using linked data
+LAZY_SHELL_PROP = "leo_lazy_shell"
+# Property overrides kept on editable override objects by default
+DEFAULT_OVERRIDE_PROPERTIES = "location, rotation_*, scale, material_slots*"
+
+
+def source_key(id_data):
+    """Identifies an ID across sessions: type, library file and name."""
+    library = id_data.library.filepath if id_data.library else ""
+    return f"{id_data.id_type}:{library}:{id_data.name}"
+
+
+class LocalNameAllocator:
+    """Hands out unique "<name>_LOCAL" / "<name>_LOCAL_NN" names. Each ID
+    type's existing names are read once into a set, and the last index
+    used per base name is remembered, so every allocation is O(1)."""
+
+    def __init__(self):
+        self._names = {}
+        self._next_index = {}
+
+    def _existing(self, id_type):
+        names = self._names.get(id_type)
+        if names is None:
+            collection = getattr(bpy.data, ID_TYPE_COLLECTIONS.get(id_type, ""), None)
+            names = self._names[id_type] = set(collection.keys()) if collection is not None else set()
+        return names
+
+    def next_name(self, base_name, id_type):
+        names = self._existing(id_type)
+        candidate = f"{base_name}_LOCAL"
+        if candidate in names:
+            index = self._next_index.get((id_type, base_name), 2)
+            candidate = f"{base_name}_LOCAL_{index:02d}"
+            while candidate in names:
+                index += 1
+                candidate = f"{base_name}_LOCAL_{index:02d}"
+            self._next_index[(id_type, base_name)] = index + 1
+        names.add(candidate)
+        return candidate
+
+
+class LocalCopyMemo:
+    """One local copy per source ID (object, mesh, material, action, node
+    group, image...), so data shared by linked objects stays shared after
+    localization. With stamp, copies record their source so later runs can
+    seed() from them; one-shot full localization leaves no trace."""
+
+    def __init__(self, names=None, stamp=False):
+        self.names = names or LocalNameAllocator()
+        self.stamp = stamp
+        self.copies = {}
+        self.copy_count = 0
+        self.reused = 0
+
+    def seed(self, id_types=None):
+        """Reuse the local copies made by earlier runs (found through their
+        source property), so localizing shells one at a time still shares.
+        Duplicates of a stamped copy no longer have the stamped name and
+        are skipped."""
+        for id_type, collection_name in ID_TYPE_COLLECTIONS.items():
+            if id_types is not None and id_type not in id_types:
+                continue
+            for id_data in getattr(bpy.data, collection_name, ()):
+                if id_data.library is None:
+                    key = id_data.get(LOCAL_SOURCE_PROP)
+                    if key and id_data.get(LOCAL_NAME_PROP) == id_data.name:
+                        self.copies.setdefault(key, id_data)
+
+    def get(self, id_data):
+        copied = self.copies.get(source_key(id_data))
+        if copied is not None:
+            self.reused += 1
+        return copied
+
+    def add(self, id_data, copied):
+        key = source_key(id_data)
+        if self.stamp:
+            copied[LOCAL_SOURCE_PROP] = key
+            copied[LOCAL_NAME_PROP] = copied.name
+        self.copies[key] = copied
+        self.copy_count += 1
+
+    def copy(self, id_data):
+        """(local copy, created): the existing copy of id_data when there is one."""
+        copied = self.get(id_data)
+        if copied is not None:
+            return copied, False
+        copied = id_data.copy()
+        copied.name = self.names.next_name(id_data.name, id_data.id_type)
+        self.add(id_data, copied)
+        return copied, True
+
+
+def localize_node_tree(node_tree, memo):
+    """Point the nodes of a copied tree at local copies of the linked node
+    groups and images they use."""
+    for node in node_tree.nodes:
+        group = getattr(node, 'node_tree', None)
+        if group is not None and group.library:
+            try:
+                new_group, created = memo.copy(group)
+                node.node_tree = new_group
+                if created:
+                    localize_node_tree(new_group, memo)
+            except RuntimeError:
+                pass
+
+        image = getattr(node, 'image', None)
+        if image is not None and image.library:
+            try:
+                node.image, _created = memo.copy(image)
+            except RuntimeError:
+                pass
+
+
+def localize_material(material, memo):
+    copied_mat, created = memo.copy(material)
+    if created and copied_mat.node_tree:
+        localize_node_tree(copied_mat.node_tree, memo)
+    return copied_mat
+
+
+def localize_object_data(obj, memo):
+    """Replace the data, materials, action and geometry node groups a local
+    object still shares with its source by their local copies."""
+    if obj.data:
+        try:
+            new_data, data_created = memo.copy(obj.data)
+            obj.data = new_data
+            if data_created and hasattr(new_data, 'materials'):
+                for slot_index, material in enumerate(list(new_data.materials)):
+                    if material is None:
+                        continue
+                    try:
+                        new_data.materials[slot_index] = localize_material(material, memo)
+                    except RuntimeError:
+                        pass
+        except RuntimeError:
+            pass
+
+    if obj.animation_data and obj.animation_data.action:
+        try:
+            obj.animation_data.action, _created = memo.copy(obj.animation_data.action)
+        except RuntimeError:
+            pass
+
+    for modifier in getattr(obj, 'modifiers', ()):
+        node_group = getattr(modifier, 'node_group', None)
+        if node_group is not None and node_group.library:
+            try:
+                modifier.node_group, created = memo.copy(node_group)
+                if created:
+                    localize_node_tree(modifier.node_group, memo)
+            except RuntimeError:
+                pass
+
+    if LAZY_SHELL_PROP in obj:
+        del obj[LAZY_SHELL_PROP]
+
+
+def is_lazy_shell(obj):
+    return obj.library is None and bool(obj.get(LAZY_SHELL_PROP))
+
+
+def lazy_shells(objects):
+    return [obj for obj in objects if is_lazy_shell(obj)]
+
+
+def parse_patterns(text):
+    """Comma-separated RNA path globs."""
+    return [pattern.strip() for pattern in text.split(',') if pattern.strip()]
+
+
+def _matches(rna_path, patterns):
+    return any(fnmatch.fnmatchcase(rna_path, pattern) for pattern in patterns)
+
+
+def create_override_hierarchy(collection, scene, view_layer, patterns):
+    """Override a linked collection hierarchy; its objects become editable
+    overrides with property overrides prepared for the listed paths.
+
+    Returns (override root, editable object count)."""
+    root = collection.override_hierarchy_create(scene, view_layer, do_fully_editable=False)
+    if root is None:
+        return None, 0
+
+    editable = 0
+    for obj in root.all_objects:
+        override = obj.override_library
+        if override is None or obj.library is not None:
+            continue
+        override.is_system_override = False
+        for pattern in patterns:
+            # Plain paths can be prepared now; globs match what gets edited
+            if not any(char in pattern for char in "*?["):
+                try:
+                    override.properties.add(rna_path=pattern)
+                except (RuntimeError, TypeError, ValueError):
+                    pass
+        editable += 1
+    return root, editable
+
+
+def _is_id_pointer_override(id_data, rna_path):
+    """ID pointer overrides (parent, modifier objects, constraint targets...)
+    are what keeps an override hierarchy pointing at its own overrides.
+    Paths that cannot be resolved are kept too."""
+    try:
+        value = id_data.path_resolve(rna_path)
+    except ValueError:
+        return True
+    return value is None or isinstance(value, bpy.types.ID)
+
+
+def restrict_override_properties(id_data, patterns):
+    """Drop property overrides outside the listed paths, always keeping ID
+    pointer overrides; returns how many were dropped."""
+    override = id_data.override_library
+    if override is None or override.is_system_override:
+        return 0
+    removed = [
+        prop for prop in override.properties
+        if not _matches(prop.rna_path, patterns) and not _is_id_pointer_override(id_data, prop.rna_path)
+    ]
+    for prop in removed:
+        override.properties.remove(prop)
+    return len(removed)
+
+
+def override_ids():
+    """Local library override IDs of the objects and collections in the file."""
+    return [
+        id_data
+        for collection in (bpy.data.collections, bpy.data.objects)
+        for id_data in collection
+        if id_data.library is None and id_data.override_library is not None
+    ]
+
+
+def override_roots(ids):
+    """Unique hierarchy roots of the given override IDs, by pointer."""
+    roots = {}
+    for id_data in ids:
+        override = id_data.override_library
+        if override is None:
+            continue
+        root = getattr(override, "hierarchy_root", None) or id_data
+        roots.setdefault(root.as_pointer(), root)
+    return list(roots.values())
+
+
+def resync_overrides(roots, scene, view_layer, reload_libraries=True):
+    """Reload each library the roots come from once, then resync every
+    root once. Reloading resyncs and may free or replace override IDs, so
+    the roots are collected again afterwards.
+
+    Returns (reloaded library count, resynced root count, root count)."""
+    libraries = {}
+    for root in roots:
+        reference = root.override_library.reference
+        if reference is not None and reference.library is not None:
+            libraries.setdefault(reference.library.as_pointer(), reference.library)
+
+    if reload_libraries and libraries:
+        for library in libraries.values():
+            library.reload()
+        roots = override_roots(override_ids())
+
+    resynced = 0
+    for root in roots:
+        try:
+            if root.override_library.resync(scene, view_layer=view_layer):
+                resynced += 1
+        except (RuntimeError, ReferenceError):
+            # Freed or no longer an override
+            pass
+    return len(libraries), resynced, len(roots)
@@ -0,0 +1,424 @@
+"""
+Modifier Engine
+Copy plans for modifier stacks: the source stack (property values from one
+bl_rna walk per modifier type, and its drivers grouped by modifier) is
+snapshot once, then applied to any number of targets, only touching the
+modifiers, properties and drivers that differ. Modifier application
+through the data API, one depsgraph evaluation for all objects, and a
+per-modifier viewport cost profiler
+"""
+
+import re
+import time
+
+import bmesh
+import bpy
+
+
+MODIFIER_PATH_RE = re.compile(r'^modifiers\["((?:[^"\\]|\\.)*)"\]')
+
+# Modifier type -> [(identifier, is_array)] of its writable properties
+_writable_properties = {}
+
+
+def writable_properties(modifier):
+    """Writable RNA properties of a modifier type, walked once per type."""
+    properties = _writable_properties.get(modifier.type)
+    if properties is None:
+        properties = [
+            (prop.identifier, getattr(prop, "is_array", False))
+            for prop in modifier.bl_rna.properties
+            if not prop.is_readonly and prop.identifier not in ('rna_type', 'name', 'type')
+        ]
+        _writable_properties[modifier.type] = properties
+    return properties
+
+
+def _read(owner, identifier, is_array):
+    value = getattr(owner, identifier)
+    return tuple(value) if is_array else value
+
+
+def modifier_name_of_path(data_path):
+    """Modifier name a driver data path belongs to, or None."""
+    match = MODIFIER_PATH_RE.match(data_path)
+    if match is None:
+        return None
+    return match.group(1).replace('\\"', '"').replace('\\\\', '\\')
+
+
+class DriverSpec:
+    """A driver F-Curve's driver, detached from its source."""
+
+    __slots__ = ("data_path", "array_index", "type", "expression", "use_self", "variables")
+
+    TARGET_FIELDS = ("id", "data_path", "bone_target", "transform_type", "transform_space", "rotation_mode")
+
+    def __init__(self, fcurve):
+        driver = fcurve.driver
+        self.data_path = fcurve.data_path
+        self.array_index = fcurve.array_index
+        self.type = driver.type
+        self.expression = driver.expression
+        self.use_self = driver.use_self
+        self.variables = [
+            (var.name, var.type, [
+                tuple(getattr(target, field) for field in self.TARGET_FIELDS)
+                for target in var.targets
+            ])
+            for var in driver.variables
+        ]
+
+    def matches(self, fcurve):
+        driver = fcurve.driver
+        if (driver.type != self.type or driver.expression != self.expression
+                or driver.use_self != self.use_self or len(driver.variables) != len(self.variables)):
+            return False
+        return DriverSpec(fcurve).variables == self.variables
+
+    def write(self, fcurve):
+        driver = fcurve.driver
+        while driver.variables:
+            driver.variables.remove(driver.variables[0])
+        for name, var_type, targets in self.variables:
+            new_var = driver.variables.new()
+            new_var.name = name
+            new_var.type = var_type
+            for new_target, values in zip(new_var.targets, targets):
+                for field, value in zip(self.TARGET_FIELDS, values):
+                    try:
+                        setattr(new_target, field, value)
+                    except (AttributeError, TypeError):
+                        pass
+        driver.type = self.type
+        driver.expression = self.expression
+        driver.use_self = self.use_self
+
+
+class ModifierSpec:
+    """One source modifier: its type, writable property values and drivers."""
+
+    __slots__ = ("name", "type", "values", "drivers")
+
+    def __init__(self, modifier, drivers=()):
+        self.name = modifier.name
+        self.type = modifier.type
+        self.values = []
+        for identifier, is_array in writable_properties(modifier):
+            try:
+                self.values.append((identifier, is_array, _read(modifier, identifier, is_array)))
+            except AttributeError:
+                continue
+        self.drivers = list(drivers)
+
+    def write(self, modifier):
+        """Set the properties that differ on modifier; returns how many."""
+        changed = 0
+        for identifier, is_array, value in self.values:
+            try:
+                if _read(modifier, identifier, is_array) == value:
+                    continue
+                setattr(modifier, identifier, value)
+                changed += 1
+            except (AttributeError, TypeError, ValueError):
+                pass
+        return changed
+
+
+class ModifierCopyStats:
+    __slots__ = ("created", "updated", "unchanged", "drivers", "unchanged_drivers")
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.drivers = 0
+        self.unchanged_drivers = 0
+
+
+class ModifierCopyPlan:
+    """Snapshot of a source object's modifier stack and modifier drivers,
+    applied in bulk to targets."""
+
+    def __init__(self, source):
+        drivers = {}
+        if source.animation_data:
+            for fcurve in source.animation_data.drivers:
+                name = modifier_name_of_path(fcurve.data_path)
+                if name is not None:
+                    drivers.setdefault(name, []).append(DriverSpec(fcurve))
+        self.modifiers = [ModifierSpec(mod, drivers.get(mod.name, ())) for mod in source.modifiers]
+
+    def _apply_driver(self, target, spec, stats):
+        existing = target.animation_data.drivers.find(spec.data_path, index=spec.array_index) \
+            if target.animation_data else None
+        if existing is not None and spec.matches(existing):
+            stats.unchanged_drivers += 1
+            return
+
+        if existing is not None:
+            target.animation_data.drivers.remove(existing)
+        try:
+            new_fcurve = target.driver_add(spec.data_path, spec.array_index)
+        except TypeError:
+            new_fcurve = target.driver_add(spec.data_path)
+        spec.write(new_fcurve)
+        stats.drivers += 1
+
+    def _order_stack(self, target):
+        """Target-only modifiers first, then the plan's in source order,
+        as removing and re-adding every copied modifier would leave them."""
+        planned = {spec.name for spec in self.modifiers}
+        names = [mod.name for mod in target.modifiers]
+        desired = [name for name in names if name not in planned] + \
+            [spec.name for spec in self.modifiers if spec.name in names]
+        for index, name in enumerate(desired):
+            current = names.index(name)
+            if current != index:
+                target.modifiers.move(current, index)
+                names.insert(index, names.pop(current))
+
+    def apply(self, target, stats=None):
+        """Bring target's stack in line with the plan; returns the stats."""
+        stats = stats or ModifierCopyStats()
+        for spec in self.modifiers:
+            modifier = target.modifiers.get(spec.name)
+            if modifier is not None and modifier.type != spec.type:
+                target.modifiers.remove(modifier)
+                modifier = None
+
+            if modifier is None:
+                try:
+                    modifier = target.modifiers.new(name=spec.name, type=spec.type)
+                except (RuntimeError, TypeError):
+                    continue
+                spec.write(modifier)
+                stats.created += 1
+            elif spec.write(modifier):
+                stats.updated += 1
+            else:
+                stats.unchanged += 1
+
+            for driver_spec in spec.drivers:
+                self._apply_driver(target, driver_spec, stats)
+
+        self._order_stack(target)
+        return stats
+
+
+class ModifierApplyStats:
+    __slots__ = ("applied", "objects", "meshes", "failed", "shared")
+
+    def __init__(self):
+        self.applied = 0
+        self.objects = 0
+        self.meshes = 0
+        self.failed = 0
+        self.shared = 0
+
+
+def _stack_key(modifiers):
+    """Comparable values of a list of modifiers, to check that every user
+    of a mesh would apply the same thing."""
+    return [(spec.type, spec.values) for spec in (ModifierSpec(mod) for mod in modifiers)]
+
+
+def apply_modifiers(context, objects, predicate):
+    """Apply the modifiers accepted by predicate on mesh objects, through
+    the data API instead of one bpy.ops call per modifier.
+
+    Like applying them one by one, the result is the base mesh run through
+    the accepted modifiers only, in stack order. The stack is evaluated
+    once for all objects, with only those modifiers enabled, and each
+    mesh's evaluated result is written back through BMesh. Objects sharing
+    a mesh are applied once when they all carry the same modifiers."""
+    stats = ModifierApplyStats()
+
+    groups = {}
+    for obj in objects:
+        modifiers = [mod for mod in getattr(obj, "modifiers", ()) if predicate(mod)]
+        if not modifiers:
+            continue
+        if obj.type != 'MESH' or obj.data is None or obj.data.library or obj.data.shape_keys:
+            # Same limits as modifier_apply: no curves, linked data or shape keys
+            stats.failed += len(modifiers)
+            continue
+        groups.setdefault(obj.data.as_pointer(), []).append((obj, modifiers))
+
+    jobs = []
+    for users in groups.values():
+        mesh = users[0][0].data
+        key = _stack_key(users[0][1])
+        if mesh.users - int(mesh.use_fake_user) != len(users) or any(
+                _stack_key(modifiers) != key for _obj, modifiers in users[1:]):
+            # Applying would change objects that are not getting the same modifiers
+            stats.shared += sum(len(modifiers) for _obj, modifiers in users)
+            continue
+        jobs.append(users)
+
+    if not jobs:
+        return stats
+
+    # Only the applied modifiers of each mesh's first user stay enabled
+    restore = []
+    for users in jobs:
+        obj, modifiers = users[0]
+        applied = {mod.name for mod in modifiers}
+        for mod in obj.modifiers:
+            restore.append((mod, mod.show_viewport))
+            mod.show_viewport = mod.name in applied
+
+    try:
+        depsgraph = context.evaluated_depsgraph_get()
+        for users in jobs:
+            obj = users[0][0]
+            bm = bmesh.new()
+            try:
+                bm.from_object(obj, depsgraph)
+                bm.to_mesh(obj.data)
+            finally:
+                bm.free()
+            stats.meshes += 1
+    finally:
+        for mod, show_viewport in restore:
+            mod.show_viewport = show_viewport
+
+    for users in jobs:
+        for obj, modifiers in users:
+            for mod in modifiers:
+                obj.modifiers.remove(mod)
+                stats.applied += 1
+            obj.data.update()
+            stats.objects += 1
+    return stats
+
+
+class ModifierCost:
+    """Measured cost of one modifier in its object's viewport stack."""
+
+    __slots__ = ("object_name", "modifier_name", "type", "seconds", "vertices_before", "vertices_after", "flags")
+
+    def __init__(self, obj, modifier, seconds, vertices_before, vertices_after):
+        self.object_name = obj.name
+        self.modifier_name = modifier.name
+        self.type = modifier.type
+        self.seconds = seconds
+        self.vertices_before = vertices_before
+        self.vertices_after = vertices_after
+        self.flags = modifier_flags(modifier)
+
+    def report_line(self):
+        flags = f" [{', '.join(self.flags)}]" if self.flags else ""
+        return (
+            f"{self.seconds * 1000.0:8.2f} ms  {self.object_name} / {self.modifier_name} ({self.type}): "
+            f"{self.vertices_before} -> {self.vertices_after} verts{flags}"
+        )
+
+
+def modifier_flags(modifier):
+    """Known heavy settings of a modifier."""
+    flags = []
+    if modifier.type in {'SUBSURF', 'MULTIRES'}:
+        levels = getattr(modifier, "levels", None)
+        if levels is None:
+            levels = getattr(modifier, "sculpt_levels", 0)
+        if levels >= 2:
+            flags.append(f"viewport levels {levels}")
+    elif modifier.type == 'CLOTH':
+        flags.append(f"cloth sim, quality {modifier.settings.quality} (cost on frame change)")
+        if modifier.collision_settings.use_self_collision:
+            flags.append("self collision")
+    elif modifier.type == 'COLLISION':
+        flags.append("collision (cost paid by the simulations using it)")
+    return flags
+
+
+# Result of the last profile_modifiers run, heaviest first
+_last_profile = []
+
+
+def last_profile():
+    return _last_profile
+
+
+def _timed_evaluation(context, obj):
+    """Seconds to re-evaluate the depsgraph, and obj's evaluated vertex count."""
+    start = time.perf_counter()
+    depsgraph = context.evaluated_depsgraph_get()
+    seconds = time.perf_counter() - start
+    return seconds, len(obj.evaluated_get(depsgraph).data.vertices)
+
+
+def profile_object(context, obj, samples=3):
+    """Cost of each viewport-enabled modifier of a mesh object.
+
+    The stack is evaluated with growing prefixes of its enabled modifiers;
+    each modifier's cost is the best-of-samples time difference with the
+    prefix before it, and the vertex counts are those around it."""
+    enabled = [mod for mod in obj.modifiers if mod.show_viewport]
+    if not enabled:
+        return []
+
+    costs = []
+    try:
+        for mod in enabled:
+            mod.show_viewport = False
+        previous_time = None
+        previous_vertices = None
+        for index in range(len(enabled) + 1):
+            if index:
+                enabled[index - 1].show_viewport = True
+            best = None
+            for _sample in range(samples):
+                obj.update_tag(refresh={'DATA'})
+                seconds, vertices = _timed_evaluation(context, obj)
+                best = seconds if best is None else min(best, seconds)
+            if index:
+                costs.append(ModifierCost(
+                    obj, enabled[index - 1], max(best - previous_time, 0.0), previous_vertices, vertices))
+            previous_time = best
+            previous_vertices = vertices
+    finally:
+        for mod in enabled:
+            mod.show_viewport = True
+        context.evaluated_depsgraph_get()
+    return costs
+
+
+def profile_modifiers(context, objects, samples=3):
+    """Profile the modifier stacks of the mesh objects; the results are
+    kept, heaviest first, for disable_heavy_modifiers."""
+    costs = []
+    for obj in objects:
+        if obj.type == 'MESH' and obj.modifiers and obj.visible_get():
+            costs.extend(profile_object(context, obj, samples))
+    costs.sort(key=lambda cost: cost.seconds, reverse=True)
+    _last_profile[:] = costs
+    return costs
+
+
+def disable_heavy_modifiers(count):
+    """Hide the count heaviest modifiers of the last profile in the
+    viewport only (render is untouched); returns how many were hidden."""
+    disabled = 0
+    for cost in _last_profile[:count]:
+        obj = bpy.data.objects.get(cost.object_name)
+        modifier = obj.modifiers.get(cost.modifier_name) if obj is not None else None
+        if modifier is not None and modifier.show_viewport:
+            modifier.show_viewport = False
+            disabled += 1
+    return disabled
+
+
+# Kept at module level: Blender needs the enum item strings to stay alive
+_modifier_type_items = []
+
+
+def modifier_type_items(self, context):
+    if not _modifier_type_items:
+        _modifier_type_items.append(('ALL', "All", "Every modifier"))
+        _modifier_type_items.extend(
+            (item.identifier, item.name, item.description)
+            for item in bpy.types.Modifier.bl_rna.properties['type'].enum_items
+        )
+    return _modifier_type_items
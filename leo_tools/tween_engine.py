@@ -0,0 +1,511 @@
+"""
+Tween Engine
+Cached sessions for the tween machine slider: the keys around the current
+frame are bracketed and the neighbouring poses evaluated once, so each
+slider tick is a vectorized lerp followed by a batched property write
+"""
+
+import re
+import json
+
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+
+from leo_tools import fcurve_index
+from leo_tools import keyframe_index
+
+
+TRANSFORM_PROPS = (
+    ("location", 3),
+    ("rotation_euler", 3),
+    ("rotation_quaternion", 4),
+    ("scale", 3),
+)
+
+BONE_CUSTOM_PROP_RE = re.compile(r'^pose\.bones\["(.+)"\]\["(.+)"\]$')
+OBJECT_CUSTOM_PROP_RE = re.compile(r'^\["(.+)"\]$')
+SHAPE_KEY_VALUE_RE = re.compile(r'^key_blocks\["(.+)"\]\.value$')
+
+_session = None
+# Armature name -> PoseSnapshot
+_stored_poses = {}
+
+
+class _PoseWrite:
+    """One transform property of some of an armature's pose bones, written
+    for all of them with a single foreach_get/foreach_set round trip."""
+
+    def __init__(self, armature, prop, size, bone_indices, offset):
+        self.armature = armature
+        self.prop = prop
+        self.size = size
+        self.bone_indices = np.asarray(bone_indices, dtype=np.int64)
+        self.offset = offset
+        self.length = len(bone_indices) * size
+
+    def apply(self, values):
+        pose_bones = self.armature.pose.bones
+        buffer = np.empty(len(pose_bones) * self.size, dtype=np.float32)
+        pose_bones.foreach_get(self.prop, buffer)
+        buffer = buffer.reshape(-1, self.size)
+        buffer[self.bone_indices] = values[self.offset:self.offset + self.length].reshape(-1, self.size)
+        pose_bones.foreach_set(self.prop, buffer.ravel())
+
+
+class _ObjectWrite:
+    """One transform property of every tweened object that animates it."""
+
+    def __init__(self, prop, size):
+        self.prop = prop
+        self.size = size
+        self.objects = []
+        self.offsets = []
+
+    def apply(self, values):
+        prop, size = self.prop, self.size
+        for obj, offset in zip(self.objects, self.offsets):
+            setattr(obj, prop, values[offset:offset + size].tolist())
+
+
+class _ShapeKeyWrite:
+    """Values of some of a shape key datablock's key blocks, written with a
+    single foreach_get/foreach_set round trip."""
+
+    def __init__(self, key, block_indices, offsets):
+        self.key = key
+        self.block_indices = np.asarray(block_indices, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    def apply(self, values):
+        key_blocks = self.key.key_blocks
+        buffer = np.empty(len(key_blocks), dtype=np.float32)
+        key_blocks.foreach_get("value", buffer)
+        buffer[self.block_indices] = values[self.offsets]
+        key_blocks.foreach_set("value", buffer)
+
+
+class _CustomPropertyWrite:
+    """Custom (ID) properties have no bulk API: one item write each, cast
+    back to the property's type so ints and bools stay ints and bools."""
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, owner, prop, fcurves, offset):
+        current = owner.get(prop)
+        items = []
+        for i, fcurve in enumerate(fcurves):
+            if hasattr(current, "__len__") and not isinstance(current, str):
+                if not 0 <= fcurve.array_index < len(current):
+                    return False
+                index, value = fcurve.array_index, current[fcurve.array_index]
+            else:
+                index, value = None, current
+            if isinstance(value, bool):
+                cast = bool
+            elif isinstance(value, int):
+                cast = round
+            elif isinstance(value, float):
+                cast = float
+            else:
+                return False
+            items.append((owner, prop, index, cast, offset + i))
+        self.items.extend(items)
+        return True
+
+    def apply(self, values):
+        for owner, prop, index, cast, offset in self.items:
+            value = cast(values[offset] >= 0.5) if cast is bool else cast(values[offset])
+            if index is None:
+                owner[prop] = value
+            else:
+                owner[prop][index] = value
+
+
+class TweenSession:
+    """Everything a slider tick needs, resolved when the slider is first
+    touched: per channel the pose to blend from (start) and to (end), and
+    the F-Curve each value is keyed on."""
+
+    def __init__(self, key, frame):
+        self.key = key
+        self.frame = frame
+        self.start = []
+        self.end = []
+        self.fcurves = []
+        self.writes = []
+        self.updated = []
+
+    def add_channel(self, fcurves, frame, fallback=None):
+        """Pre-evaluate one property's components. fallback(i) gives the
+        value used where the key on one side is missing (the F-Curve's value
+        at frame by default). Returns the offset of the first component in
+        the value arrays, or None if no key brackets the frame."""
+        previous_frame, next_frame = keyframe_index.bracket_keys(fcurves, frame)
+        if previous_frame is None and next_frame is None:
+            return None
+        if fallback is None:
+            def fallback(i):
+                return fcurves[i].evaluate(frame)
+
+        offset = len(self.start)
+        for i, fcurve in enumerate(fcurves):
+            self.fcurves.append(fcurve)
+            if previous_frame is not None:
+                self.start.append(fcurve.evaluate(previous_frame))
+            else:
+                self.start.append(fallback(i))
+            if next_frame is not None:
+                self.end.append(fcurve.evaluate(next_frame))
+            else:
+                self.end.append(fallback(i))
+        return offset
+
+    def discard_channel(self, offset):
+        """Drop the channel added last, starting at offset."""
+        del self.start[offset:], self.end[offset:], self.fcurves[offset:]
+
+    def finalize(self):
+        self.start = np.asarray(self.start, dtype=np.float64)
+        self.delta = np.asarray(self.end, dtype=np.float64) - self.start
+
+    def apply(self, factor, auto_key, keyframe_type='KEYFRAME'):
+        values = self.start + factor * self.delta
+        for write in self.writes:
+            write.apply(values)
+        for owner in self.updated:
+            owner.update_tag()
+
+        if auto_key:
+            # Straight into each F-Curve: no RNA path resolution or
+            # keying-set lookup per channel as with keyframe_insert
+            frame = self.frame
+            for fcurve, value in zip(self.fcurves, values.tolist()):
+                fcurve.keyframe_points.insert(frame, value, options={'FAST'}, keyframe_type=keyframe_type)
+                fcurve.update()
+
+
+def _transform_fcurves(fcurves, base_path, prop, size):
+    components = fcurves.path_fcurves(f"{base_path}.{prop}" if base_path else prop)
+    # Only fully animated vectors are blended
+    return components[:size] if len(components) >= size else None
+
+
+class PoseSnapshot:
+    """Initial transforms of an armature's selected bones, kept in memory:
+    one (bones, size) array per transform property."""
+
+    def __init__(self, armature_name, bone_names, arrays):
+        self.armature_name = armature_name
+        self.bone_names = tuple(bone_names)
+        self.rows = {name: row for row, name in enumerate(self.bone_names)}
+        self.arrays = arrays
+
+    @classmethod
+    def capture(cls, armature, bone_indices):
+        pose_bones = armature.pose.bones
+        arrays = {}
+        for prop, size in TRANSFORM_PROPS:
+            buffer = np.empty(len(pose_bones) * size, dtype=np.float32)
+            pose_bones.foreach_get(prop, buffer)
+            arrays[prop] = buffer.reshape(-1, size)[bone_indices]
+        return cls(armature.name, [pose_bones[index].name for index in bone_indices], arrays)
+
+    def values(self, bone_name, prop):
+        row = self.rows.get(bone_name)
+        return None if row is None else self.arrays[prop][row]
+
+    def to_dict(self):
+        return {
+            name: {prop: self.arrays[prop][row].tolist() for prop, _size in TRANSFORM_PROPS}
+            for name, row in self.rows.items()
+        }
+
+    @classmethod
+    def from_dict(cls, armature_name, bones):
+        arrays = {
+            prop: np.array([bone[prop] for bone in bones.values()], dtype=np.float32).reshape(-1, size)
+            for prop, size in TRANSFORM_PROPS
+        }
+        return cls(armature_name, bones.keys(), arrays)
+
+
+def _persisted_poses(scene):
+    """Snapshots saved in the scene, by armature name."""
+    if not scene.tween_stored_pose:
+        return {}
+    try:
+        data = json.loads(scene.tween_stored_pose)
+        if "armatures" not in data:
+            # Single-armature layout written by older versions
+            data = {"armatures": {data.get("armature", ""): data.get("bones", {})}}
+        return {
+            name: PoseSnapshot.from_dict(name, bones)
+            for name, bones in data["armatures"].items()
+        }
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return {}
+
+
+def _persist_poses(scene):
+    scene.tween_stored_pose = json.dumps({
+        "armatures": {name: pose.to_dict() for name, pose in _stored_poses.items()}
+    })
+
+
+def stored_pose():
+    """Stored initial poses by armature name (empty if none)."""
+    return _stored_poses
+
+
+def clear_stored_pose(scene=None):
+    """Forget the stored poses (and the scene copy, if one was persisted)."""
+    _stored_poses.clear()
+    clear_session()
+    if scene is not None and scene.tween_stored_pose:
+        scene.tween_stored_pose = ""
+
+
+def _get_stored_pose(scene, armature, bone_indices, bone_names):
+    """The pose the selection had when the slider was first touched,
+    captured on first use and optionally persisted in the scene."""
+    pose = _stored_poses.get(armature.name)
+    if pose is not None and pose.bone_names == bone_names:
+        return pose
+
+    pose = _persisted_poses(scene).get(armature.name)
+    if pose is None or pose.bone_names != bone_names:
+        pose = PoseSnapshot.capture(armature, bone_indices)
+    _stored_poses[armature.name] = pose
+    if scene.tween_persist_pose:
+        _persist_poses(scene)
+    return pose
+
+
+def _add_pose_channels(session, custom_writes, scene, armature, bone_names, frame, offset):
+    fcurves = fcurve_index.get_fcurve_index(armature.animation_data.action, armature)
+    pose_bones = armature.pose.bones
+    selected = [(index, bone) for index, bone in enumerate(pose_bones) if bone.select]
+    pose = _get_stored_pose(scene, armature, [index for index, _bone in selected], bone_names)
+
+    for prop, size in TRANSFORM_PROPS:
+        bone_indices = []
+        for index, bone in selected:
+            components = _transform_fcurves(fcurves, f'pose.bones["{bone.name}"]', prop, size)
+            if components is None:
+                continue
+            stored_values = pose.values(bone.name, prop)
+
+            def fallback(i, components=components, stored_values=stored_values):
+                # Use the stored value instead of the evaluated current one
+                if stored_values is not None:
+                    return stored_values[i]
+                return components[i].evaluate(frame)
+
+            if session.add_channel(components, frame, fallback) is not None:
+                bone_indices.append(index)
+        if bone_indices:
+            write = _PoseWrite(armature, prop, size, bone_indices, offset)
+            session.writes.append(write)
+            offset += write.length
+
+    # Custom properties of the selected bones (facial rig controls...)
+    for _index, bone in selected:
+        custom_paths = {
+            fcurve.data_path: BONE_CUSTOM_PROP_RE.match(fcurve.data_path)
+            for fcurve in fcurves.bone_fcurves(bone.name)
+        }
+        for data_path, match in custom_paths.items():
+            if match:
+                offset = _add_custom_channel(session, custom_writes, bone, match.group(2),
+                                             fcurves.path_fcurves(data_path), frame, offset)
+
+    session.updated.append(armature)
+    return offset
+
+
+def _add_custom_channel(session, custom_writes, owner, prop, components, frame, offset):
+    start = session.add_channel(components, frame)
+    if start is None:
+        return offset
+    if not custom_writes.add(owner, prop, components, start):
+        # Not a numeric property (or no longer there): nothing to blend
+        session.discard_channel(start)
+        return offset
+    return offset + len(components)
+
+
+def _add_object_channels(session, object_writes, custom_writes, obj, frame, offset):
+    fcurves = fcurve_index.get_fcurve_index(obj.animation_data.action, obj)
+    for prop, size in TRANSFORM_PROPS:
+        components = _transform_fcurves(fcurves, "", prop, size)
+        if components is None:
+            continue
+        if session.add_channel(components, frame) is not None:
+            write = object_writes[prop]
+            write.objects.append(obj)
+            write.offsets.append(offset)
+            offset += size
+
+    custom_offset = offset
+    for data_path, components in fcurves.by_path.items():
+        match = OBJECT_CUSTOM_PROP_RE.match(data_path)
+        if match:
+            offset = _add_custom_channel(session, custom_writes, obj, match.group(1), components, frame, offset)
+    if offset != custom_offset:
+        # Custom property writes do not tag the object for re-evaluation
+        session.updated.append(obj)
+    return offset
+
+
+def _add_shape_key_channels(session, shape_keys, frame, offset):
+    fcurves = fcurve_index.get_fcurve_index(shape_keys.animation_data.action, shape_keys)
+    key_blocks = shape_keys.key_blocks
+    block_indices = []
+    offsets = []
+    for data_path, components in fcurves.by_path.items():
+        match = SHAPE_KEY_VALUE_RE.match(data_path)
+        block_index = key_blocks.find(match.group(1)) if match else -1
+        if block_index < 0:
+            continue
+        if session.add_channel(components[:1], frame) is not None:
+            block_indices.append(block_index)
+            offsets.append(offset)
+            offset += 1
+    if block_indices:
+        session.writes.append(_ShapeKeyWrite(shape_keys, block_indices, offsets))
+        session.updated.append(shape_keys)
+    return offset
+
+
+def _animated_shape_keys(obj):
+    shape_keys = getattr(getattr(obj, "data", None), "shape_keys", None)
+    if shape_keys is None or not shape_keys.animation_data or not shape_keys.animation_data.action:
+        return None
+    return shape_keys
+
+
+def build_session(context, key, targets, frame):
+    """One session for every target: pose-mode armatures blend their
+    selected bones (transforms and custom properties), any other object
+    its own transforms and custom properties, and every target its
+    animated shape key values."""
+    session = TweenSession(key, frame)
+    object_writes = {prop: _ObjectWrite(prop, size) for prop, size in TRANSFORM_PROPS}
+    custom_writes = _CustomPropertyWrite()
+    offset = 0
+    for (kind, _name, action_name, bone_names, _shape_action_name), obj in zip(key[1], targets):
+        if kind == 'POSE':
+            offset = _add_pose_channels(session, custom_writes, context.scene, obj, bone_names, frame, offset)
+        elif action_name is not None:
+            offset = _add_object_channels(session, object_writes, custom_writes, obj, frame, offset)
+        shape_keys = _animated_shape_keys(obj)
+        if shape_keys is not None:
+            offset = _add_shape_key_channels(session, shape_keys, frame, offset)
+    session.writes.extend(write for write in object_writes.values() if write.objects)
+    if custom_writes.items:
+        session.writes.append(custom_writes)
+    session.finalize()
+    return session
+
+
+def _selected_bone_names(obj):
+    return tuple(bone.name for bone in obj.pose.bones if bone.select)
+
+
+def _session_targets(context):
+    """Everything the slider acts on, and the key identifying that selection."""
+    obj = context.object
+    objects = list(context.selected_objects)
+    if obj is not None and obj not in objects:
+        objects.append(obj)
+
+    targets = []
+    entries = []
+    for target in objects:
+        action = target.animation_data.action if target.animation_data else None
+        shape_keys = _animated_shape_keys(target)
+        if action is None and shape_keys is None:
+            continue
+        action_name = action.name if action is not None else None
+        shape_action_name = shape_keys.animation_data.action.name if shape_keys is not None else None
+        if action is not None and target.type == 'ARMATURE' and target.mode == 'POSE':
+            entry = ('POSE', target.name, action_name, _selected_bone_names(target), shape_action_name)
+        else:
+            entry = ('OBJECT', target.name, action_name, (), shape_action_name)
+        entries.append(entry)
+        targets.append(target)
+    return (context.scene.frame_current, tuple(entries)), targets
+
+
+def get_session(context):
+    """The current tween session, rebuilt when frame, selection or actions change."""
+    global _session
+    key, targets = _session_targets(context)
+    if not targets:
+        return None
+    if _session is None or _session.key != key:
+        _session = build_session(context, key, targets, context.scene.frame_current)
+    return _session
+
+
+def clear_session():
+    global _session
+    _session = None
+
+
+def update_tween(context):
+    session = get_session(context)
+    if session is None:
+        return
+    factor = context.scene.tween_machine_percentage / 100.0
+    tool_settings = context.scene.tool_settings
+    session.apply(factor, tool_settings.use_keyframe_insert_auto, tool_settings.keyframe_type)
+
+
+@persistent
+def _frame_change_post(scene, depsgraph=None):
+    # The stored poses belong to the frame they were captured on
+    if _stored_poses or _session is not None:
+        clear_stored_pose(scene)
+
+
+@persistent
+def _depsgraph_update_post(scene, depsgraph):
+    # Drop an armature's stored pose as soon as its bone selection changes
+    if not _stored_poses:
+        return
+    for name, pose in list(_stored_poses.items()):
+        armature = bpy.data.objects.get(name)
+        if armature is None or armature.pose is None or _selected_bone_names(armature) != pose.bone_names:
+            del _stored_poses[name]
+            clear_session()
+            if scene.tween_persist_pose:
+                _persist_poses(scene)
+
+
+@persistent
+def _load_post(*args):
+    _stored_poses.clear()
+    clear_session()
+
+
+_handlers = (
+    (bpy.app.handlers.frame_change_post, _frame_change_post),
+    (bpy.app.handlers.depsgraph_update_post, _depsgraph_update_post),
+    (bpy.app.handlers.load_post, _load_post),
+)
+
+
+def register():
+    for handlers, handler in _handlers:
+        if handler not in handlers:
+            handlers.append(handler)
+
+
+def unregister():
+    for handlers, handler in _handlers:
+        if handler in handlers:
+            handlers.remove(handler)
+    _load_post()